@@ -8,6 +8,17 @@ class Settings(BaseSettings):
     debug: bool = True
     
     database_url: str
+    async_database_url: Optional[str] = None
+    
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout: float = 30.0
+    db_pool_recycle: int = 1800
+    db_statement_timeout_ms: int = 0
+    db_prepared_statements: bool = True
+    db_echo: bool = False
+    db_slow_query_ms: float = 500.0
+    db_slow_query_log_size: int = 20
     supabase_url: str
     supabase_key: str
     
@@ -21,6 +32,19 @@ class Settings(BaseSettings):
     api_host: str = "0.0.0.0"
     log_level: str = "INFO"
     
+    http_timeout: float = 30.0
+    http_connect_timeout: float = 5.0
+    http_max_connections: int = 100
+    http_max_keepalive_connections: int = 20
+    http_keepalive_expiry: float = 30.0
+    
+    price_batch_max_rows: int = 50000
+    fx_batch_size: int = 5000
+    fx_max_reported_errors: int = 20
+    
+    config_cache_listen: bool = True
+    config_cache_poll_seconds: float = 30.0
+    
     jwt_secret_key: str = "change-me-in-production"
     
     class Config:
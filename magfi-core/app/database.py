@@ -1,15 +1,68 @@
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 from app.config import settings
+from app.services.db_metrics import DatabaseMetrics
+
+POOL_OPTIONS = dict(
+    pool_size=settings.db_pool_size,
+    max_overflow=settings.db_max_overflow,
+    pool_timeout=settings.db_pool_timeout,
+    pool_recycle=settings.db_pool_recycle,
+    pool_pre_ping=True,
+    echo=settings.db_echo,
+)
 
 engine = create_engine(
     settings.database_url,
-    pool_pre_ping=True,
-    echo=settings.debug,
+    poolclass=DatabaseMetrics.pool_class(QueuePool, "sync"),
+    connect_args=(
+        {"options": f"-c statement_timeout={settings.db_statement_timeout_ms}"}
+        if settings.db_statement_timeout_ms else {}
+    ),
+    **POOL_OPTIONS,
 )
+DatabaseMetrics.instrument(engine, "sync")
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+
+def _async_database_url() -> str:
+    if settings.async_database_url:
+        return settings.async_database_url
+    # Same database as the sync engine, reached through asyncpg (which spells sslmode as ssl)
+    url = make_url(settings.database_url)
+    query = dict(url.query)
+    if "sslmode" in query:
+        query["ssl"] = query.pop("sslmode")
+    if not settings.db_prepared_statements:
+        query["prepared_statement_cache_size"] = "0"
+    return url.set(drivername="postgresql+asyncpg", query=query).render_as_string(hide_password=False)
+
+
+def _async_connect_args() -> dict:
+    connect_args = {}
+    if settings.db_statement_timeout_ms:
+        connect_args["server_settings"] = {"statement_timeout": str(settings.db_statement_timeout_ms)}
+    if not settings.db_prepared_statements:
+        # Transaction-mode poolers (pgbouncer, Supabase pooler) cannot keep named prepared statements
+        connect_args["statement_cache_size"] = 0
+    return connect_args
+
+
+async_engine = create_async_engine(
+    _async_database_url(),
+    poolclass=DatabaseMetrics.pool_class(AsyncAdaptedQueuePool, "async"),
+    connect_args=_async_connect_args(),
+    **POOL_OPTIONS,
+)
+DatabaseMetrics.instrument(async_engine.sync_engine, "async")
+
+# expire_on_commit=False so routes can read attributes after commit without an implicit (sync) reload
+AsyncSessionLocal = async_sessionmaker(async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+
 Base = declarative_base()
 
 
@@ -19,3 +72,8 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
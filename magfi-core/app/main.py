@@ -2,7 +2,10 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 import logging
 from app.config import settings
+from app.database import async_engine
 from app.routes import health, config, asset, currency, market, account
+from app.services.config_cache import ConfigCache
+from app.services.http_client import HttpClientRegistry
 
 logging.basicConfig(level=settings.log_level)
 logger = logging.getLogger(__name__)
@@ -32,11 +35,19 @@ app.include_router(account.router)
 @app.on_event("startup")
 async def startup_event():
     logger.info(f"Starting {settings.app_name} in {settings.app_env} mode")
+    try:
+        await ConfigCache.start()
+    except Exception as e:
+        # Config reads fall back to the database until the cache loads
+        logger.error(f"Config cache unavailable: {str(e)}")
 
 
 @app.on_event("shutdown")
 async def shutdown_event():
     logger.info(f"Shutting down {settings.app_name}")
+    await ConfigCache.stop()
+    await HttpClientRegistry.close_all()
+    await async_engine.dispose()
 
 
 if __name__ == "__main__":
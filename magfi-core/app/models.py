@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Float, DateTime, Boolean, Integer, UUID, ForeignKey, Numeric
+from sqlalchemy import Column, String, Float, DateTime, Boolean, Integer, UUID, ForeignKey, Numeric, func
 from sqlalchemy.orm import relationship
 from sqlalchemy.dialects.postgresql import JSONB
 import uuid
@@ -26,6 +26,8 @@ class Asset(Base):
     asset_name = Column(String(255), nullable=False)
     currency_code = Column(String(3), nullable=False)
     current_price = Column(Numeric(15, 4), nullable=False)
+    # When current_price was observed; updated_at is when the row was last written
+    price_recorded_at = Column(DateTime, nullable=True)
     target_price = Column(Numeric(15, 4), nullable=True)
     drop_alert_enabled = Column(Boolean, default=False)
     target_gap_percentage = Column(Float, nullable=True)
@@ -48,6 +50,8 @@ class AssetPriceHistory(Base):
     asset_id = Column(UUID(as_uuid=True), ForeignKey("app_magfi.dim_asset.id"), nullable=False)
     price = Column(Numeric(15, 4), nullable=False)
     recorded_at = Column(DateTime, default=datetime.utcnow)
+    # Set by the database on insert, whatever recorded_at the client sent
+    ingested_at = Column(DateTime, server_default=func.now())
     
     asset = relationship("Asset", back_populates="price_history")
 
@@ -61,6 +65,8 @@ class Currency(Base):
     currency_name = Column(String(100), nullable=False)
     base_currency = Column(String(3), nullable=False, default="BRL")
     current_price = Column(Numeric(15, 4), nullable=False)
+    # When current_price was observed; updated_at is when the row was last written
+    price_recorded_at = Column(DateTime, nullable=True)
     target_price = Column(Numeric(15, 4), nullable=True)
     drop_alert_enabled = Column(Boolean, default=False)
     time_to_buy = Column(Boolean, default=False)
@@ -157,5 +163,6 @@ class Prediction(Base):
     predicted_price = Column(Numeric(15, 4), nullable=True)
     confidence_score = Column(Float, nullable=False)
     prediction_date = Column(DateTime, nullable=False)
+    horizon_days = Column(Integer, nullable=True)
     analysis_summary = Column(String, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
@@ -1,14 +1,14 @@
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from app.database import get_db
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import get_async_db
 from app.schemas import AccountSchema, ApiResponseSchema
-from app.services.account_service import AccountService
+from app.services.account_service import AsyncAccountService
 
 router = APIRouter(prefix="/market", tags=["accounts"])
 
 
 @router.post("/account", response_model=ApiResponseSchema)
-def create_account(account_data: dict, db: Session = Depends(get_db)):
+async def create_account(account_data: dict, db: AsyncSession = Depends(get_async_db)):
     try:
         schema = AccountSchema(
             account_name=account_data.get("account_name"),
@@ -20,7 +20,7 @@ def create_account(account_data: dict, db: Session = Depends(get_db)):
             default_currency=account_data.get("default_currency", "BRL"),
         )
         
-        account = AccountService.create_account(db, schema)
+        account = await AsyncAccountService.create_account(db, schema)
         
         return {
             "success": True,
@@ -32,9 +32,9 @@ def create_account(account_data: dict, db: Session = Depends(get_db)):
 
 
 @router.get("/accounts", response_model=ApiResponseSchema)
-def get_all_accounts(db: Session = Depends(get_db)):
+async def get_all_accounts(db: AsyncSession = Depends(get_async_db)):
     try:
-        accounts = AccountService.get_all_accounts(db)
+        accounts = await AsyncAccountService.get_all_accounts(db)
         data = [
             {
                 "id": str(a.id),
@@ -57,9 +57,9 @@ def get_all_accounts(db: Session = Depends(get_db)):
 
 
 @router.get("/dividend-gains", response_model=ApiResponseSchema)
-def get_dividend_gains(db: Session = Depends(get_db)):
+async def get_dividend_gains(db: AsyncSession = Depends(get_async_db)):
     try:
-        dividends = AccountService.get_dividend_gains(db)
+        dividends = await AsyncAccountService.get_dividend_gains(db)
         
         return {
             "success": True,
@@ -1,14 +1,15 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
-from app.database import get_db
-from app.schemas import AssetSchema, AssetCreateSchema, AssetResponseSchema, ApiResponseSchema
-from app.services.asset_service import AssetService
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.config import settings
+from app.database import get_async_db
+from app.schemas import AssetSchema, AssetCreateSchema, AssetResponseSchema, AssetPriceBatchSchema, ApiResponseSchema
+from app.services.asset_service import AsyncAssetService
 
 router = APIRouter(prefix="/market", tags=["assets"])
 
 
 @router.post("/asset", response_model=ApiResponseSchema)
-def create_asset(asset_data: AssetCreateSchema, db: Session = Depends(get_db)):
+async def create_asset(asset_data: AssetCreateSchema, db: AsyncSession = Depends(get_async_db)):
     try:
         schema = AssetSchema(
             ticker_symbol=asset_data.ticker_symbol or asset_data.name,
@@ -22,7 +23,7 @@ def create_asset(asset_data: AssetCreateSchema, db: Session = Depends(get_db)):
             pvpa_ratio=asset_data.pvpa_ratio,
         )
         
-        asset = AssetService.create_asset(db, schema, asset_data.name)
+        asset = await AsyncAssetService.create_asset(db, schema, asset_data.name)
         
         return {
             "success": True,
@@ -40,9 +41,9 @@ def create_asset(asset_data: AssetCreateSchema, db: Session = Depends(get_db)):
 
 
 @router.get("/asset", response_model=ApiResponseSchema)
-def get_asset(ticker_symbol: str = Query(...), db: Session = Depends(get_db)):
+async def get_asset(ticker_symbol: str = Query(...), db: AsyncSession = Depends(get_async_db)):
     try:
-        asset = AssetService.get_asset_by_ticker(db, ticker_symbol)
+        asset = await AsyncAssetService.get_asset_by_ticker(db, ticker_symbol)
         if not asset:
             raise HTTPException(status_code=404, detail="Asset not found")
         
@@ -70,9 +71,9 @@ def get_asset(ticker_symbol: str = Query(...), db: Session = Depends(get_db)):
 
 
 @router.get("/assets", response_model=ApiResponseSchema)
-def get_all_assets(db: Session = Depends(get_db)):
+async def get_all_assets(db: AsyncSession = Depends(get_async_db)):
     try:
-        assets = AssetService.get_all_assets(db)
+        assets = await AsyncAssetService.get_all_assets(db)
         data = [
             {
                 "id": str(a.id),
@@ -96,8 +97,26 @@ def get_all_assets(db: Session = Depends(get_db)):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/assets/prices:batch", response_model=ApiResponseSchema)
+async def upsert_asset_prices(batch: AssetPriceBatchSchema, db: AsyncSession = Depends(get_async_db)):
+    if len(batch.prices) > settings.price_batch_max_rows:
+        raise HTTPException(
+            status_code=413, detail=f"Batch exceeds {settings.price_batch_max_rows} rows"
+        )
+    try:
+        result = await AsyncAssetService.upsert_prices(db, batch.prices)
+        
+        return {
+            "success": True,
+            "data": result,
+            "message": f"Applied {result['rows']} prices to {result['assets_updated'] + result['assets_created']} assets"
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.put("/asset", response_model=ApiResponseSchema)
-def update_asset(ticker_symbol: str = Query(...), asset_data: dict = None, db: Session = Depends(get_db)):
+async def update_asset(ticker_symbol: str = Query(...), asset_data: dict = None, db: AsyncSession = Depends(get_async_db)):
     try:
         if not asset_data:
             raise HTTPException(status_code=400, detail="Asset data is required")
@@ -111,7 +130,7 @@ def update_asset(ticker_symbol: str = Query(...), asset_data: dict = None, db: S
             target_gap_percentage=asset_data.get("target_gap_percentage"),
         )
         
-        asset = AssetService.update_asset(db, ticker_symbol, schema)
+        asset = await AsyncAssetService.update_asset(db, ticker_symbol, schema)
         if not asset:
             raise HTTPException(status_code=404, detail="Asset not found")
         
@@ -127,9 +146,9 @@ def update_asset(ticker_symbol: str = Query(...), asset_data: dict = None, db: S
 
 
 @router.delete("/asset", response_model=ApiResponseSchema)
-def delete_asset(ticker_symbol: str = Query(...), db: Session = Depends(get_db)):
+async def delete_asset(ticker_symbol: str = Query(...), db: AsyncSession = Depends(get_async_db)):
     try:
-        result = AssetService.delete_asset(db, ticker_symbol)
+        result = await AsyncAssetService.delete_asset(db, ticker_symbol)
         if not result:
             raise HTTPException(status_code=404, detail="Asset not found")
         
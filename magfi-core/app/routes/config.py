@@ -1,40 +1,30 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
-from app.database import get_db
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
+from app.database import get_async_db
 from app.schemas import ConfigSchema, ConfigResponseSchema, ApiResponseSchema
-from app.services.config_service import ConfigService
+from app.services.config_service import AsyncConfigService
 
 router = APIRouter(prefix="/config", tags=["config"])
 
 
 @router.get("", response_model=ApiResponseSchema)
-def get_all_configs(db: Session = Depends(get_db)):
+async def get_configs(config_name: Optional[str] = Query(None), db: AsyncSession = Depends(get_async_db)):
     try:
-        configs = ConfigService.get_all_configs(db)
-        data = [{"id": str(c.id), "config_name": c.config_name, "config_value": c.config_value} for c in configs]
-        return {
-            "success": True,
-            "data": data,
-            "message": "Configuration retrieved successfully"
-        }
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
-
-
-@router.get("", response_model=ApiResponseSchema)
-def get_config_by_name(config_name: str = Query(...), db: Session = Depends(get_db)):
-    try:
-        config = ConfigService.get_config(db, config_name)
+        if config_name is None:
+            return {
+                "success": True,
+                "data": await AsyncConfigService.get_all_config_entries(db),
+                "message": "Configuration retrieved successfully"
+            }
+        
+        config = await AsyncConfigService.get_config_entry(db, config_name)
         if not config:
             raise HTTPException(status_code=404, detail="Configuration not found")
         
         return {
             "success": True,
-            "data": {
-                "id": str(config.id),
-                "config_name": config.config_name,
-                "config_value": config.config_value
-            },
+            "data": config,
             "message": "Configuration retrieved successfully"
         }
     except HTTPException:
@@ -44,16 +34,11 @@ def get_config_by_name(config_name: str = Query(...), db: Session = Depends(get_
 
 
 @router.put("", response_model=ApiResponseSchema)
-def update_config(config_data: dict, db: Session = Depends(get_db)):
+async def update_config(config_data: dict, db: AsyncSession = Depends(get_async_db)):
     try:
-        updated_configs = []
-        for key, value in config_data.items():
-            config = ConfigService.set_config(db, key, str(value))
-            updated_configs.append({
-                "id": str(config.id),
-                "config_name": config.config_name,
-                "config_value": config.config_value
-            })
+        updated_configs = await AsyncConfigService.upsert_configs(
+            db, {key: str(value) for key, value in config_data.items()}
+        )
         
         return {
             "success": True,
@@ -1,14 +1,15 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
-from app.database import get_db
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import get_async_db
 from app.schemas import CurrencySchema, ApiResponseSchema
-from app.services.currency_service import CurrencyService
+from app.services.currency_service import AsyncCurrencyService, RateStreamError
+from app.services.stream_parser import LineTooLongError, StreamRowParser
 
 router = APIRouter(prefix="/market", tags=["currencies"])
 
 
 @router.post("/currency", response_model=ApiResponseSchema)
-def create_currency(currency_data: dict, db: Session = Depends(get_db)):
+async def create_currency(currency_data: dict, db: AsyncSession = Depends(get_async_db)):
     try:
         name = currency_data.get("name")
         if not name:
@@ -22,7 +23,7 @@ def create_currency(currency_data: dict, db: Session = Depends(get_db)):
             drop_alert_enabled=currency_data.get("drop_alert", False),
         )
         
-        currency = CurrencyService.create_currency(db, schema)
+        currency = await AsyncCurrencyService.create_currency(db, schema)
         
         return {
             "success": True,
@@ -39,9 +40,9 @@ def create_currency(currency_data: dict, db: Session = Depends(get_db)):
 
 
 @router.get("/currency", response_model=ApiResponseSchema)
-def get_currency(currency_code: str = Query(...), db: Session = Depends(get_db)):
+async def get_currency(currency_code: str = Query(...), db: AsyncSession = Depends(get_async_db)):
     try:
-        currency = CurrencyService.get_currency_by_code(db, currency_code)
+        currency = await AsyncCurrencyService.get_currency_by_code(db, currency_code)
         if not currency:
             raise HTTPException(status_code=404, detail="Currency not found")
         
@@ -66,9 +67,9 @@ def get_currency(currency_code: str = Query(...), db: Session = Depends(get_db))
 
 
 @router.get("/currencies", response_model=ApiResponseSchema)
-def get_all_currencies(db: Session = Depends(get_db)):
+async def get_all_currencies(db: AsyncSession = Depends(get_async_db)):
     try:
-        currencies = CurrencyService.get_all_currencies(db)
+        currencies = await AsyncCurrencyService.get_all_currencies(db)
         data = [
             {
                 "id": str(c.id),
@@ -92,8 +93,36 @@ def get_all_currencies(db: Session = Depends(get_db)):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/currencies/rates:batch", response_model=ApiResponseSchema)
+async def ingest_currency_rates(request: Request, db: AsyncSession = Depends(get_async_db)):
+    content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    if not StreamRowParser.supports(content_type):
+        raise HTTPException(status_code=415, detail="Send application/x-ndjson or text/csv")
+    try:
+        report = await AsyncCurrencyService.ingest_rate_stream(
+            db, StreamRowParser.rows(request.stream(), content_type)
+        )
+        
+        return {
+            "success": True,
+            "data": report,
+            "message": f"Ingested {report['rows']} rates ({report['rows_per_second']} rows/s), {report['rejected']} rejected"
+        }
+    except RateStreamError as e:
+        # Earlier batches are committed; tell the client where to resume
+        if isinstance(e.__cause__, LineTooLongError):
+            status_code, error = 413, str(e)
+        elif isinstance(e.__cause__, UnicodeDecodeError):
+            status_code, error = 400, "Body must be UTF-8"
+        else:
+            status_code, error = 500, str(e)
+        raise HTTPException(status_code=status_code, detail={"error": error, "committed": e.report})
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.put("/currency", response_model=ApiResponseSchema)
-def update_currency(currency_code: str = Query(...), currency_data: dict = None, db: Session = Depends(get_db)):
+async def update_currency(currency_code: str = Query(...), currency_data: dict = None, db: AsyncSession = Depends(get_async_db)):
     try:
         if not currency_data:
             raise HTTPException(status_code=400, detail="Currency data is required")
@@ -106,7 +135,7 @@ def update_currency(currency_code: str = Query(...), currency_data: dict = None,
             drop_alert_enabled=currency_data.get("drop_alert"),
         )
         
-        currency = CurrencyService.update_currency(db, currency_code, schema)
+        currency = await AsyncCurrencyService.update_currency(db, currency_code, schema)
         if not currency:
             raise HTTPException(status_code=404, detail="Currency not found")
         
@@ -122,9 +151,9 @@ def update_currency(currency_code: str = Query(...), currency_data: dict = None,
 
 
 @router.delete("/currency", response_model=ApiResponseSchema)
-def delete_currency(currency_code: str = Query(...), db: Session = Depends(get_db)):
+async def delete_currency(currency_code: str = Query(...), db: AsyncSession = Depends(get_async_db)):
     try:
-        result = CurrencyService.delete_currency(db, currency_code)
+        result = await AsyncCurrencyService.delete_currency(db, currency_code)
         if not result:
             raise HTTPException(status_code=404, detail="Currency not found")
         
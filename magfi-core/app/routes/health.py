@@ -1,6 +1,8 @@
 from fastapi import APIRouter, Depends
 from app.schemas import HealthResponseSchema
 from app.config import settings
+from app.services.db_metrics import DatabaseMetrics
+from app.services.http_client import HttpClientRegistry
 
 router = APIRouter(tags=["health"])
 
@@ -13,3 +15,13 @@ def health_check():
         "environment": settings.app_env,
         "version": "1.0.0"
     }
+
+
+@router.get("/health/upstreams")
+def upstream_metrics():
+    return HttpClientRegistry.metrics()
+
+
+@router.get("/metrics")
+def metrics():
+    return {"database": DatabaseMetrics.snapshot(), "upstreams": HttpClientRegistry.metrics()}
@@ -1,18 +1,18 @@
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from app.database import get_db
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import get_async_db
 from app.schemas import ApiResponseSchema
-from app.services.asset_service import AssetService
-from app.services.currency_service import CurrencyService
+from app.services.asset_service import AsyncAssetService
+from app.services.currency_service import AsyncCurrencyService
 from app.services.prediction_service import PredictionService
 
 router = APIRouter(prefix="/market", tags=["alerts_and_reports"])
 
 
 @router.get("/drop-alert/assets", response_model=ApiResponseSchema)
-def get_drop_alert_assets(db: Session = Depends(get_db)):
+async def get_drop_alert_assets(db: AsyncSession = Depends(get_async_db)):
     try:
-        assets = AssetService.get_drop_alert_assets(db)
+        assets = await AsyncAssetService.get_drop_alert_assets(db)
         
         return {
             "success": True,
@@ -24,9 +24,9 @@ def get_drop_alert_assets(db: Session = Depends(get_db)):
 
 
 @router.get("/drop-alert/currencies", response_model=ApiResponseSchema)
-def get_drop_alert_currencies(db: Session = Depends(get_db)):
+async def get_drop_alert_currencies(db: AsyncSession = Depends(get_async_db)):
     try:
-        currencies = CurrencyService.get_drop_alert_currencies(db)
+        currencies = await AsyncCurrencyService.get_drop_alert_currencies(db)
         
         return {
             "success": True,
@@ -38,7 +38,7 @@ def get_drop_alert_currencies(db: Session = Depends(get_db)):
 
 
 @router.get("/report/prediction", response_model=ApiResponseSchema)
-async def get_market_prediction(db: Session = Depends(get_db)):
+async def get_market_prediction():
     try:
         prediction = await PredictionService.get_market_prediction()
         
@@ -1,6 +1,6 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator
 from typing import Optional, List, Union
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 from uuid import UUID
 
 
@@ -43,6 +43,31 @@ class AssetCreateSchema(BaseModel):
     pvpa_ratio: Optional[float] = None
 
 
+# Allowance for client clock drift on batch price timestamps
+MAX_PRICE_CLOCK_SKEW = timedelta(minutes=5)
+
+
+def _not_in_future(recorded_at: Optional[datetime]) -> Optional[datetime]:
+    # A future timestamp would outrank every real price until the clock caught up
+    if recorded_at is not None:
+        utc = recorded_at.astimezone(timezone.utc).replace(tzinfo=None) if recorded_at.tzinfo else recorded_at
+        if utc > datetime.utcnow() + MAX_PRICE_CLOCK_SKEW:
+            raise ValueError("recorded_at is in the future")
+    return recorded_at
+
+
+class AssetPriceRowSchema(BaseModel):
+    ticker_symbol: str = Field(..., min_length=1, max_length=20)
+    price: float = Field(..., gt=0)
+    recorded_at: Optional[datetime] = None
+
+    _recorded_at_not_in_future = field_validator("recorded_at")(_not_in_future)
+
+
+class AssetPriceBatchSchema(BaseModel):
+    prices: List[AssetPriceRowSchema]
+
+
 class AssetResponseSchema(BaseModel):
     id: UUID
     ticker_symbol: str
@@ -72,6 +97,15 @@ class CurrencySchema(BaseModel):
     drop_alert_enabled: Optional[bool] = False
 
 
+class CurrencyRateRowSchema(BaseModel):
+    currency_code: str = Field(..., min_length=3, max_length=3)
+    price: float = Field(..., gt=0)
+    recorded_at: Optional[datetime] = None
+    base_currency: Optional[str] = Field(None, min_length=3, max_length=3)
+
+    _recorded_at_not_in_future = field_validator("recorded_at")(_not_in_future)
+
+
 class CurrencyResponseSchema(BaseModel):
     id: UUID
     currency_code: str
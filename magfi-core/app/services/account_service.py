@@ -1,15 +1,16 @@
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from app.models import Account, PortfolioPosition, Dividend
 from app.schemas import AccountSchema
 from datetime import datetime
 from decimal import Decimal
-from sqlalchemy import func
+from sqlalchemy import func, select
 
 
 class AccountService:
     @staticmethod
-    def create_account(db: Session, account_data: AccountSchema):
-        account = Account(
+    def build_account(account_data: AccountSchema) -> Account:
+        return Account(
             account_name=account_data.account_name,
             is_investment_account=account_data.is_investment_account,
             is_payroll_account=account_data.is_payroll_account,
@@ -18,6 +19,24 @@ class AccountService:
             checking_account_balance=Decimal(str(account_data.checking_account_balance)) if account_data.checking_account_balance else None,
             default_currency=account_data.default_currency or "BRL",
         )
+
+    @staticmethod
+    def dividend_rows(dividends) -> list:
+        result = []
+        for dividend in dividends:
+            result.append({
+                "asset_id": str(dividend.asset_id),
+                "dividend_amount": float(dividend.dividend_amount),
+                "dividend_type": dividend.dividend_type,
+                "ex_dividend_date": dividend.ex_dividend_date.isoformat(),
+                "payment_date": dividend.payment_date.isoformat(),
+            })
+        
+        return result
+
+    @staticmethod
+    def create_account(db: Session, account_data: AccountSchema):
+        account = AccountService.build_account(account_data)
         db.add(account)
         db.commit()
         db.refresh(account)
@@ -37,15 +56,33 @@ class AccountService:
     @staticmethod
     def get_dividend_gains(db: Session, period: str = "year"):
         dividends = db.query(Dividend).all()
-        
-        result = []
-        for dividend in dividends:
-            result.append({
-                "asset_id": str(dividend.asset_id),
-                "dividend_amount": float(dividend.dividend_amount),
-                "dividend_type": dividend.dividend_type,
-                "ex_dividend_date": dividend.ex_dividend_date.isoformat(),
-                "payment_date": dividend.payment_date.isoformat(),
-            })
-        
-        return result
+        return AccountService.dividend_rows(dividends)
+
+
+class AsyncAccountService:
+    """AccountService over an AsyncSession, for routes served on the event loop."""
+
+    @staticmethod
+    async def create_account(db: AsyncSession, account_data: AccountSchema):
+        account = AccountService.build_account(account_data)
+        db.add(account)
+        await db.commit()
+        await db.refresh(account)
+        return account
+
+    @staticmethod
+    async def get_all_accounts(db: AsyncSession, active_only: bool = True):
+        stmt = select(Account)
+        if active_only:
+            stmt = stmt.where(Account.is_active == True)
+        return (await db.execute(stmt)).scalars().all()
+
+    @staticmethod
+    async def get_account_by_id(db: AsyncSession, account_id):
+        result = await db.execute(select(Account).where(Account.id == account_id, Account.is_active == True).limit(1))
+        return result.scalar()
+
+    @staticmethod
+    async def get_dividend_gains(db: AsyncSession, period: str = "year"):
+        dividends = (await db.execute(select(Dividend))).scalars().all()
+        return AccountService.dividend_rows(dividends)
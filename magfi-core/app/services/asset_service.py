@@ -1,19 +1,45 @@
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from app.models import Asset, AssetPriceHistory
-from app.schemas import AssetSchema
+from app.schemas import AssetSchema, AssetPriceRowSchema
 from uuid import UUID
-from datetime import datetime
+from datetime import datetime, timezone
 from decimal import Decimal
+from typing import Dict, List, Tuple
+import time
+
+# One statement for any batch size: rows travel as three array parameters, so the
+# bind-parameter limit never applies. The newest price per ticker wins: current_price
+# only moves when a row's recorded_at is at or after price_recorded_at, and an older
+# price is still kept in history. updated_at is when the row was last written.
+UPSERT_PRICES_SQL = text("""
+    INSERT INTO app_magfi.dim_asset AS a
+        (ticker_symbol, asset_name, currency_code, current_price, price_recorded_at, updated_at)
+    SELECT t.ticker, t.ticker, :currency_code, t.price, t.recorded_at, timezone('utc', now())
+    FROM unnest(CAST(:tickers AS VARCHAR[]), CAST(:prices AS NUMERIC[]), CAST(:recorded_at AS TIMESTAMP[]))
+        AS t(ticker, price, recorded_at)
+    ON CONFLICT (ticker_symbol) DO UPDATE SET
+        current_price = CASE WHEN a.price_recorded_at IS NULL OR EXCLUDED.price_recorded_at >= a.price_recorded_at
+                             THEN EXCLUDED.current_price ELSE a.current_price END,
+        time_to_buy = a.target_price IS NOT NULL AND
+                      CASE WHEN a.price_recorded_at IS NULL OR EXCLUDED.price_recorded_at >= a.price_recorded_at
+                           THEN EXCLUDED.current_price ELSE a.current_price END <= a.target_price,
+        price_recorded_at = GREATEST(a.price_recorded_at, EXCLUDED.price_recorded_at),
+        updated_at = EXCLUDED.updated_at
+    RETURNING a.id, a.ticker_symbol, (xmax = 0) AS inserted
+""")
 
 
 class AssetService:
     @staticmethod
-    def create_asset(db: Session, asset_data: AssetSchema, asset_name: str = None):
-        asset = Asset(
+    def build_asset(asset_data: AssetSchema, asset_name: str = None) -> Asset:
+        return Asset(
             ticker_symbol=asset_data.ticker_symbol.upper(),
             asset_name=asset_name or asset_data.ticker_symbol,
             currency_code=asset_data.currency_code or "BRL",
             current_price=Decimal(str(asset_data.current_price)),
+            price_recorded_at=datetime.utcnow(),
             target_price=Decimal(str(asset_data.target_price)) if asset_data.target_price else None,
             drop_alert_enabled=asset_data.drop_alert_enabled,
             target_gap_percentage=asset_data.target_gap_percentage,
@@ -21,6 +47,80 @@ class AssetService:
             pl_ratio=asset_data.pl_ratio,
             pvpa_ratio=asset_data.pvpa_ratio,
         )
+
+    @staticmethod
+    def apply_update(asset: Asset, asset_data: AssetSchema) -> bool:
+        """Copy the set fields onto asset; returns True when current_price changed."""
+        price_changed = False
+        if asset_data.current_price:
+            price = Decimal(str(asset_data.current_price))
+            price_changed = price != asset.current_price
+            asset.current_price = price
+            asset.price_recorded_at = datetime.utcnow()
+        if asset_data.target_price:
+            asset.target_price = Decimal(str(asset_data.target_price))
+        if asset_data.drop_alert_enabled is not None:
+            asset.drop_alert_enabled = asset_data.drop_alert_enabled
+        if asset_data.target_gap_percentage:
+            asset.target_gap_percentage = asset_data.target_gap_percentage
+        if asset_data.sector:
+            asset.sector = asset_data.sector
+        if asset_data.pl_ratio:
+            asset.pl_ratio = asset_data.pl_ratio
+        if asset_data.pvpa_ratio:
+            asset.pvpa_ratio = asset_data.pvpa_ratio
+        asset.time_to_buy = asset.target_price is not None and asset.current_price <= asset.target_price
+        asset.updated_at = datetime.utcnow()
+        return price_changed
+
+    @staticmethod
+    def price_history_entry(asset: Asset) -> AssetPriceHistory:
+        return AssetPriceHistory(asset_id=asset.id, price=asset.current_price, recorded_at=asset.price_recorded_at)
+
+    @staticmethod
+    def prepare_price_batch(rows: List[AssetPriceRowSchema]) -> Tuple[Dict[str, Tuple[Decimal, datetime]], List[Tuple[str, Decimal, datetime]]]:
+        """Latest (price, recorded_at) per ticker for dim_asset, and every row for history."""
+        now = datetime.utcnow()
+        latest: Dict[str, Tuple[Decimal, datetime]] = {}
+        history: List[Tuple[str, Decimal, datetime]] = []
+        for row in rows:
+            ticker = row.ticker_symbol.strip().upper()
+            recorded_at = row.recorded_at or now
+            if recorded_at.tzinfo is not None:
+                # Columns are TIMESTAMP WITHOUT TIME ZONE holding UTC
+                recorded_at = recorded_at.astimezone(timezone.utc).replace(tzinfo=None)
+            price = Decimal(str(row.price))
+            history.append((ticker, price, recorded_at))
+            current = latest.get(ticker)
+            if current is None or recorded_at >= current[1]:
+                latest[ticker] = (price, recorded_at)
+        return latest, history
+
+    @staticmethod
+    def drop_alert_rows(assets) -> list:
+        result = []
+        for asset in assets:
+            current = float(asset.current_price)
+            target = float(asset.target_price)
+            time_to_buy = current <= target
+            
+            if time_to_buy:
+                gap = ((target - current) / current * 100) if current > 0 else 0
+                result.append({
+                    "id": str(asset.id),
+                    "ticker_symbol": asset.ticker_symbol,
+                    "asset_name": asset.asset_name,
+                    "current_price": current,
+                    "target_price": target,
+                    "time_to_buy": True,
+                    "gap_percentage": round(gap, 2)
+                })
+        
+        return result
+
+    @staticmethod
+    def create_asset(db: Session, asset_data: AssetSchema, asset_name: str = None):
+        asset = AssetService.build_asset(asset_data, asset_name)
         db.add(asset)
         db.commit()
         db.refresh(asset)
@@ -43,22 +143,8 @@ class AssetService:
         if not asset:
             return None
         
-        if asset_data.current_price:
-            asset.current_price = Decimal(str(asset_data.current_price))
-        if asset_data.target_price:
-            asset.target_price = Decimal(str(asset_data.target_price))
-        if asset_data.drop_alert_enabled is not None:
-            asset.drop_alert_enabled = asset_data.drop_alert_enabled
-        if asset_data.target_gap_percentage:
-            asset.target_gap_percentage = asset_data.target_gap_percentage
-        if asset_data.sector:
-            asset.sector = asset_data.sector
-        if asset_data.pl_ratio:
-            asset.pl_ratio = asset_data.pl_ratio
-        if asset_data.pvpa_ratio:
-            asset.pvpa_ratio = asset_data.pvpa_ratio
-        
-        asset.updated_at = datetime.utcnow()
+        if AssetService.apply_update(asset, asset_data):
+            db.add(AssetService.price_history_entry(asset))
         db.commit()
         db.refresh(asset)
         return asset
@@ -80,26 +166,7 @@ class AssetService:
             Asset.target_price.isnot(None),
             Asset.is_active == True
         ).all()
-        
-        result = []
-        for asset in assets:
-            current = float(asset.current_price)
-            target = float(asset.target_price)
-            time_to_buy = current <= target
-            
-            if time_to_buy:
-                gap = ((target - current) / current * 100) if current > 0 else 0
-                result.append({
-                    "id": str(asset.id),
-                    "ticker_symbol": asset.ticker_symbol,
-                    "asset_name": asset.asset_name,
-                    "current_price": current,
-                    "target_price": target,
-                    "time_to_buy": True,
-                    "gap_percentage": round(gap, 2)
-                })
-        
-        return result
+        return AssetService.drop_alert_rows(assets)
 
     @staticmethod
     def record_price_history(db: Session, asset_id: UUID, price: Decimal):
@@ -110,3 +177,105 @@ class AssetService:
         )
         db.add(history)
         db.commit()
+
+
+class AsyncAssetService:
+    """AssetService over an AsyncSession, for routes served on the event loop."""
+
+    @staticmethod
+    async def create_asset(db: AsyncSession, asset_data: AssetSchema, asset_name: str = None):
+        asset = AssetService.build_asset(asset_data, asset_name)
+        db.add(asset)
+        await db.commit()
+        await db.refresh(asset)
+        return asset
+
+    @staticmethod
+    async def get_asset_by_ticker(db: AsyncSession, ticker_symbol: str):
+        result = await db.execute(select(Asset).where(Asset.ticker_symbol == ticker_symbol.upper()).limit(1))
+        return result.scalar()
+
+    @staticmethod
+    async def get_all_assets(db: AsyncSession, active_only: bool = True):
+        stmt = select(Asset)
+        if active_only:
+            stmt = stmt.where(Asset.is_active == True)
+        return (await db.execute(stmt)).scalars().all()
+
+    @staticmethod
+    async def update_asset(db: AsyncSession, ticker_symbol: str, asset_data: AssetSchema):
+        asset = await AsyncAssetService.get_asset_by_ticker(db, ticker_symbol)
+        if not asset:
+            return None
+        
+        if AssetService.apply_update(asset, asset_data):
+            db.add(AssetService.price_history_entry(asset))
+        await db.commit()
+        await db.refresh(asset)
+        return asset
+
+    @staticmethod
+    async def delete_asset(db: AsyncSession, ticker_symbol: str):
+        asset = await AsyncAssetService.get_asset_by_ticker(db, ticker_symbol)
+        if not asset:
+            return False
+        asset.is_active = False
+        asset.updated_at = datetime.utcnow()
+        await db.commit()
+        return True
+
+    @staticmethod
+    async def get_drop_alert_assets(db: AsyncSession):
+        result = await db.execute(select(Asset).where(
+            Asset.drop_alert_enabled == True,
+            Asset.target_price.isnot(None),
+            Asset.is_active == True
+        ))
+        return AssetService.drop_alert_rows(result.scalars().all())
+
+    @staticmethod
+    async def record_price_history(db: AsyncSession, asset_id: UUID, price: Decimal):
+        db.add(AssetPriceHistory(asset_id=asset_id, price=price, recorded_at=datetime.utcnow()))
+        await db.commit()
+
+    @staticmethod
+    async def upsert_prices(db: AsyncSession, rows: List[AssetPriceRowSchema], currency_code: str = "BRL") -> dict:
+        """Upsert dim_asset prices and COPY every row into fct_asset_price_history, in one transaction."""
+        started = time.perf_counter()
+        latest, history = AssetService.prepare_price_batch(rows)
+        if not latest:
+            return {"rows": 0, "assets_updated": 0, "assets_created": 0, "history_rows": 0, "elapsed_ms": 0.0}
+        
+        tickers = list(latest)
+        try:
+            result = await db.execute(UPSERT_PRICES_SQL, {
+                "currency_code": currency_code,
+                "tickers": tickers,
+                "prices": [latest[t][0] for t in tickers],
+                "recorded_at": [latest[t][1] for t in tickers],
+            })
+            returned = result.all()
+            asset_ids = {row.ticker_symbol: row.id for row in returned}
+            
+            # COPY on the same asyncpg connection, inside the transaction the upsert opened
+            connection = await db.connection()
+            raw = await connection.get_raw_connection()
+            await raw.driver_connection.copy_records_to_table(
+                "fct_asset_price_history",
+                schema_name="app_magfi",
+                columns=["asset_id", "price", "recorded_at"],
+                records=[(asset_ids[ticker], price, recorded_at) for ticker, price, recorded_at in history],
+            )
+            await db.commit()
+        except Exception:
+            await db.rollback()
+            raise
+        
+        created = sum(1 for row in returned if row.inserted)
+        return {
+            "rows": len(rows),
+            "assets_updated": len(returned) - created,
+            "assets_created": created,
+            "history_rows": len(history),
+            "elapsed_ms": round((time.perf_counter() - started) * 1000, 2),
+        }
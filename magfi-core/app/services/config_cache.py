@@ -0,0 +1,138 @@
+from sqlalchemy import select, text
+from sqlalchemy.engine import make_url
+from app.config import settings
+from app.models import Config
+import asyncio
+import logging
+from typing import Dict, Iterable, List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+CHANGE_CHANNEL = "dim_config_changed"
+# last_value stays put on a sequence's first nextval(); is_called is what flips
+VERSION_QUERY = text(
+    "SELECT CASE WHEN is_called THEN last_value ELSE 0 END FROM app_magfi.dim_config_version"
+)
+
+
+class ConfigCache:
+    """Process-local copy of dim_config, so config reads are a dict lookup.
+
+    A trigger bumps app_magfi.dim_config_version and NOTIFYs dim_config_changed
+    on every write. The cache LISTENs on a dedicated connection for immediate
+    reloads and also polls the version every CONFIG_CACHE_POLL_SECONDS, which
+    covers missed notifications and poolers that do not support LISTEN.
+    """
+
+    _entries: Dict[str, dict] = {}
+    _version: Optional[int] = None
+    _loaded = False
+    _task: Optional[asyncio.Task] = None
+    _pending: Set[asyncio.Task] = set()
+    _reload_lock: Optional[asyncio.Lock] = None
+
+    @staticmethod
+    def is_loaded() -> bool:
+        return ConfigCache._loaded
+
+    @staticmethod
+    def get(config_name: str) -> Optional[dict]:
+        return ConfigCache._entries.get(config_name)
+
+    @staticmethod
+    def all() -> List[dict]:
+        return list(ConfigCache._entries.values())
+
+    @staticmethod
+    def to_entry(config_id, config_name: str, config_value: Optional[str]) -> dict:
+        return {"id": str(config_id), "config_name": config_name, "config_value": config_value}
+
+    @staticmethod
+    def apply(entries: Iterable[dict]):
+        """Write-through for rows this process just wrote; other processes catch up via NOTIFY."""
+        if ConfigCache._loaded:
+            for entry in entries:
+                ConfigCache._entries[entry["config_name"]] = entry
+
+    @staticmethod
+    async def reload():
+        from app.database import AsyncSessionLocal
+
+        if ConfigCache._reload_lock is None:
+            ConfigCache._reload_lock = asyncio.Lock()
+        async with ConfigCache._reload_lock:
+            async with AsyncSessionLocal() as db:
+                current = (await db.execute(VERSION_QUERY)).scalar()
+                # Version is read first: a write landing in between only causes one extra reload
+                rows = (await db.execute(select(Config.id, Config.config_name, Config.config_value))).all()
+            ConfigCache._entries = {row.config_name: ConfigCache.to_entry(*row) for row in rows}
+            ConfigCache._version = current
+            ConfigCache._loaded = True
+            logger.info(f"Config cache loaded {len(rows)} entries at version {current}")
+
+    @staticmethod
+    async def refresh_if_changed():
+        from app.database import AsyncSessionLocal
+
+        async with AsyncSessionLocal() as db:
+            current = (await db.execute(VERSION_QUERY)).scalar()
+        if current != ConfigCache._version or not ConfigCache._loaded:
+            await ConfigCache.reload()
+
+    @staticmethod
+    async def start():
+        try:
+            await ConfigCache.reload()
+        finally:
+            # The watcher retries the initial load if it failed
+            ConfigCache._task = asyncio.create_task(ConfigCache._watch())
+
+    @staticmethod
+    async def stop():
+        if ConfigCache._task is not None:
+            ConfigCache._task.cancel()
+            try:
+                await ConfigCache._task
+            except asyncio.CancelledError:
+                pass
+            ConfigCache._task = None
+
+    @staticmethod
+    def _on_notify(connection, pid, channel, payload):
+        task = asyncio.get_running_loop().create_task(ConfigCache.refresh_if_changed())
+        ConfigCache._pending.add(task)
+        task.add_done_callback(ConfigCache._pending.discard)
+
+    @staticmethod
+    async def _connect_listener():
+        import asyncpg
+
+        # asyncpg takes a plain libpq-style DSN, without a SQLAlchemy driver suffix
+        dsn = make_url(settings.database_url).set(drivername="postgresql").render_as_string(hide_password=False)
+        connection = await asyncpg.connect(dsn)
+        await connection.add_listener(CHANGE_CHANNEL, ConfigCache._on_notify)
+        return connection
+
+    @staticmethod
+    async def _watch():
+        connection = None
+        try:
+            while True:
+                try:
+                    if settings.config_cache_listen and (connection is None or connection.is_closed()):
+                        connection = await ConfigCache._connect_listener()
+                        # Anything written while we were not listening
+                        await ConfigCache.refresh_if_changed()
+                    await asyncio.sleep(settings.config_cache_poll_seconds)
+                    await ConfigCache.refresh_if_changed()
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    logger.warning(f"Config cache watcher error: {str(e)}")
+                    if connection is not None and not connection.is_closed():
+                        connection.terminate()
+                    connection = None
+                    await asyncio.sleep(settings.config_cache_poll_seconds)
+        finally:
+            if connection is not None and not connection.is_closed():
+                await connection.close()
@@ -1,7 +1,12 @@
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from app.models import Config
 from app.schemas import ConfigSchema
+from app.services.config_cache import ConfigCache
 from datetime import datetime
+from typing import Dict, List, Optional
 
 
 class ConfigService:
@@ -31,3 +36,77 @@ class ConfigService:
     @staticmethod
     def update_config(db: Session, config_name: str, config_value: str):
         return ConfigService.set_config(db, config_name, config_value)
+
+
+class AsyncConfigService:
+    """ConfigService over an AsyncSession, for routes served on the event loop."""
+
+    @staticmethod
+    async def set_config(db: AsyncSession, config_name: str, config_value: str):
+        config = await AsyncConfigService.get_config(db, config_name)
+        
+        if config:
+            config.config_value = config_value
+            config.updated_at = datetime.utcnow()
+        else:
+            config = Config(config_name=config_name, config_value=config_value)
+            db.add(config)
+        
+        await db.commit()
+        await db.refresh(config)
+        return config
+
+    @staticmethod
+    async def get_config(db: AsyncSession, config_name: str):
+        result = await db.execute(select(Config).where(Config.config_name == config_name).limit(1))
+        return result.scalar()
+
+    @staticmethod
+    async def get_all_configs(db: AsyncSession):
+        return (await db.execute(select(Config))).scalars().all()
+
+    @staticmethod
+    async def update_config(db: AsyncSession, config_name: str, config_value: str):
+        return await AsyncConfigService.set_config(db, config_name, config_value)
+
+    @staticmethod
+    async def get_config_entry(db: AsyncSession, config_name: str) -> Optional[dict]:
+        """Read-through: served from ConfigCache once it is loaded."""
+        if ConfigCache.is_loaded():
+            return ConfigCache.get(config_name)
+        config = await AsyncConfigService.get_config(db, config_name)
+        return ConfigCache.to_entry(config.id, config.config_name, config.config_value) if config else None
+
+    @staticmethod
+    async def get_all_config_entries(db: AsyncSession) -> List[dict]:
+        if ConfigCache.is_loaded():
+            return ConfigCache.all()
+        configs = await AsyncConfigService.get_all_configs(db)
+        return [ConfigCache.to_entry(c.id, c.config_name, c.config_value) for c in configs]
+
+    @staticmethod
+    async def upsert_configs(db: AsyncSession, values: Dict[str, str]) -> List[dict]:
+        """Insert or update every key with one INSERT ... ON CONFLICT and one commit."""
+        if not values:
+            return []
+        
+        now = datetime.utcnow()
+        stmt = pg_insert(Config).values([
+            {"config_name": name, "config_value": value, "updated_at": now}
+            for name, value in values.items()
+        ])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[Config.config_name],
+            set_={"config_value": stmt.excluded.config_value, "updated_at": stmt.excluded.updated_at},
+        ).returning(Config.id, Config.config_name, Config.config_value)
+        
+        try:
+            rows = (await db.execute(stmt)).all()
+            await db.commit()
+        except Exception:
+            await db.rollback()
+            raise
+        
+        entries = [ConfigCache.to_entry(*row) for row in rows]
+        ConfigCache.apply(entries)
+        return entries
@@ -1,22 +1,133 @@
+from pydantic import ValidationError
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
+from app.config import settings
 from app.models import Currency, CurrencyPriceHistory
-from app.schemas import CurrencySchema
+from app.schemas import CurrencySchema, CurrencyRateRowSchema
+from app.services.stream_parser import ParsedLine
 from uuid import UUID
-from datetime import datetime
+from datetime import datetime, timezone
 from decimal import Decimal
+from typing import AsyncIterator, Dict, List, Tuple
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+# Same shape as the asset price upsert: one statement per batch whatever its size,
+# newest rate per currency wins (guarded by price_recorded_at), older rates only go
+# to history, and updated_at is the write time.
+UPSERT_RATES_SQL = text("""
+    INSERT INTO app_magfi.dim_currency AS c
+        (currency_code, currency_name, base_currency, current_price, price_recorded_at, updated_at)
+    SELECT t.code, t.code, t.base, t.price, t.recorded_at, timezone('utc', now())
+    FROM unnest(CAST(:codes AS VARCHAR[]), CAST(:bases AS VARCHAR[]), CAST(:prices AS NUMERIC[]),
+                CAST(:recorded_at AS TIMESTAMP[]))
+        AS t(code, base, price, recorded_at)
+    ON CONFLICT (currency_code) DO UPDATE SET
+        current_price = CASE WHEN c.price_recorded_at IS NULL OR EXCLUDED.price_recorded_at >= c.price_recorded_at
+                             THEN EXCLUDED.current_price ELSE c.current_price END,
+        time_to_buy = c.target_price IS NOT NULL AND
+                      CASE WHEN c.price_recorded_at IS NULL OR EXCLUDED.price_recorded_at >= c.price_recorded_at
+                           THEN EXCLUDED.current_price ELSE c.current_price END <= c.target_price,
+        price_recorded_at = GREATEST(c.price_recorded_at, EXCLUDED.price_recorded_at),
+        updated_at = EXCLUDED.updated_at
+    RETURNING c.id, c.currency_code, (xmax = 0) AS inserted
+""")
+
+
+class RateStreamError(Exception):
+    """A rate stream stopped part-way; report holds what the committed batches wrote.
+
+    committed_through_line is the last input line covered by a committed batch,
+    so a client can resend the upload from the line after it without
+    duplicating history rows.
+    """
+
+    def __init__(self, message: str, report: dict):
+        super().__init__(message)
+        self.report = report
 
 
 class CurrencyService:
     @staticmethod
-    def create_currency(db: Session, currency_data: CurrencySchema):
-        currency = Currency(
+    def build_currency(currency_data: CurrencySchema) -> Currency:
+        return Currency(
             currency_code=currency_data.currency_code.upper(),
             currency_name=currency_data.currency_code,
             base_currency=currency_data.base_currency or "BRL",
             current_price=Decimal(str(currency_data.current_price)),
+            price_recorded_at=datetime.utcnow(),
             target_price=Decimal(str(currency_data.target_price)) if currency_data.target_price else None,
             drop_alert_enabled=currency_data.drop_alert_enabled,
         )
+
+    @staticmethod
+    def apply_update(currency: Currency, currency_data: CurrencySchema) -> bool:
+        """Copy the set fields onto currency; returns True when current_price changed."""
+        price_changed = False
+        if currency_data.current_price:
+            price = Decimal(str(currency_data.current_price))
+            price_changed = price != currency.current_price
+            currency.current_price = price
+            currency.price_recorded_at = datetime.utcnow()
+        if currency_data.target_price:
+            currency.target_price = Decimal(str(currency_data.target_price))
+        if currency_data.drop_alert_enabled is not None:
+            currency.drop_alert_enabled = currency_data.drop_alert_enabled
+        currency.time_to_buy = currency.target_price is not None and currency.current_price <= currency.target_price
+        currency.updated_at = datetime.utcnow()
+        return price_changed
+
+    @staticmethod
+    def price_history_entry(currency: Currency) -> CurrencyPriceHistory:
+        return CurrencyPriceHistory(currency_id=currency.id, price=currency.current_price, recorded_at=currency.price_recorded_at)
+
+    @staticmethod
+    def prepare_rate_batch(rows: List[CurrencyRateRowSchema]) -> Tuple[Dict[str, Tuple[str, Decimal, datetime]], List[Tuple[str, Decimal, datetime]]]:
+        """Latest (base, price, recorded_at) per currency for dim_currency, and every row for history."""
+        now = datetime.utcnow()
+        latest: Dict[str, Tuple[str, Decimal, datetime]] = {}
+        history: List[Tuple[str, Decimal, datetime]] = []
+        for row in rows:
+            code = row.currency_code.strip().upper()
+            recorded_at = row.recorded_at or now
+            if recorded_at.tzinfo is not None:
+                # Columns are TIMESTAMP WITHOUT TIME ZONE holding UTC
+                recorded_at = recorded_at.astimezone(timezone.utc).replace(tzinfo=None)
+            price = Decimal(str(row.price))
+            history.append((code, price, recorded_at))
+            current = latest.get(code)
+            if current is None or recorded_at >= current[2]:
+                latest[code] = ((row.base_currency or "BRL").upper(), price, recorded_at)
+        return latest, history
+
+    @staticmethod
+    def drop_alert_rows(currencies) -> list:
+        result = []
+        for currency in currencies:
+            current = float(currency.current_price)
+            target = float(currency.target_price)
+            time_to_buy = current <= target
+            
+            if time_to_buy:
+                gap = ((target - current) / current * 100) if current > 0 else 0
+                result.append({
+                    "id": str(currency.id),
+                    "currency_code": currency.currency_code,
+                    "currency_name": currency.currency_name,
+                    "current_price": current,
+                    "target_price": target,
+                    "time_to_buy": True,
+                    "gap_percentage": round(gap, 2)
+                })
+        
+        return result
+
+    @staticmethod
+    def create_currency(db: Session, currency_data: CurrencySchema):
+        currency = CurrencyService.build_currency(currency_data)
         db.add(currency)
         db.commit()
         db.refresh(currency)
@@ -39,14 +150,8 @@ class CurrencyService:
         if not currency:
             return None
         
-        if currency_data.current_price:
-            currency.current_price = Decimal(str(currency_data.current_price))
-        if currency_data.target_price:
-            currency.target_price = Decimal(str(currency_data.target_price))
-        if currency_data.drop_alert_enabled is not None:
-            currency.drop_alert_enabled = currency_data.drop_alert_enabled
-        
-        currency.updated_at = datetime.utcnow()
+        if CurrencyService.apply_update(currency, currency_data):
+            db.add(CurrencyService.price_history_entry(currency))
         db.commit()
         db.refresh(currency)
         return currency
@@ -68,26 +173,7 @@ class CurrencyService:
             Currency.target_price.isnot(None),
             Currency.is_active == True
         ).all()
-        
-        result = []
-        for currency in currencies:
-            current = float(currency.current_price)
-            target = float(currency.target_price)
-            time_to_buy = current <= target
-            
-            if time_to_buy:
-                gap = ((target - current) / current * 100) if current > 0 else 0
-                result.append({
-                    "id": str(currency.id),
-                    "currency_code": currency.currency_code,
-                    "currency_name": currency.currency_name,
-                    "current_price": current,
-                    "target_price": target,
-                    "time_to_buy": True,
-                    "gap_percentage": round(gap, 2)
-                })
-        
-        return result
+        return CurrencyService.drop_alert_rows(currencies)
 
     @staticmethod
     def record_price_history(db: Session, currency_id: UUID, price: Decimal):
@@ -98,3 +184,158 @@ class CurrencyService:
         )
         db.add(history)
         db.commit()
+
+
+class AsyncCurrencyService:
+    """CurrencyService over an AsyncSession, for routes served on the event loop."""
+
+    @staticmethod
+    async def create_currency(db: AsyncSession, currency_data: CurrencySchema):
+        currency = CurrencyService.build_currency(currency_data)
+        db.add(currency)
+        await db.commit()
+        await db.refresh(currency)
+        return currency
+
+    @staticmethod
+    async def get_currency_by_code(db: AsyncSession, currency_code: str):
+        result = await db.execute(select(Currency).where(Currency.currency_code == currency_code.upper()).limit(1))
+        return result.scalar()
+
+    @staticmethod
+    async def get_all_currencies(db: AsyncSession, active_only: bool = True):
+        stmt = select(Currency)
+        if active_only:
+            stmt = stmt.where(Currency.is_active == True)
+        return (await db.execute(stmt)).scalars().all()
+
+    @staticmethod
+    async def update_currency(db: AsyncSession, currency_code: str, currency_data: CurrencySchema):
+        currency = await AsyncCurrencyService.get_currency_by_code(db, currency_code)
+        if not currency:
+            return None
+        
+        if CurrencyService.apply_update(currency, currency_data):
+            db.add(CurrencyService.price_history_entry(currency))
+        await db.commit()
+        await db.refresh(currency)
+        return currency
+
+    @staticmethod
+    async def delete_currency(db: AsyncSession, currency_code: str):
+        currency = await AsyncCurrencyService.get_currency_by_code(db, currency_code)
+        if not currency:
+            return False
+        currency.is_active = False
+        currency.updated_at = datetime.utcnow()
+        await db.commit()
+        return True
+
+    @staticmethod
+    async def get_drop_alert_currencies(db: AsyncSession):
+        result = await db.execute(select(Currency).where(
+            Currency.drop_alert_enabled == True,
+            Currency.target_price.isnot(None),
+            Currency.is_active == True
+        ))
+        return CurrencyService.drop_alert_rows(result.scalars().all())
+
+    @staticmethod
+    async def record_price_history(db: AsyncSession, currency_id: UUID, price: Decimal):
+        db.add(CurrencyPriceHistory(currency_id=currency_id, price=price, recorded_at=datetime.utcnow()))
+        await db.commit()
+
+    @staticmethod
+    async def upsert_rates(db: AsyncSession, rows: List[CurrencyRateRowSchema]) -> dict:
+        """Upsert dim_currency rates and COPY every row into fct_currency_price_history, in one transaction."""
+        latest, history = CurrencyService.prepare_rate_batch(rows)
+        if not latest:
+            return {"currencies_updated": 0, "currencies_created": 0, "history_rows": 0}
+        
+        codes = list(latest)
+        try:
+            result = await db.execute(UPSERT_RATES_SQL, {
+                "codes": codes,
+                "bases": [latest[c][0] for c in codes],
+                "prices": [latest[c][1] for c in codes],
+                "recorded_at": [latest[c][2] for c in codes],
+            })
+            returned = result.all()
+            currency_ids = {row.currency_code: row.id for row in returned}
+            
+            # COPY on the same asyncpg connection, inside the transaction the upsert opened
+            connection = await db.connection()
+            raw = await connection.get_raw_connection()
+            await raw.driver_connection.copy_records_to_table(
+                "fct_currency_price_history",
+                schema_name="app_magfi",
+                columns=["currency_id", "price", "recorded_at"],
+                records=[(currency_ids[code], price, recorded_at) for code, price, recorded_at in history],
+            )
+            await db.commit()
+        except Exception:
+            await db.rollback()
+            raise
+        
+        created = sum(1 for row in returned if row.inserted)
+        return {"currencies_updated": len(returned) - created, "currencies_created": created, "history_rows": len(history)}
+
+    @staticmethod
+    async def ingest_rate_stream(db: AsyncSession, lines: AsyncIterator[ParsedLine]) -> dict:
+        """Validate streamed rows and write them in FX_BATCH_SIZE set-based batches.
+        
+        Each batch commits on its own, so a failure part-way through keeps the
+        batches already written and raises RateStreamError with their counts and
+        the last line they cover; rows that fail validation are counted and
+        skipped rather than aborting the upload. "rows" counts valid rows parsed,
+        "committed_rows" those in committed batches.
+        """
+        started = time.perf_counter()
+        report = {
+            "rows": 0, "committed_rows": 0, "rejected": 0, "batches": 0, "committed_through_line": 0,
+            "currencies_updated": 0, "currencies_created": 0, "history_rows": 0, "errors": [],
+        }
+        batch: List[CurrencyRateRowSchema] = []
+        line_number = 0
+
+        async def flush():
+            result = await AsyncCurrencyService.upsert_rates(db, batch)
+            report["batches"] += 1
+            report["committed_rows"] += len(batch)
+            report["committed_through_line"] = line_number
+            for key in ("currencies_updated", "currencies_created", "history_rows"):
+                report[key] += result[key]
+            batch.clear()
+
+        try:
+            async for line_number, fields, error in lines:
+                if error is None:
+                    try:
+                        batch.append(CurrencyRateRowSchema(**fields))
+                        report["rows"] += 1
+                    except ValidationError as e:
+                        error = "; ".join(f"{'.'.join(map(str, err['loc']))}: {err['msg']}" for err in e.errors())
+                if error is not None:
+                    report["rejected"] += 1
+                    if len(report["errors"]) < settings.fx_max_reported_errors:
+                        report["errors"].append({"line": line_number, "error": error})
+                    continue
+                if len(batch) >= settings.fx_batch_size:
+                    await flush()
+            if batch:
+                await flush()
+        except Exception as e:
+            logger.error(
+                f"FX rate stream failed after {report['batches']} committed batches "
+                f"(through line {report['committed_through_line']}): {str(e)}"
+            )
+            raise RateStreamError(str(e), report) from e
+        
+        elapsed = time.perf_counter() - started
+        report["elapsed_seconds"] = round(elapsed, 3)
+        report["rows_per_second"] = round(report["rows"] / elapsed, 1) if elapsed else None
+        logger.info(
+            f"Ingested {report['rows']} FX rates in {report['batches']} batches "
+            f"({report['rows_per_second']} rows/s, {report['rejected']} rejected)"
+        )
+        return report
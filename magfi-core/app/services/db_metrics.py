@@ -0,0 +1,125 @@
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from app.config import settings
+import heapq
+import logging
+import threading
+import time
+from typing import Dict
+
+logger = logging.getLogger(__name__)
+
+
+class _TimedCheckout:
+    """Pool mixin recording how long each checkout waited for a connection."""
+
+    metrics_name = "default"
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            DatabaseMetrics.record_checkout(self.metrics_name, (time.perf_counter() - started) * 1000, timed_out=True)
+            raise
+        DatabaseMetrics.record_checkout(self.metrics_name, (time.perf_counter() - started) * 1000)
+        return connection
+
+
+class DatabaseMetrics:
+    """Process-wide connection pool and query timing per engine.
+
+    Checkout waits come from a pool subclass, query times from cursor events;
+    the slowest statements are kept in a bounded min-heap so tracking them
+    costs O(log n) per query and fixed memory.
+    """
+
+    _engines: Dict[str, object] = {}
+    _pools: Dict[str, dict] = {}
+    _queries: Dict[str, dict] = {}
+    _lock = threading.Lock()
+
+    @staticmethod
+    def pool_class(base, name: str):
+        # pool.recreate() instantiates self.__class__, so the name survives dispose()
+        return type(f"Timed{base.__name__}", (_TimedCheckout, base), {"metrics_name": name})
+
+    @staticmethod
+    def instrument(engine, name: str):
+        """Attach query timing to a sync Engine (pass async_engine.sync_engine for async ones)."""
+        DatabaseMetrics._engines[name] = engine
+
+        @event.listens_for(engine, "before_cursor_execute")
+        def _before(conn, cursor, statement, parameters, context, executemany):
+            conn.info.setdefault("query_started", []).append((context, time.perf_counter()))
+
+        @event.listens_for(engine, "after_cursor_execute")
+        def _after(conn, cursor, statement, parameters, context, executemany):
+            _, started = conn.info["query_started"].pop()
+            DatabaseMetrics.record_query(name, statement, (time.perf_counter() - started) * 1000)
+
+        @event.listens_for(engine, "handle_error")
+        def _error(exception_context):
+            # after_cursor_execute does not fire for a failed statement; drop its start time here
+            connection = exception_context.connection
+            stack = connection.info.get("query_started") if connection is not None else None
+            if stack and stack[-1][0] is exception_context.execution_context:
+                stack.pop()
+
+    @staticmethod
+    def record_checkout(name: str, wait_ms: float, timed_out: bool = False):
+        with DatabaseMetrics._lock:
+            metrics = DatabaseMetrics._pools.setdefault(
+                name, {"checkouts": 0, "timeouts": 0, "total_wait_ms": 0.0, "max_wait_ms": 0.0}
+            )
+            metrics["checkouts"] += 1
+            metrics["timeouts"] += int(timed_out)
+            metrics["total_wait_ms"] += wait_ms
+            metrics["max_wait_ms"] = max(metrics["max_wait_ms"], wait_ms)
+
+    @staticmethod
+    def record_query(name: str, statement: str, elapsed_ms: float):
+        if elapsed_ms >= settings.db_slow_query_ms:
+            logger.warning(f"Slow query on {name} ({elapsed_ms:.1f} ms): {statement[:200]}")
+        with DatabaseMetrics._lock:
+            metrics = DatabaseMetrics._queries.setdefault(name, {"queries": 0, "total_ms": 0.0, "slowest": []})
+            metrics["queries"] += 1
+            metrics["total_ms"] += elapsed_ms
+            slowest = metrics["slowest"]
+            if len(slowest) < settings.db_slow_query_log_size:
+                heapq.heappush(slowest, (elapsed_ms, " ".join(statement.split())[:500]))
+            elif elapsed_ms > slowest[0][0]:
+                heapq.heapreplace(slowest, (elapsed_ms, " ".join(statement.split())[:500]))
+
+    @staticmethod
+    def snapshot() -> Dict[str, dict]:
+        result = {}
+        with DatabaseMetrics._lock:
+            for name, engine in DatabaseMetrics._engines.items():
+                pool = engine.pool
+                pools = DatabaseMetrics._pools.get(name, {})
+                queries = DatabaseMetrics._queries.get(name, {})
+                capacity = pool.size() + max(pool._max_overflow, 0)
+                checkouts = pools.get("checkouts", 0)
+                result[name] = {
+                    "pool": {
+                        "size": pool.size(),
+                        "max_overflow": pool._max_overflow,
+                        "checked_out": pool.checkedout(),
+                        "overflow": max(pool.overflow(), 0),
+                        "saturation": round(pool.checkedout() / capacity, 3) if capacity else None,
+                        "checkouts": checkouts,
+                        "timeouts": pools.get("timeouts", 0),
+                        "avg_wait_ms": round(pools["total_wait_ms"] / checkouts, 3) if checkouts else 0.0,
+                        "max_wait_ms": round(pools.get("max_wait_ms", 0.0), 3),
+                    },
+                    "queries": {
+                        "count": queries.get("queries", 0),
+                        "avg_ms": round(queries["total_ms"] / queries["queries"], 3) if queries.get("queries") else 0.0,
+                        "slowest": [
+                            {"ms": round(ms, 3), "statement": statement}
+                            for ms, statement in sorted(queries.get("slowest", []), reverse=True)
+                        ],
+                    },
+                }
+        return result
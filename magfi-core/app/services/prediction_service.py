@@ -1,5 +1,5 @@
-import httpx
 from app.config import settings
+from app.services.http_client import HttpClientRegistry
 import logging
 
 logger = logging.getLogger(__name__)
@@ -9,13 +9,11 @@ class PredictionService:
     @staticmethod
     async def get_market_prediction():
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    f"{settings.magfi_predictor_url}/predict",
-                    timeout=30.0
-                )
-                response.raise_for_status()
-                return response.json()
+            response = await HttpClientRegistry.request(
+                "magfi-predictor", settings.magfi_predictor_url, "GET", "/predict"
+            )
+            response.raise_for_status()
+            return response.json()
         except Exception as e:
             logger.error(f"Error fetching prediction: {str(e)}")
             return {
@@ -26,13 +24,11 @@ class PredictionService:
     @staticmethod
     async def get_asset_prediction(ticker_symbol: str):
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    f"{settings.magfi_predictor_url}/predict/{ticker_symbol}",
-                    timeout=30.0
-                )
-                response.raise_for_status()
-                return response.json()
+            response = await HttpClientRegistry.request(
+                "magfi-predictor", settings.magfi_predictor_url, "GET", f"/predict/{ticker_symbol}"
+            )
+            response.raise_for_status()
+            return response.json()
         except Exception as e:
             logger.error(f"Error fetching prediction for {ticker_symbol}: {str(e)}")
             return {
@@ -9,6 +9,22 @@ CREATE TABLE IF NOT EXISTS app_magfi.dim_config (
 
 CREATE INDEX idx_config_name ON app_magfi.dim_config(config_name);
 
+-- Bumped once per statement that changes dim_config; services LISTEN on
+-- dim_config_changed for the new value, or poll it when LISTEN is unavailable
+CREATE SEQUENCE IF NOT EXISTS app_magfi.dim_config_version;
+
+CREATE OR REPLACE FUNCTION app_magfi.notify_dim_config_changed() RETURNS trigger AS $$
+BEGIN
+    PERFORM pg_notify('dim_config_changed', nextval('app_magfi.dim_config_version')::TEXT);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_dim_config_changed ON app_magfi.dim_config;
+CREATE TRIGGER trg_dim_config_changed
+    AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON app_magfi.dim_config
+    FOR EACH STATEMENT EXECUTE FUNCTION app_magfi.notify_dim_config_changed();
+
 -- Insert default configurations
 INSERT INTO app_magfi.dim_config (config_name, config_value) 
 VALUES 
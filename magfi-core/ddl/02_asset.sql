@@ -21,6 +21,10 @@ CREATE INDEX idx_ticker_symbol ON app_magfi.dim_asset(ticker_symbol);
 CREATE INDEX idx_asset_active ON app_magfi.dim_asset(is_active);
 CREATE INDEX idx_asset_alert ON app_magfi.dim_asset(drop_alert_enabled, is_active);
 
+-- When current_price was observed (the batch upsert's stale-price guard); updated_at stays the
+-- time the row was last written
+ALTER TABLE app_magfi.dim_asset ADD COLUMN IF NOT EXISTS price_recorded_at TIMESTAMP;
+
 -- Asset price history fact table
 CREATE TABLE IF NOT EXISTS app_magfi.fct_asset_price_history (
     id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
@@ -31,3 +35,11 @@ CREATE TABLE IF NOT EXISTS app_magfi.fct_asset_price_history (
 );
 
 CREATE INDEX idx_asset_history ON app_magfi.fct_asset_price_history(asset_id, recorded_at);
+CREATE INDEX idx_asset_history_recorded ON app_magfi.fct_asset_price_history(recorded_at);
+
+-- recorded_at is the client's price time and may be backfilled; ingested_at is when the row
+-- landed, so readers can follow new history in insertion order
+ALTER TABLE app_magfi.fct_asset_price_history ADD COLUMN IF NOT EXISTS ingested_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP;
+CREATE INDEX IF NOT EXISTS idx_asset_history_ingested ON app_magfi.fct_asset_price_history(ingested_at);
+CREATE INDEX IF NOT EXISTS idx_asset_history_asset_ingested ON app_magfi.fct_asset_price_history(asset_id, ingested_at);
+CREATE INDEX IF NOT EXISTS idx_asset_updated ON app_magfi.dim_asset(updated_at);
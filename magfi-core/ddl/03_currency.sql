@@ -17,6 +17,10 @@ CREATE INDEX idx_currency_code ON app_magfi.dim_currency(currency_code);
 CREATE INDEX idx_currency_active ON app_magfi.dim_currency(is_active);
 CREATE INDEX idx_currency_alert ON app_magfi.dim_currency(drop_alert_enabled, is_active);
 
+-- When current_price was observed (the batch upsert's stale-rate guard); updated_at stays the
+-- time the row was last written
+ALTER TABLE app_magfi.dim_currency ADD COLUMN IF NOT EXISTS price_recorded_at TIMESTAMP;
+
 -- Currency price history fact table
 CREATE TABLE IF NOT EXISTS app_magfi.fct_currency_price_history (
     id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
@@ -39,10 +39,16 @@ CREATE TABLE IF NOT EXISTS app_magfi.fct_prediction (
     predicted_price NUMERIC(15, 4),
     confidence_score FLOAT NOT NULL,
     prediction_date TIMESTAMP NOT NULL,
+    horizon_days INTEGER,
     analysis_summary TEXT,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     FOREIGN KEY (asset_id) REFERENCES app_magfi.dim_asset(id) ON DELETE SET NULL
 );
 
-CREATE INDEX idx_prediction_asset ON app_magfi.fct_prediction(asset_id);
-CREATE INDEX idx_prediction_date ON app_magfi.fct_prediction(prediction_date);
+-- Tables created before horizon_days existed
+ALTER TABLE app_magfi.fct_prediction ADD COLUMN IF NOT EXISTS horizon_days INTEGER;
+
+CREATE INDEX IF NOT EXISTS idx_prediction_asset ON app_magfi.fct_prediction(asset_id);
+CREATE INDEX IF NOT EXISTS idx_prediction_date ON app_magfi.fct_prediction(prediction_date);
+-- Latest prediction per asset is a single backward seek on this index
+CREATE INDEX IF NOT EXISTS idx_prediction_asset_date ON app_magfi.fct_prediction(asset_id, prediction_date DESC);
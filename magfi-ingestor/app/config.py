@@ -1,5 +1,7 @@
 from pydantic_settings import BaseSettings
 from typing import Optional, List
+import os
+import socket
 
 
 class Settings(BaseSettings):
@@ -11,8 +13,20 @@ class Settings(BaseSettings):
     supabase_url: str
     supabase_key: str
     
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout: float = 30.0
+    db_pool_recycle: int = 1800
+    db_statement_timeout_ms: int = 0
+    db_echo: bool = False
+    db_slow_query_ms: float = 500.0
+    db_slow_query_log_size: int = 20
+    
     openai_api_key: Optional[str] = None
+    openai_base_url: Optional[str] = None
+    openai_model: str = "gpt-3.5-turbo"
     gemini_api_key: Optional[str] = None
+    gemini_model: str = "gemini-pro"
     
     api_port: int = 8200
     api_host: str = "0.0.0.0"
@@ -20,7 +34,36 @@ class Settings(BaseSettings):
     
     rss_feeds: str = ""
     batch_processing_interval: int = 300
+    scheduler_enabled: bool = True
+    job_history_size: int = 100
+    # "openai", "gemini" or "lexicon" (local only, no LLM calls)
     sentiment_analysis_model: str = "openai"
+    lexicon_prefilter_enabled: bool = True
+    lexicon_confidence_threshold: float = 0.75
+    
+    rss_max_concurrency: int = 10
+    rss_fetch_timeout: float = 15.0
+    
+    analysis_batch_size: int = 5
+    analysis_max_concurrency: int = 4
+    analysis_max_retries: int = 3
+    analysis_retry_base_delay: float = 1.0
+    analysis_timeout: float = 60.0
+    
+    dedup_cache_size: int = 50000
+    
+    analysis_cache_enabled: bool = True
+    analysis_cache_ttl_seconds: int = 7 * 24 * 3600
+    analysis_cache_max_entries: int = 100000
+    
+    worker_id: str = f"{socket.gethostname()}-{os.getpid()}"
+    queue_claim_batch_size: int = 50
+    queue_lease_seconds: int = 600
+    
+    stream_batch_size: int = 500
+    
+    asset_matcher_min_ticker_length: int = 2
+    asset_matcher_reconcile_seconds: int = 3600
     
     class Config:
         env_file = ".env"
@@ -3,6 +3,9 @@ from fastapi.middleware.cors import CORSMiddleware
 import logging
 from app.config import settings
 from app.routes import health, ingest
+from app.services.ai_analyzer import AIAnalyzer
+from app.services.scheduler import IngestionScheduler
+from app.services.ingestion_pipeline import IngestionPipeline
 
 logging.basicConfig(level=settings.log_level)
 logger = logging.getLogger(__name__)
@@ -28,11 +31,18 @@ app.include_router(ingest.router)
 @app.on_event("startup")
 async def startup_event():
     logger.info(f"Starting {settings.app_name}")
+    try:
+        IngestionPipeline.refresh_assets()
+    except Exception as e:
+        logger.error(f"Asset matcher warm-up failed: {str(e)}")
+    IngestionScheduler.start()
 
 
 @app.on_event("shutdown")
 async def shutdown_event():
     logger.info(f"Shutting down {settings.app_name}")
+    IngestionScheduler.shutdown()
+    await AIAnalyzer.close()
 
 
 if __name__ == "__main__":
@@ -1,9 +1,21 @@
-from sqlalchemy import Column, String, DateTime, Boolean, UUID, ForeignKey, Float, Text
+from sqlalchemy import Column, String, DateTime, Boolean, UUID, ForeignKey, Float, Text, Integer
 import uuid
 from datetime import datetime
 from app.database import Base
 
 
+class Asset(Base):
+    """Read-only view of magfi-core's dim_asset, used to link analyses to assets."""
+    __tablename__ = "dim_asset"
+    __table_args__ = {"schema": "app_magfi"}
+    
+    id = Column(UUID(as_uuid=True), primary_key=True)
+    ticker_symbol = Column(String(20), nullable=False)
+    asset_name = Column(String(255), nullable=False)
+    is_active = Column(Boolean, default=True)
+    updated_at = Column(DateTime, nullable=True)
+
+
 class NewsRaw(Base):
     __tablename__ = "stg_news_raw"
     __table_args__ = {"schema": "app_magfi"}
@@ -15,7 +27,10 @@ class NewsRaw(Base):
     link = Column(String(500), nullable=True)
     published_date = Column(DateTime, nullable=True)
     raw_data = Column(Text, nullable=True)
+    content_hash = Column(String(64), nullable=True, unique=True)
     is_processed = Column(Boolean, default=False)
+    claimed_by = Column(String(100), nullable=True)
+    lease_expires_at = Column(DateTime, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
 
 
@@ -33,3 +48,16 @@ class NewsAnalysis(Base):
     source_url = Column(String(500), nullable=True)
     analyzed_at = Column(DateTime, default=datetime.utcnow)
     created_at = Column(DateTime, default=datetime.utcnow)
+
+
+class AnalysisCacheEntry(Base):
+    __tablename__ = "cache_news_analysis"
+    __table_args__ = {"schema": "app_magfi"}
+    
+    cache_key = Column(String(64), primary_key=True)
+    model_name = Column(String(100), nullable=False)
+    prompt_version = Column(String(20), nullable=False)
+    result = Column(Text, nullable=False)
+    hit_count = Column(Integer, default=0)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    last_hit_at = Column(DateTime, default=datetime.utcnow)
@@ -1,6 +1,7 @@
 from fastapi import APIRouter, Depends
 from app.schemas import HealthResponseSchema
 from app.config import settings
+from app.services.db_metrics import DatabaseMetrics
 
 router = APIRouter(tags=["health"])
 
@@ -12,3 +13,8 @@ def health_check():
         "app_name": settings.app_name,
         "environment": settings.app_env,
     }
+
+
+@router.get("/metrics")
+def metrics():
+    return {"database": DatabaseMetrics.snapshot()}
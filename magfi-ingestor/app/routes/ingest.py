@@ -1,99 +1,133 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from app.database import get_db
 from app.schemas import ApiResponseSchema
-from app.services.rss_collector import RSSCollector
 from app.services.news_service import NewsService
-from app.services.ai_analyzer import AIAnalyzer
+from app.services.analysis_cache import AnalysisCache
+from app.services.asset_matcher import AssetMatcher
+from app.services.scheduler import IngestionScheduler
+from datetime import datetime
+from typing import Optional
+import json
 import logging
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/ingest", tags=["ingest"])
 
+DEFAULT_PAGE_SIZE = 100
 
-@router.post("/news", response_model=ApiResponseSchema)
-async def ingest_news(db: Session = Depends(get_db)):
-    try:
-        articles = RSSCollector.collect_feeds()
-        
-        saved_count = 0
-        for article in articles:
-            try:
-                news = NewsService.save_raw_news(db, article)
-                
-                analysis = await AIAnalyzer.analyze_sentiment(
-                    f"{article.get('title')} {article.get('content')}"
-                )
-                
-                analysis_data = {
-                    "asset_ticker": analysis.get("tickers", [None])[0] if analysis.get("tickers") else None,
-                    "news_title": article.get("title"),
-                    "news_content": article.get("content"),
-                    "sentiment": analysis.get("sentiment", "neutral"),
-                    "impact_score": analysis.get("impact_score", 0.5),
-                    "ai_analysis": analysis.get("analysis"),
-                    "source_url": article.get("link"),
-                }
-                
-                NewsService.save_analysis(db, analysis_data)
-                NewsService.mark_as_processed(db, news.id)
-                saved_count += 1
-            except Exception as e:
-                logger.error(f"Error processing article: {str(e)}")
-                continue
-        
-        return {
-            "success": True,
-            "data": {"ingested_count": saved_count},
-            "message": f"Successfully ingested {saved_count} news items"
-        }
-    except Exception as e:
-        logger.error(f"Ingestion error: {str(e)}")
-        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/news", response_model=ApiResponseSchema, status_code=202)
+async def ingest_news():
+    job_id = IngestionScheduler.enqueue(source="api")
+    return {
+        "success": True,
+        "data": {"job_id": job_id},
+        "message": "News ingestion enqueued"
+    }
+
+
+@router.get("/jobs/{job_id}", response_model=ApiResponseSchema)
+def get_ingestion_job(job_id: str):
+    job = IngestionScheduler.get_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    
+    return {
+        "success": True,
+        "data": job,
+        "message": f"Job {job['status']}"
+    }
+
+
+@router.get("/analysis-cache/stats", response_model=ApiResponseSchema)
+def get_analysis_cache_stats():
+    return {
+        "success": True,
+        "data": AnalysisCache.stats(),
+        "message": "Analysis cache statistics"
+    }
+
+
+def _raw_news_item(n) -> dict:
+    return {
+        "id": str(n.id),
+        "title": n.title,
+        "source": n.feed_source,
+        "created_at": n.created_at.isoformat(),
+    }
+
+
+def _analyzed_news_item(n) -> dict:
+    return {
+        "id": str(n.id),
+        "title": n.news_title,
+        "sentiment": n.sentiment,
+        "impact_score": n.impact_score,
+        "asset_id": str(n.asset_id) if n.asset_id else None,
+        "ticker": AssetMatcher.ticker_for(n.asset_id),
+        "created_at": n.created_at.isoformat(),
+    }
+
+
+def _ndjson(rows, to_item):
+    for row in rows:
+        yield json.dumps(to_item(row)) + "\n"
+
+
+def _list_news(db: Session, query, to_item, limit, response_format, message):
+    """Return a keyset-paginated JSON page, or stream every matching row as NDJSON."""
+    if response_format == "ndjson":
+        return StreamingResponse(
+            _ndjson(NewsService.stream_rows(query, limit), to_item),
+            media_type="application/x-ndjson",
+        )
+    
+    rows = db.execute(query.limit(limit or DEFAULT_PAGE_SIZE)).all()
+    next_cursor = None
+    if rows and len(rows) == (limit or DEFAULT_PAGE_SIZE):
+        next_cursor = NewsService.encode_cursor(rows[-1].created_at, rows[-1].id)
+    
+    return {
+        "success": True,
+        "data": [to_item(n) for n in rows],
+        "message": message,
+        "next_cursor": next_cursor,
+    }
 
 
 @router.get("/news/raw", response_model=ApiResponseSchema)
-def get_raw_news(limit: int = 100, db: Session = Depends(get_db)):
+def get_raw_news(
+    limit: Optional[int] = Query(None, ge=1),
+    since: Optional[datetime] = None,
+    cursor: Optional[str] = None,
+    order: str = Query("desc", pattern="^(asc|desc)$"),
+    response_format: str = Query("json", alias="format", pattern="^(json|ndjson)$"),
+    db: Session = Depends(get_db),
+):
     try:
-        news = NewsService.get_raw_news(db, limit)
-        data = [
-            {
-                "id": str(n.id),
-                "title": n.title,
-                "source": n.feed_source,
-                "created_at": n.created_at.isoformat(),
-            }
-            for n in news
-        ]
-        
-        return {
-            "success": True,
-            "data": data,
-            "message": "Raw news retrieved"
-        }
+        query = NewsService.raw_news_query(since, cursor, ascending=order == "asc")
+        return _list_news(db, query, _raw_news_item, limit, response_format, "Raw news retrieved")
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.get("/news/analyzed", response_model=ApiResponseSchema)
-def get_analyzed_news(limit: int = 100, db: Session = Depends(get_db)):
+def get_analyzed_news(
+    limit: Optional[int] = Query(None, ge=1),
+    since: Optional[datetime] = None,
+    cursor: Optional[str] = None,
+    order: str = Query("desc", pattern="^(asc|desc)$"),
+    response_format: str = Query("json", alias="format", pattern="^(json|ndjson)$"),
+    db: Session = Depends(get_db),
+):
     try:
-        news = NewsService.get_analyzed_news(db, limit)
-        data = [
-            {
-                "id": str(n.id),
-                "title": n.news_title,
-                "sentiment": n.sentiment,
-                "impact_score": n.impact_score,
-                "ticker": n.asset_ticker,
-            }
-            for n in news
-        ]
-        
-        return {
-            "success": True,
-            "data": data,
-            "message": "Analyzed news retrieved"
-        }
+        query = NewsService.analyzed_news_query(since, cursor, ascending=order == "asc")
+        return _list_news(db, query, _analyzed_news_item, limit, response_format, "Analyzed news retrieved")
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
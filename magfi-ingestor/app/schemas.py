@@ -1,6 +1,6 @@
 from pydantic import BaseModel
 from datetime import datetime
-from typing import Optional
+from typing import Optional, Union, List
 from uuid import UUID
 
 
@@ -30,6 +30,7 @@ class HealthResponseSchema(BaseModel):
 
 class ApiResponseSchema(BaseModel):
     success: bool
-    data: Optional[dict] = None
+    data: Optional[Union[dict, List]] = None
     message: str
     error: Optional[str] = None
+    next_cursor: Optional[str] = None
@@ -1,71 +1,242 @@
 from app.config import settings
+from app.services.analysis_cache import AnalysisCache
+from app.services.lexicon_analyzer import LexiconAnalyzer
+import asyncio
 import logging
 import json
-from typing import Optional
+import math
+import random
+from typing import List, Optional
 
 logger = logging.getLogger(__name__)
 
+# Bump whenever BATCH_PROMPT changes so cached results from the old prompt are not reused
+PROMPT_VERSION = "batch-v1"
+
+# Result slot for an article the provider could not analyze; callers must not persist it
+ANALYSIS_FAILED = None
+
+SENTIMENTS = {"positive", "negative", "neutral"}
+
+BATCH_PROMPT = """Analyze each of the following financial news articles and provide, for each one:
+1. Sentiment (positive, negative, neutral)
+2. Impact score (0-1)
+3. Brief analysis
+4. Potential asset tickers mentioned
+
+{articles}
+
+Return a JSON array with one object per article, in the same order, each with the keys
+"index", "sentiment", "impact_score", "analysis" and "tickers"."""
+
 
 class AIAnalyzer:
+    _openai_client = None
+    _gemini_model = None
+    _semaphore: Optional[asyncio.Semaphore] = None
+
+    @staticmethod
+    async def analyze_sentiment(text: str) -> Optional[dict]:
+        results = await AIAnalyzer.analyze_batch([text])
+        return results[0]
+
+    @staticmethod
+    async def analyze_batch(texts: List[str]) -> List[Optional[dict]]:
+        """Analyze texts locally where the lexicon is decisive and send the rest to the LLM.
+
+        Texts the provider failed on come back as ANALYSIS_FAILED so they can be retried later.
+        """
+        if settings.sentiment_analysis_model == "lexicon":
+            return [AIAnalyzer._lexicon_result(text) for text in texts]
+        if not settings.lexicon_prefilter_enabled:
+            return await AIAnalyzer._analyze_remote(texts)
+        
+        results = {}
+        ambiguous = []
+        for text in dict.fromkeys(texts):
+            local = LexiconAnalyzer.analyze(text)
+            if LexiconAnalyzer.is_decisive(local, settings.lexicon_confidence_threshold):
+                results[text] = AIAnalyzer._strip_lexicon_flags(local)
+            else:
+                ambiguous.append(text)
+        
+        if ambiguous:
+            results.update(zip(ambiguous, await AIAnalyzer._analyze_remote(ambiguous)))
+        return [AIAnalyzer._copy(results[text]) for text in texts]
+
+    @staticmethod
+    async def _analyze_remote(texts: List[str]) -> List[Optional[dict]]:
+        """Analyze texts in prompt-sized chunks with a bounded number of requests in flight."""
+        # Identical texts (syndicated copies) are only sent to the provider once
+        unique_texts = list(dict.fromkeys(texts))
+        model_name = AIAnalyzer._model_name()
+        keys = {text: AnalysisCache.make_key(text, model_name, PROMPT_VERSION) for text in unique_texts}
+        
+        cached = await asyncio.to_thread(AnalysisCache.get_many, list(keys.values()))
+        # Entries cached before results were validated are analyzed again and overwritten
+        by_text = {
+            text: cached[key] for text, key in keys.items()
+            if key in cached and AIAnalyzer._validate(cached[key]) is not ANALYSIS_FAILED
+        }
+        pending = [text for text in unique_texts if text not in by_text]
+        
+        batch_size = max(1, settings.analysis_batch_size)
+        chunks = [pending[i:i + batch_size] for i in range(0, len(pending), batch_size)]
+        chunk_results = await asyncio.gather(
+            *(AIAnalyzer._analyze_chunk(chunk) for chunk in chunks)
+        )
+        
+        fresh = {}
+        for chunk, chunk_result in zip(chunks, chunk_results):
+            fresh.update(zip(chunk, chunk_result))
+        by_text.update(fresh)
+        
+        await asyncio.to_thread(
+            AnalysisCache.put_many,
+            {keys[text]: result for text, result in fresh.items() if result is not ANALYSIS_FAILED},
+            model_name,
+            PROMPT_VERSION,
+        )
+        return [AIAnalyzer._copy(by_text[text]) for text in texts]
+
+    @staticmethod
+    async def _analyze_chunk(texts: List[str]) -> List[Optional[dict]]:
+        # The semaphore is the backpressure point: chunks queue here until a slot frees up
+        async with AIAnalyzer._get_semaphore():
+            for attempt in range(settings.analysis_max_retries + 1):
+                try:
+                    if settings.sentiment_analysis_model == "openai":
+                        content = await AIAnalyzer._complete_with_openai(AIAnalyzer._build_prompt(texts))
+                    else:
+                        content = await AIAnalyzer._complete_with_gemini(AIAnalyzer._build_prompt(texts))
+                    return AIAnalyzer._parse_batch_response(content, len(texts))
+                except Exception as e:
+                    if attempt >= settings.analysis_max_retries:
+                        logger.error(f"Batch analysis error: {str(e)}")
+                        break
+                    delay = settings.analysis_retry_base_delay * (2 ** attempt)
+                    delay = random.uniform(0, delay)
+                    logger.warning(f"Batch analysis attempt {attempt + 1} failed, retrying in {delay:.2f}s: {str(e)}")
+                    await asyncio.sleep(delay)
+
+        return [ANALYSIS_FAILED for _ in texts]
+
+    @staticmethod
+    def _copy(result: Optional[dict]) -> Optional[dict]:
+        return None if result is ANALYSIS_FAILED else dict(result)
+
+    @staticmethod
+    def _lexicon_result(text: str) -> dict:
+        return AIAnalyzer._strip_lexicon_flags(LexiconAnalyzer.analyze(text))
+
     @staticmethod
-    async def analyze_sentiment(text: str) -> dict:
+    def _strip_lexicon_flags(result: dict) -> dict:
+        result.pop("low_impact", None)
+        return result
+
+    @staticmethod
+    def _model_name() -> str:
         if settings.sentiment_analysis_model == "openai":
-            return await AIAnalyzer._analyze_with_openai(text)
-        else:
-            return await AIAnalyzer._analyze_with_gemini(text)
+            return settings.openai_model
+        return settings.gemini_model
+
+    @staticmethod
+    def _get_semaphore() -> asyncio.Semaphore:
+        if AIAnalyzer._semaphore is None:
+            AIAnalyzer._semaphore = asyncio.Semaphore(settings.analysis_max_concurrency)
+        return AIAnalyzer._semaphore
+
+    @staticmethod
+    def _build_prompt(texts: List[str]) -> str:
+        articles = "\n\n".join(f"Article {i}:\n{text}" for i, text in enumerate(texts))
+        return BATCH_PROMPT.format(articles=articles)
 
     @staticmethod
-    async def _analyze_with_openai(text: str) -> dict:
+    def _parse_batch_response(content: str, expected: int) -> List[Optional[dict]]:
+        content = content.strip()
+        if content.startswith("```"):
+            content = content.strip("`")
+            if content.startswith("json"):
+                content = content[len("json"):]
+
+        parsed = json.loads(content)
+        if isinstance(parsed, dict):
+            parsed = parsed.get("results", [parsed])
+
+        # Articles the model skipped stay failed rather than defaulting to neutral
+        results = [ANALYSIS_FAILED for _ in range(expected)]
+        for position, item in enumerate(parsed):
+            if not isinstance(item, dict):
+                continue
+            index = item.get("index", position)
+            if isinstance(index, int) and 0 <= index < expected:
+                results[index] = AIAnalyzer._validate(item)
+        return results
+
+    @staticmethod
+    def _validate(item: dict) -> Optional[dict]:
+        """Normalized copy of one model result, or ANALYSIS_FAILED if it cannot be stored.
+
+        A malformed result is never cached or saved, so its article is retried
+        instead of failing the same way on every claim.
+        """
+        sentiment = item.get("sentiment")
+        if not isinstance(sentiment, str) or sentiment.strip().lower() not in SENTIMENTS:
+            return ANALYSIS_FAILED
+        impact_score = item.get("impact_score")
+        if isinstance(impact_score, bool):
+            return ANALYSIS_FAILED
         try:
-            from openai import OpenAI
-            
-            client = OpenAI(api_key=settings.openai_api_key)
-            
-            response = client.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {
-                        "role": "user",
-                        "content": f"""Analyze this financial news and provide:
-1. Sentiment (positive, negative, neutral)
-2. Impact score (0-1)
-3. Brief analysis
-4. Potential asset tickers mentioned
+            impact_score = float(impact_score)
+        except (TypeError, ValueError):
+            return ANALYSIS_FAILED
+        if not math.isfinite(impact_score):
+            return ANALYSIS_FAILED
+        analysis = item.get("analysis")
+        tickers = item.get("tickers")
+        return {
+            **item,
+            "sentiment": sentiment.strip().lower(),
+            "impact_score": min(1.0, max(0.0, impact_score)),
+            "analysis": analysis if isinstance(analysis, str) else None,
+            "tickers": [t for t in tickers if isinstance(t, str)] if isinstance(tickers, list) else [],
+        }
 
-Text: {text}
+    @staticmethod
+    async def _complete_with_openai(prompt: str) -> str:
+        if AIAnalyzer._openai_client is None:
+            from openai import AsyncOpenAI
 
-Return as JSON."""
-                    }
-                ],
-                temperature=0.3,
+            AIAnalyzer._openai_client = AsyncOpenAI(
+                api_key=settings.openai_api_key,
+                base_url=settings.openai_base_url or None,
+                timeout=settings.analysis_timeout,
+                max_retries=0,
             )
-            
-            result = json.loads(response.choices[0].message.content)
-            return result
-        except Exception as e:
-            logger.error(f"OpenAI analysis error: {str(e)}")
-            return {"sentiment": "neutral", "impact_score": 0.5, "analysis": "Unable to analyze"}
+
+        response = await AIAnalyzer._openai_client.chat.completions.create(
+            model=settings.openai_model,
+            messages=[{"role": "user", "content": prompt}],
+            temperature=0.3,
+        )
+        return response.choices[0].message.content
 
     @staticmethod
-    async def _analyze_with_gemini(text: str) -> dict:
-        try:
+    async def _complete_with_gemini(prompt: str) -> str:
+        if AIAnalyzer._gemini_model is None:
             import google.generativeai as genai
-            
+
             genai.configure(api_key=settings.gemini_api_key)
-            model = genai.GenerativeModel("gemini-pro")
-            
-            response = model.generate_content(f"""Analyze this financial news and provide:
-1. Sentiment (positive, negative, neutral)
-2. Impact score (0-1)
-3. Brief analysis
-4. Potential asset tickers mentioned
+            AIAnalyzer._gemini_model = genai.GenerativeModel(settings.gemini_model)
 
-Text: {text}
+        response = await asyncio.wait_for(
+            AIAnalyzer._gemini_model.generate_content_async(prompt),
+            timeout=settings.analysis_timeout,
+        )
+        return response.text
 
-Return as JSON.""")
-            
-            result = json.loads(response.text)
-            return result
-        except Exception as e:
-            logger.error(f"Gemini analysis error: {str(e)}")
-            return {"sentiment": "neutral", "impact_score": 0.5, "analysis": "Unable to analyze"}
+    @staticmethod
+    async def close():
+        if AIAnalyzer._openai_client is not None:
+            await AIAnalyzer._openai_client.close()
+            AIAnalyzer._openai_client = None
@@ -0,0 +1,155 @@
+from sqlalchemy import delete, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import SQLAlchemyError
+from app.config import settings
+from app.database import SessionLocal
+from app.models import AnalysisCacheEntry
+from app.services.dedup_service import DedupService
+from datetime import datetime, timedelta
+import hashlib
+import json
+import logging
+from typing import Dict, List
+
+logger = logging.getLogger(__name__)
+
+
+class AnalysisCache:
+    """Persistent cache of parsed sentiment results.
+
+    Keys combine the normalized article text with the model name and prompt
+    version, so switching either one naturally invalidates old entries.
+    """
+
+    hits: int = 0
+    misses: int = 0
+    writes: int = 0
+    evictions: int = 0
+
+    @staticmethod
+    def make_key(text: str, model_name: str, prompt_version: str) -> str:
+        fingerprint = DedupService.normalize_text(text)
+        return hashlib.sha256(
+            "\x1f".join([fingerprint, model_name, prompt_version]).encode("utf-8")
+        ).hexdigest()
+
+    @staticmethod
+    def get_many(keys: List[str]) -> Dict[str, dict]:
+        if not settings.analysis_cache_enabled or not keys:
+            return {}
+
+        cutoff = datetime.utcnow() - timedelta(seconds=settings.analysis_cache_ttl_seconds)
+        db = SessionLocal()
+        try:
+            rows = db.execute(
+                select(AnalysisCacheEntry.cache_key, AnalysisCacheEntry.result).where(
+                    AnalysisCacheEntry.cache_key.in_(keys),
+                    AnalysisCacheEntry.created_at >= cutoff,
+                )
+            ).all()
+            found = {row.cache_key: json.loads(row.result) for row in rows}
+
+            if found:
+                db.execute(
+                    update(AnalysisCacheEntry)
+                    .where(AnalysisCacheEntry.cache_key.in_(list(found.keys())))
+                    .values(
+                        hit_count=AnalysisCacheEntry.hit_count + 1,
+                        last_hit_at=datetime.utcnow(),
+                    )
+                    .execution_options(synchronize_session=False)
+                )
+                db.commit()
+        except SQLAlchemyError as e:
+            db.rollback()
+            logger.error(f"Analysis cache lookup error: {str(e)}")
+            found = {}
+        finally:
+            db.close()
+
+        AnalysisCache.hits += len(found)
+        AnalysisCache.misses += len(keys) - len(found)
+        return found
+
+    @staticmethod
+    def put_many(entries: Dict[str, dict], model_name: str, prompt_version: str):
+        if not settings.analysis_cache_enabled or not entries:
+            return
+
+        now = datetime.utcnow()
+        rows = [
+            {
+                "cache_key": key,
+                "model_name": model_name,
+                "prompt_version": prompt_version,
+                "result": json.dumps(result),
+                "hit_count": 0,
+                "created_at": now,
+                "last_hit_at": now,
+            }
+            for key, result in entries.items()
+        ]
+        stmt = pg_insert(AnalysisCacheEntry).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[AnalysisCacheEntry.cache_key],
+            set_={
+                "result": stmt.excluded.result,
+                "created_at": stmt.excluded.created_at,
+                "last_hit_at": stmt.excluded.last_hit_at,
+            },
+        )
+
+        db = SessionLocal()
+        try:
+            db.execute(stmt)
+            db.commit()
+            AnalysisCache.writes += len(rows)
+        except SQLAlchemyError as e:
+            db.rollback()
+            logger.error(f"Analysis cache write error: {str(e)}")
+        finally:
+            db.close()
+
+    @staticmethod
+    def prune() -> int:
+        """Delete expired entries, then the least recently hit ones above the size bound."""
+        if not settings.analysis_cache_enabled:
+            return 0
+
+        cutoff = datetime.utcnow() - timedelta(seconds=settings.analysis_cache_ttl_seconds)
+        db = SessionLocal()
+        try:
+            expired = db.execute(
+                delete(AnalysisCacheEntry).where(AnalysisCacheEntry.created_at < cutoff)
+            ).rowcount
+
+            overflow = (
+                select(AnalysisCacheEntry.cache_key)
+                .order_by(AnalysisCacheEntry.last_hit_at.desc())
+                .offset(settings.analysis_cache_max_entries)
+            )
+            evicted = db.execute(
+                delete(AnalysisCacheEntry).where(AnalysisCacheEntry.cache_key.in_(overflow))
+            ).rowcount
+            db.commit()
+        except SQLAlchemyError as e:
+            db.rollback()
+            logger.error(f"Analysis cache prune error: {str(e)}")
+            return 0
+        finally:
+            db.close()
+
+        AnalysisCache.evictions += expired + evicted
+        return expired + evicted
+
+    @staticmethod
+    def stats() -> dict:
+        lookups = AnalysisCache.hits + AnalysisCache.misses
+        return {
+            "enabled": settings.analysis_cache_enabled,
+            "hits": AnalysisCache.hits,
+            "misses": AnalysisCache.misses,
+            "hit_ratio": round(AnalysisCache.hits / lookups, 4) if lookups else 0.0,
+            "writes": AnalysisCache.writes,
+            "evictions": AnalysisCache.evictions,
+        }
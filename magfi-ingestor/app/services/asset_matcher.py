@@ -0,0 +1,160 @@
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.models import Asset
+from collections import deque
+from datetime import datetime
+import logging
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+from uuid import UUID
+
+logger = logging.getLogger(__name__)
+
+
+class AhoCorasick:
+    """Minimal Aho-Corasick automaton mapping matched keywords to a value."""
+
+    def __init__(self, keywords: Dict[str, UUID]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[List[Tuple[int, UUID]]] = [[]]
+
+        for keyword, value in keywords.items():
+            state = 0
+            for char in keyword:
+                next_state = self._goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto[state][char] = next_state
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._output.append([])
+                state = next_state
+            self._output[state].append((len(keyword), value))
+
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[next_state] = self._goto[fail].get(char, 0)
+                self._output[next_state] = self._output[next_state] + self._output[self._fail[next_state]]
+
+    def find(self, text: str) -> List[UUID]:
+        """Return values of keywords found in text on word boundaries, in order of appearance."""
+        found = []
+        state = 0
+        for end, char in enumerate(text):
+            while state and char not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(char, 0)
+            for length, value in self._output[state]:
+                start = end - length + 1
+                if start > 0 and text[start - 1].isalnum():
+                    continue
+                if end + 1 < len(text) and text[end + 1].isalnum():
+                    continue
+                if value not in found:
+                    found.append(value)
+        return found
+
+
+class AssetMatcher:
+    """In-memory index resolving article text to dim_asset ids.
+
+    Tickers are matched case-sensitively (so "IT" does not match "it") and asset
+    names case-insensitively. Tickers shorter than ASSET_MATCHER_MIN_TICKER_LENGTH
+    only match as cashtags ("$A"), since bare they collide with ordinary words.
+
+    Each refresh fetches assets with updated_at at or after the last watermark
+    (the boundary is re-read so rows committed later with the same timestamp are
+    not lost) and rebuilds the automatons only when an entry actually changed.
+    Every ASSET_MATCHER_RECONCILE_SECONDS the full id set is re-read instead,
+    which evicts hard-deleted assets and picks up rows with no updated_at.
+    """
+
+    _assets: Dict[UUID, Tuple[str, str]] = {}
+    _ticker_to_id: Dict[str, UUID] = {}
+    _ticker_automaton: Optional[AhoCorasick] = None
+    _name_automaton: Optional[AhoCorasick] = None
+    _watermark: Optional[datetime] = None
+    _reconciled_at: Optional[float] = None
+    _lock = threading.Lock()
+
+    @staticmethod
+    def refresh(db: Session) -> int:
+        reconcile = (
+            AssetMatcher._reconciled_at is None
+            or time.monotonic() - AssetMatcher._reconciled_at >= settings.asset_matcher_reconcile_seconds
+        )
+        query = db.query(Asset.id, Asset.ticker_symbol, Asset.asset_name, Asset.is_active, Asset.updated_at)
+        if not reconcile and AssetMatcher._watermark is not None:
+            query = query.filter(Asset.updated_at >= AssetMatcher._watermark)
+        rows = query.all()
+
+        with AssetMatcher._lock:
+            assets = {} if reconcile else dict(AssetMatcher._assets)
+            watermark = AssetMatcher._watermark
+            for asset_id, ticker, name, is_active, updated_at in rows:
+                if is_active is False:
+                    assets.pop(asset_id, None)
+                else:
+                    assets[asset_id] = (ticker.upper(), (name or "").lower())
+                if updated_at is not None and (watermark is None or updated_at > watermark):
+                    watermark = updated_at
+
+            AssetMatcher._watermark = watermark
+            if reconcile:
+                AssetMatcher._reconciled_at = time.monotonic()
+            previous = AssetMatcher._assets
+            changed = sum(1 for i in assets.keys() | previous.keys() if assets.get(i) != previous.get(i))
+            if not changed and AssetMatcher._ticker_automaton is not None:
+                return 0
+
+            AssetMatcher._ticker_automaton = AhoCorasick(AssetMatcher._ticker_keywords(assets))
+            AssetMatcher._name_automaton = AhoCorasick({n: i for i, (_, n) in assets.items() if n})
+            AssetMatcher._ticker_to_id = {t: i for i, (t, _) in assets.items()}
+            AssetMatcher._assets = assets
+
+        logger.info(f"Asset matcher refreshed ({'full' if reconcile else 'incremental'}): "
+                    f"{changed} entries changed, {len(assets)} indexed")
+        return changed
+
+    @staticmethod
+    def _ticker_keywords(assets: Dict[UUID, Tuple[str, str]]) -> Dict[str, UUID]:
+        keywords = {}
+        for asset_id, (ticker, _) in assets.items():
+            keywords[f"${ticker}"] = asset_id
+            if len(ticker) >= settings.asset_matcher_min_ticker_length:
+                keywords[ticker] = asset_id
+        return keywords
+
+    @staticmethod
+    def match(text: str) -> List[UUID]:
+        if AssetMatcher._ticker_automaton is None:
+            return []
+        text = text or ""
+        matches = AssetMatcher._ticker_automaton.find(text)
+        for asset_id in AssetMatcher._name_automaton.find(text.lower()):
+            if asset_id not in matches:
+                matches.append(asset_id)
+        return matches
+
+    @staticmethod
+    def resolve(text: str, tickers: Optional[List[str]] = None) -> Optional[UUID]:
+        """Pick the asset an article is about: explicit tickers first, then text matches."""
+        for ticker in tickers or []:
+            asset_id = AssetMatcher._ticker_to_id.get(str(ticker).upper().lstrip("$"))
+            if asset_id:
+                return asset_id
+        matches = AssetMatcher.match(text)
+        return matches[0] if matches else None
+
+    @staticmethod
+    def ticker_for(asset_id: Optional[UUID]) -> Optional[str]:
+        asset = AssetMatcher._assets.get(asset_id)
+        return asset[0] if asset else None
@@ -0,0 +1,78 @@
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.models import NewsRaw
+from collections import OrderedDict
+import hashlib
+import logging
+import re
+from typing import Iterable, List, Set
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+class DedupService:
+    # Process-local LRU of content hashes already known to be stored
+    _seen: "OrderedDict[str, None]" = OrderedDict()
+
+    @staticmethod
+    def normalize_text(text: str) -> str:
+        return _WHITESPACE.sub(" ", (text or "").strip().lower())
+
+    @staticmethod
+    def compute_hash(link: str, title: str, content: str) -> str:
+        parts = [
+            (link or "").strip().lower().rstrip("/"),
+            DedupService.normalize_text(title),
+            DedupService.normalize_text(content),
+        ]
+        return hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def article_hash(article: dict) -> str:
+        if not article.get("content_hash"):
+            article["content_hash"] = DedupService.compute_hash(
+                article.get("link"), article.get("title"), article.get("content")
+            )
+        return article["content_hash"]
+
+    @staticmethod
+    def is_seen(content_hash: str) -> bool:
+        if content_hash in DedupService._seen:
+            DedupService._seen.move_to_end(content_hash)
+            return True
+        return False
+
+    @staticmethod
+    def remember(hashes: Iterable[str]):
+        for content_hash in hashes:
+            DedupService._seen[content_hash] = None
+            DedupService._seen.move_to_end(content_hash)
+        while len(DedupService._seen) > settings.dedup_cache_size:
+            DedupService._seen.popitem(last=False)
+
+    @staticmethod
+    def filter_new(db: Session, articles: List[dict]) -> List[dict]:
+        """Drop articles already seen in this batch, in the LRU, or in stg_news_raw."""
+        candidates = {}
+        for article in articles:
+            content_hash = DedupService.article_hash(article)
+            if content_hash in candidates or DedupService.is_seen(content_hash):
+                continue
+            candidates[content_hash] = article
+
+        if not candidates:
+            return []
+
+        stored: Set[str] = {
+            row[0]
+            for row in db.query(NewsRaw.content_hash)
+            .filter(NewsRaw.content_hash.in_(list(candidates.keys())))
+            .all()
+        }
+        DedupService.remember(stored)
+
+        new_articles = [a for h, a in candidates.items() if h not in stored]
+        logger.info(f"Dedup: {len(new_articles)} new of {len(articles)} collected articles")
+        return new_articles
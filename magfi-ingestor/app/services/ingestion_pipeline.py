@@ -0,0 +1,124 @@
+from app.config import settings
+from app.database import SessionLocal
+from app.services.rss_collector import RSSCollector
+from app.services.news_service import NewsService
+from app.services.ai_analyzer import ANALYSIS_FAILED, AIAnalyzer
+from app.services.analysis_cache import AnalysisCache
+from app.services.asset_matcher import AssetMatcher
+from app.services.dedup_service import DedupService
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class IngestionPipeline:
+    @staticmethod
+    async def run_cycle() -> dict:
+        """Collect feeds into stg_news_raw, then drain the unprocessed backlog."""
+        articles = await RSSCollector.collect_feeds()
+        saved = await asyncio.to_thread(IngestionPipeline._save_raw, articles)
+        await asyncio.to_thread(IngestionPipeline.refresh_assets)
+        ingested_count = await IngestionPipeline.drain_queue()
+        await asyncio.to_thread(AnalysisCache.prune)
+
+        return {
+            "collected_count": len(articles),
+            "new_count": len(saved),
+            "ingested_count": ingested_count,
+        }
+
+    @staticmethod
+    async def drain_queue() -> int:
+        """Claim, analyze and persist batches until no claimable rows are left.
+
+        Safe to run from several workers at once: each batch is leased with
+        FOR UPDATE SKIP LOCKED, so workers never analyze the same row. Rows the
+        provider failed on are released unprocessed and the drain stops there,
+        so an outage defers them to the next run instead of spinning on them.
+        """
+        ingested_count = 0
+        while True:
+            batch = await asyncio.to_thread(IngestionPipeline._claim)
+            if not batch:
+                return ingested_count
+
+            try:
+                analyses = await AIAnalyzer.analyze_batch(
+                    [f"{news.get('title')} {news.get('content')}" for news in batch]
+                )
+            except Exception:
+                await asyncio.to_thread(IngestionPipeline._release, [news["id"] for news in batch])
+                raise
+
+            items = [
+                (news["id"], IngestionPipeline._analysis_data(news, analysis))
+                for news, analysis in zip(batch, analyses)
+                if analysis is not ANALYSIS_FAILED
+            ]
+            failed_ids = [news["id"] for news, analysis in zip(batch, analyses) if analysis is ANALYSIS_FAILED]
+            ingested_count += await asyncio.to_thread(IngestionPipeline._save_analyses, items)
+            if failed_ids:
+                await asyncio.to_thread(IngestionPipeline._release, failed_ids)
+                logger.warning(f"Analysis failed for {len(failed_ids)} articles, released for the next run")
+                return ingested_count
+
+    @staticmethod
+    def refresh_assets() -> int:
+        db = SessionLocal()
+        try:
+            return AssetMatcher.refresh(db)
+        finally:
+            db.close()
+
+    @staticmethod
+    def _save_raw(articles: list) -> list:
+        db = SessionLocal()
+        try:
+            articles = DedupService.filter_new(db, articles)
+            return NewsService.save_raw_news_bulk(db, articles)
+        finally:
+            db.close()
+
+    @staticmethod
+    def _claim() -> list:
+        db = SessionLocal()
+        try:
+            return NewsService.claim_unprocessed_news(
+                db,
+                settings.worker_id,
+                settings.queue_claim_batch_size,
+                settings.queue_lease_seconds,
+            )
+        finally:
+            db.close()
+
+    @staticmethod
+    def _release(news_ids: list):
+        db = SessionLocal()
+        try:
+            NewsService.release_claims(db, news_ids, settings.worker_id)
+        finally:
+            db.close()
+
+    @staticmethod
+    def _save_analyses(items: list) -> int:
+        db = SessionLocal()
+        try:
+            return NewsService.save_analyses_bulk(db, items, settings.worker_id)
+        finally:
+            db.close()
+
+    @staticmethod
+    def _analysis_data(news: dict, analysis: dict) -> dict:
+        return {
+            "asset_id": AssetMatcher.resolve(
+                f"{news.get('title')} {news.get('content')}", analysis.get("tickers")
+            ),
+            "news_title": news.get("title"),
+            "news_content": news.get("content"),
+            "sentiment": analysis.get("sentiment", "neutral"),
+            "impact_score": analysis.get("impact_score", 0.5),
+            "ai_analysis": analysis.get("analysis"),
+            "source_url": news.get("link"),
+        }
@@ -0,0 +1,97 @@
+import re
+from typing import List
+
+POSITIVE_TERMS = [
+    "beat", "beats", "beating", "surge", "surges", "surged", "soar", "soars", "soared",
+    "rally", "rallies", "rallied", "gain", "gains", "gained", "jump", "jumps", "jumped",
+    "record high", "upgrade", "upgrades", "upgraded", "outperform", "outperformed",
+    "profit", "profits", "profitable", "growth", "strong", "stronger", "bullish",
+    "exceed", "exceeds", "exceeded", "raises guidance", "raised guidance", "dividend increase",
+    "buyback", "expansion", "rebound", "rebounds", "rebounded", "boost", "boosts", "boosted",
+    "optimism", "optimistic", "recovery", "approval", "approved", "breakthrough",
+]
+
+NEGATIVE_TERMS = [
+    "miss", "misses", "missed", "plunge", "plunges", "plunged", "slump", "slumps", "slumped",
+    "fall", "falls", "fell", "drop", "drops", "dropped", "tumble", "tumbles", "tumbled",
+    "downgrade", "downgrades", "downgraded", "underperform", "underperformed",
+    "loss", "losses", "weak", "weaker", "bearish", "lawsuit", "fraud", "investigation",
+    "bankruptcy", "bankrupt", "default", "defaults", "layoffs", "layoff", "recession",
+    "cuts guidance", "cut guidance", "lowers guidance", "lowered guidance", "warning",
+    "selloff", "sell-off", "crash", "crashes", "crashed", "decline", "declines", "declined",
+    "pessimism", "pessimistic", "probe", "sanctions", "halt", "halted", "recall",
+]
+
+HIGH_IMPACT_TERMS = [
+    "earnings", "guidance", "merger", "acquisition", "acquire", "acquires", "bankruptcy",
+    "dividend", "buyback", "ipo", "fda", "sec", "federal reserve", "fed", "interest rate",
+    "rate hike", "rate cut", "inflation", "gdp", "layoffs", "ceo", "lawsuit", "default",
+]
+
+
+def _compile(terms: List[str]) -> "re.Pattern":
+    # One alternation per class, longest terms first so multi-word phrases win
+    alternation = "|".join(re.escape(t) for t in sorted(terms, key=len, reverse=True))
+    return re.compile(rf"\b(?:{alternation})\b", re.IGNORECASE)
+
+
+# A single scan classifies every lexicon hit: each alternative is a named group
+_SENTIMENT_PATTERN = re.compile(
+    rf"(?P<pos>{_compile(POSITIVE_TERMS).pattern})|(?P<neg>{_compile(NEGATIVE_TERMS).pattern})",
+    re.IGNORECASE,
+)
+_IMPACT_PATTERN = _compile(HIGH_IMPACT_TERMS)
+_TICKER_PATTERN = re.compile(
+    r"\$(?P<cashtag>[A-Z]{1,5}(?:\.[A-Z]{1,2})?)\b"
+    r"|\((?:NYSE|NASDAQ|Nasdaq|AMEX|LSE|TSX|B3|BOVESPA)\s*:\s*(?P<listed>[A-Z0-9]{1,6}(?:\.[A-Z]{1,2})?)\)"
+)
+
+
+class LexiconAnalyzer:
+    @staticmethod
+    def extract_tickers(text: str) -> List[str]:
+        tickers = []
+        for match in _TICKER_PATTERN.finditer(text or ""):
+            ticker = match.group("cashtag") or match.group("listed")
+            if ticker not in tickers:
+                tickers.append(ticker)
+        return tickers
+
+    @staticmethod
+    def analyze(text: str) -> dict:
+        text = text or ""
+        positive = negative = 0
+        for match in _SENTIMENT_PATTERN.finditer(text):
+            if match.group("pos") is not None:
+                positive += 1
+            else:
+                negative += 1
+        impact_hits = len(_IMPACT_PATTERN.findall(text))
+        tickers = LexiconAnalyzer.extract_tickers(text)
+
+        hits = positive + negative
+        polarity = (positive - negative) / hits if hits else 0.0
+        confidence = abs(polarity) * min(1.0, hits / 3)
+
+        if polarity > 0.2:
+            sentiment = "positive"
+        elif polarity < -0.2:
+            sentiment = "negative"
+        else:
+            sentiment = "neutral"
+
+        impact_score = min(1.0, 0.1 + 0.15 * impact_hits + 0.05 * hits + (0.1 if tickers else 0.0))
+
+        return {
+            "sentiment": sentiment,
+            "impact_score": round(impact_score, 4),
+            "analysis": f"Lexicon: {positive} positive, {negative} negative, {impact_hits} high-impact terms",
+            "tickers": tickers,
+            "confidence": round(confidence, 4),
+            "low_impact": impact_hits == 0 and not tickers and hits <= 1,
+        }
+
+    @staticmethod
+    def is_decisive(result: dict, confidence_threshold: float) -> bool:
+        """Whether a lexicon result is good enough to skip the LLM."""
+        return result["low_impact"] or result["confidence"] >= confidence_threshold
@@ -1,8 +1,16 @@
+from sqlalchemy import insert, select, update, or_, tuple_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 from sqlalchemy.orm import Session
+from app.config import settings
+from app.database import SessionLocal
 from app.models import NewsRaw, NewsAnalysis
 from app.schemas import NewsRawSchema, NewsAnalysisSchema
+from app.services.dedup_service import DedupService
 from uuid import UUID
-from datetime import datetime
+from datetime import datetime, timedelta
+from typing import Iterator, List, Optional, Tuple
+import base64
 import logging
 
 logger = logging.getLogger(__name__)
@@ -11,6 +19,10 @@ logger = logging.getLogger(__name__)
 class NewsService:
     @staticmethod
     def save_raw_news(db: Session, news_data: dict):
+        content_hash = DedupService.article_hash(news_data)
+        if DedupService.is_seen(content_hash):
+            return None
+        
         news = NewsRaw(
             feed_source=news_data.get("feed_source"),
             title=news_data.get("title"),
@@ -18,28 +30,187 @@ class NewsService:
             link=news_data.get("link"),
             published_date=news_data.get("published_date"),
             raw_data=news_data.get("raw_data"),
+            content_hash=content_hash,
         )
         db.add(news)
-        db.commit()
+        try:
+            db.commit()
+        except IntegrityError:
+            db.rollback()
+            DedupService.remember([content_hash])
+            logger.debug(f"Skipping duplicate news {content_hash}")
+            return None
         db.refresh(news)
+        DedupService.remember([content_hash])
         return news
 
     @staticmethod
     def save_analysis(db: Session, analysis_data: dict):
-        analysis = NewsAnalysis(
-            asset_ticker=analysis_data.get("asset_ticker"),
-            news_title=analysis_data.get("news_title"),
-            news_content=analysis_data.get("news_content"),
-            sentiment=analysis_data.get("sentiment"),
-            impact_score=analysis_data.get("impact_score", 0),
-            ai_analysis=analysis_data.get("ai_analysis"),
-            source_url=analysis_data.get("source_url"),
-        )
+        analysis = NewsAnalysis(**NewsService._analysis_row(analysis_data))
         db.add(analysis)
         db.commit()
         db.refresh(analysis)
         return analysis
 
+    @staticmethod
+    def save_raw_news_bulk(db: Session, articles: List[dict]) -> List[Tuple[UUID, dict]]:
+        """Insert a cycle's raw articles in one statement, skipping known content hashes."""
+        by_hash = {}
+        for article in articles:
+            content_hash = DedupService.article_hash(article)
+            if not DedupService.is_seen(content_hash):
+                by_hash.setdefault(content_hash, article)
+        
+        if not by_hash:
+            return []
+        
+        rows = [
+            {
+                "feed_source": a.get("feed_source"),
+                "title": a.get("title"),
+                "content": a.get("content"),
+                "link": a.get("link"),
+                "published_date": a.get("published_date"),
+                "raw_data": a.get("raw_data"),
+                "content_hash": content_hash,
+            }
+            for content_hash, a in by_hash.items()
+        ]
+        stmt = (
+            pg_insert(NewsRaw)
+            .values(rows)
+            .on_conflict_do_nothing(index_elements=[NewsRaw.content_hash])
+            .returning(NewsRaw.id, NewsRaw.content_hash)
+        )
+        try:
+            inserted = db.execute(stmt).all()
+            db.commit()
+        except SQLAlchemyError:
+            db.rollback()
+            raise
+        
+        DedupService.remember(by_hash.keys())
+        return [(news_id, by_hash[content_hash]) for news_id, content_hash in inserted]
+
+    @staticmethod
+    def save_analyses_bulk(db: Session, items: List[Tuple[UUID, dict]], worker_id: str) -> int:
+        """Write analyses and flip is_processed for their raw rows in a single transaction.
+        
+        Rows are first marked processed only where this worker still holds an
+        unexpired lease, and analyses are written only for the ids that update
+        returned; a row whose lease lapsed and was reclaimed elsewhere is left to
+        the new owner. The batch goes out as one multi-row INSERT inside a
+        savepoint; if that fails, rows are retried one savepoint each and rows
+        that still fail go back to unprocessed, so a bad item cannot sink the cycle.
+        """
+        if not items:
+            return 0
+        
+        try:
+            fenced = set(db.execute(
+                update(NewsRaw)
+                .where(
+                    NewsRaw.id.in_([news_id for news_id, _ in items]),
+                    NewsRaw.claimed_by == worker_id,
+                    NewsRaw.lease_expires_at > datetime.utcnow(),
+                )
+                .values(is_processed=True)
+                .returning(NewsRaw.id)
+                .execution_options(synchronize_session=False)
+            ).scalars())
+            if len(fenced) < len(items):
+                logger.warning(f"Lease lost on {len(items) - len(fenced)} news rows, skipping their analyses")
+            
+            owned = [(news_id, NewsService._analysis_row(data)) for news_id, data in items if news_id in fenced]
+            failed_ids = []
+            try:
+                with db.begin_nested():
+                    if owned:
+                        db.execute(insert(NewsAnalysis), [row for _, row in owned])
+            except SQLAlchemyError as e:
+                logger.warning(f"Bulk analysis insert failed, isolating rows: {str(e)}")
+                for news_id, row in owned:
+                    try:
+                        with db.begin_nested():
+                            db.execute(insert(NewsAnalysis), [row])
+                    except SQLAlchemyError as row_error:
+                        logger.error(f"Error saving analysis for news {news_id}: {str(row_error)}")
+                        failed_ids.append(news_id)
+            
+            if failed_ids:
+                # Lease is kept, so these are retried once it expires rather than straight away
+                db.execute(
+                    update(NewsRaw)
+                    .where(NewsRaw.id.in_(failed_ids))
+                    .values(is_processed=False)
+                    .execution_options(synchronize_session=False)
+                )
+            db.commit()
+        except SQLAlchemyError:
+            db.rollback()
+            raise
+        
+        return len(owned) - len(failed_ids)
+
+    @staticmethod
+    def _analysis_row(analysis_data: dict) -> dict:
+        return {
+            "asset_id": analysis_data.get("asset_id"),
+            "news_title": analysis_data.get("news_title"),
+            "news_content": analysis_data.get("news_content"),
+            "sentiment": analysis_data.get("sentiment"),
+            "impact_score": analysis_data.get("impact_score", 0),
+            "ai_analysis": analysis_data.get("ai_analysis"),
+            "source_url": analysis_data.get("source_url"),
+        }
+
+    @staticmethod
+    def claim_unprocessed_news(db: Session, worker_id: str, batch_size: int, lease_seconds: int) -> List[dict]:
+        """Lease a batch of unprocessed rows to a worker.
+        
+        Rows locked by another worker's in-flight claim are skipped, and rows whose
+        lease has expired (e.g. the worker crashed) become claimable again.
+        """
+        now = datetime.utcnow()
+        claimable = (
+            select(NewsRaw.id)
+            .where(
+                NewsRaw.is_processed == False,
+                or_(NewsRaw.lease_expires_at.is_(None), NewsRaw.lease_expires_at < now),
+            )
+            .order_by(NewsRaw.created_at)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        stmt = (
+            update(NewsRaw)
+            .where(NewsRaw.id.in_(claimable))
+            .values(claimed_by=worker_id, lease_expires_at=now + timedelta(seconds=lease_seconds))
+            .returning(NewsRaw.id, NewsRaw.title, NewsRaw.content, NewsRaw.link)
+            .execution_options(synchronize_session=False)
+        )
+        try:
+            rows = db.execute(stmt).all()
+            db.commit()
+        except SQLAlchemyError:
+            db.rollback()
+            raise
+        
+        return [
+            {"id": row.id, "title": row.title, "content": row.content, "link": row.link}
+            for row in rows
+        ]
+
+    @staticmethod
+    def release_claims(db: Session, news_ids: List[UUID], worker_id: str):
+        db.execute(
+            update(NewsRaw)
+            .where(NewsRaw.id.in_(news_ids), NewsRaw.claimed_by == worker_id)
+            .values(claimed_by=None, lease_expires_at=None)
+            .execution_options(synchronize_session=False)
+        )
+        db.commit()
+
     @staticmethod
     def get_unprocessed_news(db: Session):
         return db.query(NewsRaw).filter(NewsRaw.is_processed == False).all()
@@ -52,9 +223,70 @@ class NewsService:
             db.commit()
 
     @staticmethod
-    def get_raw_news(db: Session, limit: int = 100):
-        return db.query(NewsRaw).order_by(NewsRaw.created_at.desc()).limit(limit).all()
+    def encode_cursor(created_at: datetime, row_id: UUID) -> str:
+        return base64.urlsafe_b64encode(f"{created_at.isoformat()}|{row_id}".encode()).decode()
+
+    @staticmethod
+    def decode_cursor(cursor: str) -> Tuple[datetime, UUID]:
+        try:
+            created_at, row_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+            return datetime.fromisoformat(created_at), UUID(row_id)
+        except (ValueError, UnicodeDecodeError) as e:
+            raise ValueError(f"Invalid cursor: {cursor}") from e
+
+    @staticmethod
+    def _keyset(stmt, model, since: Optional[datetime], cursor: Optional[str], ascending: bool):
+        """Apply since/cursor filters and a stable (created_at, id) ordering."""
+        if since is not None:
+            stmt = stmt.where(model.created_at > since)
+        if cursor:
+            created_at, row_id = NewsService.decode_cursor(cursor)
+            key = tuple_(model.created_at, model.id)
+            stmt = stmt.where(key > tuple_(created_at, row_id) if ascending else key < tuple_(created_at, row_id))
+        if ascending:
+            return stmt.order_by(model.created_at.asc(), model.id.asc())
+        return stmt.order_by(model.created_at.desc(), model.id.desc())
+
+    @staticmethod
+    def raw_news_query(since: Optional[datetime] = None, cursor: Optional[str] = None, ascending: bool = False):
+        stmt = select(NewsRaw.id, NewsRaw.title, NewsRaw.feed_source, NewsRaw.created_at)
+        return NewsService._keyset(stmt, NewsRaw, since, cursor, ascending)
+
+    @staticmethod
+    def analyzed_news_query(since: Optional[datetime] = None, cursor: Optional[str] = None, ascending: bool = False):
+        stmt = select(
+            NewsAnalysis.id,
+            NewsAnalysis.news_title,
+            NewsAnalysis.sentiment,
+            NewsAnalysis.impact_score,
+            NewsAnalysis.asset_id,
+            NewsAnalysis.created_at,
+        )
+        return NewsService._keyset(stmt, NewsAnalysis, since, cursor, ascending)
+
+    @staticmethod
+    def get_raw_news(db: Session, limit: int = 100, since: Optional[datetime] = None,
+                     cursor: Optional[str] = None, ascending: bool = False):
+        return db.execute(NewsService.raw_news_query(since, cursor, ascending).limit(limit)).all()
+
+    @staticmethod
+    def get_analyzed_news(db: Session, limit: int = 100, since: Optional[datetime] = None,
+                          cursor: Optional[str] = None, ascending: bool = False):
+        return db.execute(NewsService.analyzed_news_query(since, cursor, ascending).limit(limit)).all()
 
     @staticmethod
-    def get_analyzed_news(db: Session, limit: int = 100):
-        return db.query(NewsAnalysis).order_by(NewsAnalysis.created_at.desc()).limit(limit).all()
+    def stream_rows(stmt, limit: Optional[int] = None) -> Iterator:
+        """Yield rows through a server-side cursor with its own session.
+        
+        Uses a dedicated session because request-scoped sessions are closed
+        before a streaming response body is sent.
+        """
+        if limit is not None:
+            stmt = stmt.limit(limit)
+        db = SessionLocal()
+        try:
+            result = db.execute(stmt.execution_options(yield_per=settings.stream_batch_size))
+            for row in result:
+                yield row
+        finally:
+            db.close()
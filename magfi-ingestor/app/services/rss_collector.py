@@ -1,31 +1,100 @@
+import asyncio
 import feedparser
+import httpx
 from app.config import settings
 import logging
 from datetime import datetime
+from typing import Dict, List, Optional
 
 logger = logging.getLogger(__name__)
 
 
 class RSSCollector:
+    # Per-feed HTTP validators (ETag / Last-Modified) used for conditional GETs
+    _validators: Dict[str, Dict[str, str]] = {}
+
     @staticmethod
-    def collect_feeds():
+    async def collect_feeds() -> List[dict]:
+        limits = httpx.Limits(
+            max_connections=settings.rss_max_concurrency,
+            max_keepalive_connections=settings.rss_max_concurrency,
+        )
+        semaphore = asyncio.Semaphore(settings.rss_max_concurrency)
+
+        async with httpx.AsyncClient(
+            limits=limits,
+            timeout=settings.rss_fetch_timeout,
+            follow_redirects=True,
+        ) as client:
+            results = await asyncio.gather(
+                *(
+                    RSSCollector._collect_feed(client, semaphore, feed_url)
+                    for feed_url in settings.feeds_list
+                )
+            )
+
         articles = []
-        
-        for feed_url in settings.feeds_list:
+        for feed_articles in results:
+            articles.extend(feed_articles)
+        return articles
+
+    @staticmethod
+    async def _collect_feed(
+        client: httpx.AsyncClient, semaphore: asyncio.Semaphore, feed_url: str
+    ) -> List[dict]:
+        async with semaphore:
             try:
-                feed = feedparser.parse(feed_url)
-                
-                for entry in feed.entries[:10]:
-                    article = {
-                        "feed_source": feed_url,
-                        "title": entry.get("title", ""),
-                        "content": entry.get("summary", entry.get("description", "")),
-                        "link": entry.get("link", ""),
-                        "published_date": datetime.now(),
-                        "raw_data": str(entry),
-                    }
-                    articles.append(article)
+                body = await RSSCollector._fetch_feed(client, feed_url)
             except Exception as e:
-                logger.error(f"Error parsing feed {feed_url}: {str(e)}")
-        
-        return articles
+                logger.error(f"Error fetching feed {feed_url}: {str(e)}")
+                return []
+
+        if body is None:
+            return []
+
+        try:
+            feed = feedparser.parse(body)
+            return [
+                RSSCollector._entry_to_article(feed_url, entry)
+                for entry in feed.entries[:10]
+            ]
+        except Exception as e:
+            logger.error(f"Error parsing feed {feed_url}: {str(e)}")
+            return []
+
+    @staticmethod
+    async def _fetch_feed(client: httpx.AsyncClient, feed_url: str) -> Optional[bytes]:
+        headers = {}
+        validators = RSSCollector._validators.get(feed_url, {})
+        if validators.get("etag"):
+            headers["If-None-Match"] = validators["etag"]
+        if validators.get("last_modified"):
+            headers["If-Modified-Since"] = validators["last_modified"]
+
+        response = await asyncio.wait_for(
+            client.get(feed_url, headers=headers),
+            timeout=settings.rss_fetch_timeout,
+        )
+
+        if response.status_code == 304:
+            logger.debug(f"Feed not modified: {feed_url}")
+            return None
+
+        response.raise_for_status()
+
+        RSSCollector._validators[feed_url] = {
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+        }
+        return response.content
+
+    @staticmethod
+    def _entry_to_article(feed_url: str, entry) -> dict:
+        return {
+            "feed_source": feed_url,
+            "title": entry.get("title", ""),
+            "content": entry.get("summary", entry.get("description", "")),
+            "link": entry.get("link", ""),
+            "published_date": datetime.now(),
+            "raw_data": str(entry),
+        }
@@ -0,0 +1,109 @@
+from apscheduler.schedulers.asyncio import AsyncIOScheduler
+from app.config import settings
+from app.services.ingestion_pipeline import IngestionPipeline
+from collections import OrderedDict
+from datetime import datetime
+import asyncio
+import logging
+import uuid
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+
+class IngestionScheduler:
+    _scheduler: Optional[AsyncIOScheduler] = None
+    _lock: Optional[asyncio.Lock] = None
+    _current_job_id: Optional[str] = None
+    _jobs: "OrderedDict[str, dict]" = OrderedDict()
+    _tasks: set = set()
+
+    @staticmethod
+    def start():
+        if not settings.scheduler_enabled or IngestionScheduler._scheduler is not None:
+            return
+        scheduler = AsyncIOScheduler()
+        scheduler.add_job(
+            IngestionScheduler.trigger,
+            "interval",
+            seconds=settings.batch_processing_interval,
+            kwargs={"source": "scheduler"},
+            id="news_ingestion",
+            max_instances=1,
+            coalesce=True,
+            next_run_time=datetime.now(),
+        )
+        scheduler.start()
+        IngestionScheduler._scheduler = scheduler
+        logger.info(f"Ingestion scheduler started (every {settings.batch_processing_interval}s)")
+
+    @staticmethod
+    def shutdown():
+        if IngestionScheduler._scheduler is not None:
+            IngestionScheduler._scheduler.shutdown(wait=False)
+            IngestionScheduler._scheduler = None
+
+    @staticmethod
+    def enqueue(source: str = "api") -> str:
+        """Start an ingestion run in the background and return its job id.
+
+        Runs are single-flight: if one is already in progress its id is returned
+        instead of starting another.
+        """
+        if IngestionScheduler._current_job_id is not None:
+            return IngestionScheduler._current_job_id
+
+        job_id = IngestionScheduler._new_job(source)
+        task = asyncio.get_running_loop().create_task(IngestionScheduler._run(job_id))
+        IngestionScheduler._tasks.add(task)
+        task.add_done_callback(IngestionScheduler._tasks.discard)
+        return job_id
+
+    @staticmethod
+    async def trigger(source: str = "scheduler"):
+        if IngestionScheduler._current_job_id is not None:
+            logger.info("Ingestion already running, skipping scheduled run")
+            return
+        await IngestionScheduler._run(IngestionScheduler._new_job(source))
+
+    @staticmethod
+    def get_job(job_id: str) -> Optional[dict]:
+        return IngestionScheduler._jobs.get(job_id)
+
+    @staticmethod
+    def _new_job(source: str) -> str:
+        job_id = str(uuid.uuid4())
+        IngestionScheduler._current_job_id = job_id
+        IngestionScheduler._jobs[job_id] = {
+            "job_id": job_id,
+            "source": source,
+            "status": "queued",
+            "created_at": datetime.utcnow().isoformat(),
+            "started_at": None,
+            "finished_at": None,
+            "result": None,
+            "error": None,
+        }
+        while len(IngestionScheduler._jobs) > settings.job_history_size:
+            IngestionScheduler._jobs.popitem(last=False)
+        return job_id
+
+    @staticmethod
+    async def _run(job_id: str):
+        if IngestionScheduler._lock is None:
+            IngestionScheduler._lock = asyncio.Lock()
+
+        job = IngestionScheduler._jobs[job_id]
+        async with IngestionScheduler._lock:
+            job["status"] = "running"
+            job["started_at"] = datetime.utcnow().isoformat()
+            try:
+                job["result"] = await IngestionPipeline.run_cycle()
+                job["status"] = "succeeded"
+            except Exception as e:
+                logger.error(f"Ingestion job {job_id} failed: {str(e)}")
+                job["status"] = "failed"
+                job["error"] = str(e)
+            finally:
+                job["finished_at"] = datetime.utcnow().isoformat()
+                IngestionScheduler._current_job_id = None
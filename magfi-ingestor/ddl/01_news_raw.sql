@@ -7,9 +7,25 @@ CREATE TABLE IF NOT EXISTS app_magfi.stg_news_raw (
     link VARCHAR(500),
     published_date TIMESTAMP,
     raw_data TEXT,
+    content_hash VARCHAR(64),
     is_processed BOOLEAN DEFAULT FALSE,
+    claimed_by VARCHAR(100),
+    lease_expires_at TIMESTAMP,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
 
 CREATE INDEX idx_news_raw_source ON app_magfi.stg_news_raw(feed_source);
 CREATE INDEX idx_news_raw_processed ON app_magfi.stg_news_raw(is_processed);
+
+-- Normalized sha256(link, title, content); lets ingestion skip already-seen articles
+-- (tables created before content_hash existed need the column added first)
+ALTER TABLE app_magfi.stg_news_raw ADD COLUMN IF NOT EXISTS content_hash VARCHAR(64);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_news_raw_content_hash ON app_magfi.stg_news_raw(content_hash);
+
+-- Work queue: unprocessed rows in arrival order, claimed by workers with FOR UPDATE SKIP LOCKED
+ALTER TABLE app_magfi.stg_news_raw ADD COLUMN IF NOT EXISTS claimed_by VARCHAR(100);
+ALTER TABLE app_magfi.stg_news_raw ADD COLUMN IF NOT EXISTS lease_expires_at TIMESTAMP;
+CREATE INDEX IF NOT EXISTS idx_news_raw_queue ON app_magfi.stg_news_raw(created_at) WHERE is_processed = FALSE;
+
+-- Keyset pagination over (created_at, id)
+CREATE INDEX IF NOT EXISTS idx_news_raw_created ON app_magfi.stg_news_raw(created_at, id);
@@ -15,3 +15,5 @@ CREATE TABLE IF NOT EXISTS app_magfi.fct_news_analysis (
 
 CREATE INDEX IF NOT EXISTS idx_news_asset ON app_magfi.fct_news_analysis(asset_id);
 CREATE INDEX IF NOT EXISTS idx_news_created ON app_magfi.fct_news_analysis(created_at);
+-- Keyset pagination over (created_at, id); idx_news_created is core's single-column index
+CREATE INDEX IF NOT EXISTS idx_news_analysis_created_id ON app_magfi.fct_news_analysis(created_at, id);
@@ -0,0 +1,13 @@
+-- Parsed LLM sentiment results keyed by sha256(content fingerprint, model, prompt version)
+CREATE TABLE IF NOT EXISTS app_magfi.cache_news_analysis (
+    cache_key VARCHAR(64) PRIMARY KEY,
+    model_name VARCHAR(100) NOT NULL,
+    prompt_version VARCHAR(20) NOT NULL,
+    result TEXT NOT NULL,
+    hit_count INTEGER DEFAULT 0,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    last_hit_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS idx_analysis_cache_created ON app_magfi.cache_news_analysis(created_at);
+CREATE INDEX IF NOT EXISTS idx_analysis_cache_last_hit ON app_magfi.cache_news_analysis(last_hit_at);
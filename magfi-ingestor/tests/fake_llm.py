@@ -0,0 +1,95 @@
+"""Minimal OpenAI-compatible chat completions server for exercising AIAnalyzer.
+
+    with FakeLLMServer() as server:
+        settings.openai_base_url = server.base_url
+
+By default every article in a prompt is answered as positive. Set `fail_next`
+to make the next N requests return HTTP 500, or `responder` to control the
+reply content for a prompt.
+"""
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import re
+import threading
+import time
+from typing import Callable, List, Optional
+
+
+def positive_batch(prompt: str) -> str:
+    count = len(re.findall(r"^Article \d+:", prompt, flags=re.MULTILINE))
+    return json.dumps([
+        {"index": i, "sentiment": "positive", "impact_score": 0.8, "analysis": "fake", "tickers": []}
+        for i in range(count)
+    ])
+
+
+class FakeLLMServer:
+    def __init__(self, responder: Callable[[str], str] = positive_batch, latency: float = 0.0):
+        self.responder = responder
+        self.latency = latency
+        self.fail_next = 0
+        self.prompts: List[str] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def __enter__(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                prompt = body["messages"][-1]["content"]
+                with fake._lock:
+                    fake.prompts.append(prompt)
+                    fake.in_flight += 1
+                    fake.max_in_flight = max(fake.max_in_flight, fake.in_flight)
+                    failing = fake.fail_next > 0
+                    fake.fail_next -= int(failing)
+                try:
+                    time.sleep(fake.latency)
+                    if failing:
+                        self._reply(500, {"error": {"message": "fake outage", "type": "server_error"}})
+                    else:
+                        self._reply(200, {
+                            "id": "chatcmpl-fake",
+                            "object": "chat.completion",
+                            "created": int(time.time()),
+                            "model": body.get("model", "fake"),
+                            "choices": [{
+                                "index": 0,
+                                "finish_reason": "stop",
+                                "message": {"role": "assistant", "content": fake.responder(prompt)},
+                            }],
+                        })
+                finally:
+                    with fake._lock:
+                        fake.in_flight -= 1
+
+            def _reply(self, status: int, payload: dict):
+                data = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
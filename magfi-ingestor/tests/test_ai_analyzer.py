@@ -0,0 +1,98 @@
+import asyncio
+import json
+
+import pytest
+
+from app.config import settings
+from app.services.ai_analyzer import ANALYSIS_FAILED, AIAnalyzer
+from fake_llm import FakeLLMServer
+
+
+@pytest.fixture
+def fake_llm(monkeypatch):
+    with FakeLLMServer() as server:
+        monkeypatch.setattr(settings, "sentiment_analysis_model", "openai")
+        monkeypatch.setattr(settings, "openai_base_url", server.base_url)
+        monkeypatch.setattr(settings, "openai_api_key", "test")
+        monkeypatch.setattr(settings, "lexicon_prefilter_enabled", False)
+        monkeypatch.setattr(settings, "analysis_cache_enabled", False)
+        monkeypatch.setattr(settings, "analysis_batch_size", 2)
+        monkeypatch.setattr(settings, "analysis_max_concurrency", 2)
+        monkeypatch.setattr(settings, "analysis_max_retries", 2)
+        monkeypatch.setattr(settings, "analysis_retry_base_delay", 0.0)
+        monkeypatch.setattr(settings, "analysis_timeout", 5.0)
+        yield server
+    AIAnalyzer._openai_client = None
+    AIAnalyzer._semaphore = None
+
+
+def run(coro):
+    async def wrapper():
+        try:
+            return await coro
+        finally:
+            await AIAnalyzer.close()
+    return asyncio.run(wrapper())
+
+
+def test_batches_articles_per_prompt(fake_llm):
+    texts = [f"headline {i}" for i in range(5)]
+
+    results = run(AIAnalyzer.analyze_batch(texts))
+
+    assert [r["sentiment"] for r in results] == ["positive"] * 5
+    assert len(fake_llm.prompts) == 3
+
+
+def test_bounds_requests_in_flight(fake_llm):
+    fake_llm.latency = 0.05
+
+    run(AIAnalyzer.analyze_batch([f"headline {i}" for i in range(12)]))
+
+    assert len(fake_llm.prompts) == 6
+    assert fake_llm.max_in_flight <= settings.analysis_max_concurrency
+
+
+def test_retries_transient_errors(fake_llm):
+    fake_llm.fail_next = 2
+
+    results = run(AIAnalyzer.analyze_batch(["headline"]))
+
+    assert results[0]["sentiment"] == "positive"
+    assert len(fake_llm.prompts) == 3
+
+
+def test_marks_failed_when_retries_run_out(fake_llm):
+    fake_llm.fail_next = 100
+
+    results = run(AIAnalyzer.analyze_batch(["headline a", "headline b"]))
+
+    assert results == [ANALYSIS_FAILED, ANALYSIS_FAILED]
+    assert len(fake_llm.prompts) == settings.analysis_max_retries + 1
+
+
+def test_marks_articles_missing_from_response_failed(fake_llm):
+    fake_llm.responder = lambda prompt: json.dumps(
+        [{"index": 1, "sentiment": "negative", "impact_score": 0.4, "analysis": "fake"}]
+    )
+
+    results = run(AIAnalyzer.analyze_batch(["headline a", "headline b"]))
+
+    assert results[0] is ANALYSIS_FAILED
+    assert results[1]["sentiment"] == "negative"
+
+
+def test_marks_malformed_items_failed(fake_llm, monkeypatch):
+    fake_llm.responder = lambda prompt: json.dumps([
+        {"index": 0, "sentiment": "bullish", "impact_score": 0.5, "analysis": "fake"},
+        {"index": 1, "sentiment": "positive", "impact_score": None, "analysis": "fake"},
+        {"index": 2, "sentiment": "Negative", "impact_score": "1.7", "analysis": "fake"},
+    ])
+    monkeypatch.setattr(settings, "analysis_batch_size", 3)
+
+    results = run(AIAnalyzer.analyze_batch(["headline a", "headline b", "headline c"]))
+
+    assert results[0] is ANALYSIS_FAILED
+    assert results[1] is ANALYSIS_FAILED
+    assert results[2]["sentiment"] == "negative"
+    assert results[2]["impact_score"] == 1.0
@@ -0,0 +1,131 @@
+"""Offline commands for magfi-predictor.
+
+    python -m app.cli train [--horizon-days 7]
+    python -m app.cli benchmark [--assets 1000] [--rounds 50]
+    python -m app.cli backtest --start 2024-01-01 [--end 2024-12-31] [--model]
+"""
+import argparse
+import logging
+import time
+from datetime import datetime
+
+import numpy as np
+
+from app.config import settings
+
+logging.basicConfig(level=settings.log_level)
+logger = logging.getLogger(__name__)
+
+
+def train(args):
+    from app.database import SessionLocal
+    from app.services.training_service import TrainingService
+
+    db = SessionLocal()
+    try:
+        prices, news = TrainingService.load_frames(db)
+    finally:
+        db.close()
+
+    features, target = TrainingService.build_dataset(prices, news, args.horizon_days)
+    if len(target) < args.min_samples:
+        logger.error(f"Only {len(target)} training samples, need at least {args.min_samples}")
+        return 1
+
+    model, metrics = TrainingService.train(features, target)
+    path = TrainingService.save_artifact(model, metrics, len(target))
+    print(f"Trained on {len(target)} samples: {metrics}")
+    print(f"Artifact: {path}")
+    return 0
+
+
+def benchmark(args):
+    from app.services.model_service import FEATURE_NAMES, ModelService
+
+    if not ModelService.load(args.version):
+        logger.error("No model artifact to benchmark; run `python -m app.cli train` first")
+        return 1
+
+    rng = np.random.default_rng(0)
+    features = rng.normal(size=(args.assets, len(FEATURE_NAMES)))
+    ModelService.predict(features)
+
+    timings = []
+    for _ in range(args.rounds):
+        started = time.perf_counter()
+        ModelService.predict(features)
+        timings.append(time.perf_counter() - started)
+
+    timings = np.asarray(timings)
+    per_1k_ms = timings * 1000 * 1000 / args.assets
+    print(f"model {ModelService.info()['version']}, {args.assets} assets x {args.rounds} rounds")
+    print(f"  per 1k assets: median {np.median(per_1k_ms):.3f} ms, p95 {np.percentile(per_1k_ms, 95):.3f} ms")
+    print(f"  throughput: {args.assets / np.median(timings):,.0f} assets/s")
+    return 0
+
+
+def backtest(args):
+    from app.database import SessionLocal
+    from app.services.backtest_service import BacktestService
+    from app.services.model_service import ModelService
+
+    if args.model and not ModelService.load(args.version):
+        logger.error("No model artifact to backtest; run `python -m app.cli train` first")
+        return 1
+
+    db = SessionLocal()
+    try:
+        report = BacktestService.run(
+            BacktestService.db_loader(db),
+            start=datetime.fromisoformat(args.start),
+            end=datetime.fromisoformat(args.end) if args.end else datetime.utcnow(),
+            horizon_days=args.horizon_days,
+            chunk_days=args.chunk_days,
+            use_model=args.model,
+        )
+    finally:
+        db.close()
+
+    predictor = f"model {ModelService.info()['version']}" if args.model else "heuristic"
+    print(f"{predictor}, {args.horizon_days}-day horizon, {report['chunks']} chunks of {args.chunk_days} days")
+    if not report["predictions"]:
+        print("  no predictions could be scored in this range")
+    else:
+        print(f"  predictions: {report['predictions']}, MAE {report['mae_percent']:.3f}%")
+    if report["direction_accuracy"] is not None:
+        print(f"  direction accuracy: {report['direction_accuracy']:.1%} over {report['directional_calls']} calls")
+    print(f"  throughput: {report['rows_read']} rows in {report['elapsed_seconds']}s "
+          f"({report['rows_per_second']} rows/s), {report['predictions_per_second']} predictions/s")
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m app.cli")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    train_parser = commands.add_parser("train", help="Train and save a new model artifact")
+    train_parser.add_argument("--horizon-days", type=int, default=7)
+    train_parser.add_argument("--min-samples", type=int, default=50)
+    train_parser.set_defaults(handler=train)
+
+    bench_parser = commands.add_parser("benchmark", help="Measure model inference throughput")
+    bench_parser.add_argument("--assets", type=int, default=1000)
+    bench_parser.add_argument("--rounds", type=int, default=50)
+    bench_parser.add_argument("--version", default=None)
+    bench_parser.set_defaults(handler=benchmark)
+
+    backtest_parser = commands.add_parser("backtest", help="Replay history and score predictions")
+    backtest_parser.add_argument("--start", required=True, help="ISO date of the first prediction day")
+    backtest_parser.add_argument("--end", default=None, help="ISO date to stop at (default: now)")
+    backtest_parser.add_argument("--horizon-days", type=int, default=7)
+    backtest_parser.add_argument("--chunk-days", type=int, default=30)
+    backtest_parser.add_argument("--model", action="store_true", help="Score the trained model instead of the heuristic")
+    backtest_parser.add_argument("--version", default=None)
+    backtest_parser.set_defaults(handler=backtest)
+
+    args = parser.parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
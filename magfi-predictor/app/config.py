@@ -11,10 +11,43 @@ class Settings(BaseSettings):
     supabase_url: str
     supabase_key: str
     
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout: float = 30.0
+    db_pool_recycle: int = 1800
+    db_statement_timeout_ms: int = 0
+    db_echo: bool = False
+    db_slow_query_ms: float = 500.0
+    db_slow_query_log_size: int = 20
+    
     api_port: int = 8300
     api_host: str = "0.0.0.0"
     log_level: str = "INFO"
     
+    http_timeout: float = 30.0
+    http_connect_timeout: float = 5.0
+    http_max_connections: int = 100
+    http_max_keepalive_connections: int = 20
+    http_keepalive_expiry: float = 30.0
+    upstream_deadline: float = 10.0
+    
+    prediction_horizon_days: int = 7
+    ticker_cache_ttl_seconds: int = 600
+    prediction_news_window_days: int = 7
+    prediction_news_limit: int = 5000
+    
+    prediction_cache_ttl_seconds: int = 300
+    prediction_cache_max_entries: int = 1024
+    
+    feature_window: int = 60
+    feature_short_ma: int = 5
+    feature_long_ma: int = 20
+    feature_refresh_lookback_seconds: int = 300
+    
+    model_dir: str = "models"
+    model_version: Optional[str] = None
+    inference_workers: int = 2
+    
     magfi_core_url: str
     magfi_ingestor_url: str
     
@@ -1,12 +1,24 @@
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.pool import QueuePool
 from app.config import settings
+from app.services.db_metrics import DatabaseMetrics
 
 engine = create_engine(
     settings.database_url,
+    poolclass=DatabaseMetrics.pool_class(QueuePool, "primary"),
+    pool_size=settings.db_pool_size,
+    max_overflow=settings.db_max_overflow,
+    pool_timeout=settings.db_pool_timeout,
+    pool_recycle=settings.db_pool_recycle,
     pool_pre_ping=True,
-    echo=settings.debug,
+    echo=settings.db_echo,
+    connect_args=(
+        {"options": f"-c statement_timeout={settings.db_statement_timeout_ms}"}
+        if settings.db_statement_timeout_ms else {}
+    ),
 )
+DatabaseMetrics.instrument(engine, "primary")
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
@@ -3,6 +3,10 @@ from fastapi.middleware.cors import CORSMiddleware
 import logging
 from app.config import settings
 from app.routes import health, predict
+from app.database import SessionLocal
+from app.services.http_client import HttpClientRegistry
+from app.services.feature_store import FeatureStore
+from app.services.model_service import ModelService
 
 logging.basicConfig(level=settings.log_level)
 logger = logging.getLogger(__name__)
@@ -28,11 +32,24 @@ app.include_router(predict.router)
 @app.on_event("startup")
 async def startup_event():
     logger.info(f"Starting {settings.app_name}")
+    db = SessionLocal()
+    try:
+        FeatureStore.refresh(db)
+    except Exception as e:
+        logger.error(f"Feature store warm-up failed: {str(e)}")
+    finally:
+        db.close()
+    try:
+        ModelService.load()
+    except Exception as e:
+        logger.error(f"Model load failed, using heuristic predictions: {str(e)}")
 
 
 @app.on_event("shutdown")
 async def shutdown_event():
     logger.info(f"Shutting down {settings.app_name}")
+    await HttpClientRegistry.close_all()
+    ModelService.shutdown()
 
 
 if __name__ == "__main__":
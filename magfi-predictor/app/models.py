@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, DateTime, UUID, Float, Text
+from sqlalchemy import Column, String, DateTime, UUID, Float, Text, Boolean, Integer
 import uuid
 from datetime import datetime
 from app.database import Base
@@ -14,5 +14,41 @@ class Prediction(Base):
     predicted_price = Column(Float, nullable=True)
     confidence_score = Column(Float, nullable=False)
     prediction_date = Column(DateTime, nullable=False)
+    horizon_days = Column(Integer, nullable=True)
     analysis_summary = Column(Text, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
+
+
+class Asset(Base):
+    """Read-only view of magfi-core's dim_asset."""
+    __tablename__ = "dim_asset"
+    __table_args__ = {"schema": "app_magfi"}
+    
+    id = Column(UUID(as_uuid=True), primary_key=True)
+    ticker_symbol = Column(String(20), nullable=False)
+    is_active = Column(Boolean, default=True)
+    updated_at = Column(DateTime, nullable=True)
+
+
+class NewsAnalysis(Base):
+    """Read-only view of magfi-ingestor's fct_news_analysis."""
+    __tablename__ = "fct_news_analysis"
+    __table_args__ = {"schema": "app_magfi"}
+    
+    id = Column(UUID(as_uuid=True), primary_key=True)
+    asset_id = Column(UUID(as_uuid=True), nullable=True)
+    sentiment = Column(String(20), nullable=True)
+    impact_score = Column(Float, nullable=True)
+    created_at = Column(DateTime, nullable=True)
+
+
+class AssetPriceHistory(Base):
+    """Read-only view of magfi-core's fct_asset_price_history."""
+    __tablename__ = "fct_asset_price_history"
+    __table_args__ = {"schema": "app_magfi"}
+    
+    id = Column(UUID(as_uuid=True), primary_key=True)
+    asset_id = Column(UUID(as_uuid=True), nullable=False)
+    price = Column(Float, nullable=False)
+    recorded_at = Column(DateTime, nullable=True)
+    ingested_at = Column(DateTime, nullable=True)
@@ -1,6 +1,10 @@
 from fastapi import APIRouter, Depends
 from app.schemas import HealthResponseSchema
 from app.config import settings
+from app.services.db_metrics import DatabaseMetrics
+from app.services.http_client import HttpClientRegistry
+from app.services.prediction_cache import PredictionCache
+from app.services.model_service import ModelService
 
 router = APIRouter(tags=["health"])
 
@@ -12,3 +16,23 @@ def health_check():
         "app_name": settings.app_name,
         "environment": settings.app_env,
     }
+
+
+@router.get("/health/upstreams")
+def upstream_metrics():
+    return HttpClientRegistry.metrics()
+
+
+@router.get("/health/prediction-cache")
+def prediction_cache_stats():
+    return PredictionCache.stats()
+
+
+@router.get("/health/model")
+def model_info():
+    return ModelService.info()
+
+
+@router.get("/metrics")
+def metrics():
+    return {"database": DatabaseMetrics.snapshot(), "upstreams": HttpClientRegistry.metrics()}
@@ -1,112 +1,212 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
+from app.config import settings
 from app.database import get_db
 from app.schemas import ApiResponseSchema
 from app.services.data_fetcher import DataFetcher
 from app.services.prediction_service import PredictionService
+from app.services.prediction_input import PredictionInputBuilder
+from app.services.batch_predictor import BatchPredictionEngine
+from app.services.prediction_cache import PredictionCache
+from app.services.feature_store import FeatureStore
+from app.services.model_service import ModelService
 from datetime import datetime, timedelta
+import numpy as np
 import logging
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/predict", tags=["predict"])
 
 
+def _refresh_features(db: Session):
+    try:
+        FeatureStore.refresh(db)
+    except Exception as e:
+        logger.warning(f"Unable to refresh price features: {str(e)}")
+        db.rollback()
+
+
+def _input_watermark(db: Session, ticker: str = None):
+    try:
+        return PredictionService.get_input_watermark(db, ticker)
+    except Exception as e:
+        # Without a watermark the cache still bounds staleness by its TTL
+        logger.warning(f"Unable to read prediction input watermark: {str(e)}")
+        db.rollback()
+        return None
+
+
 @router.get("", response_model=ApiResponseSchema)
 async def get_market_prediction(db: Session = Depends(get_db)):
     try:
-        assets = await DataFetcher.fetch_assets()
-        news = await DataFetcher.fetch_news_analysis()
-        
-        predictions = []
+        return await PredictionCache.get_or_compute(
+            "__market__", _input_watermark(db), lambda: _compute_market_prediction(db)
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Prediction error: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+async def _compute_market_prediction(db: Session):
+    inputs, missing = await DataFetcher.fetch_market_inputs()
+    assets, news = inputs["assets"], inputs["news"]
+    if "assets" in missing:
+        # Without the asset list there is nothing to predict; news alone can still be partial
+        raise HTTPException(
+            status_code=504 if missing["assets"] == "timeout" else 502,
+            detail="Asset list unavailable from magfi-core",
+        )
+    _refresh_features(db)
+    
+    news_by_ticker = PredictionInputBuilder.group_news(news)
+    columns = BatchPredictionEngine.build_columns(assets, news_by_ticker)
+    result = BatchPredictionEngine.predict(columns.prices, columns.sentiment_scores, columns.impact_scores)
+    prediction_type = "sentiment_based"
+    
+    if ModelService.is_loaded() and len(columns):
+        features = ModelService.build_features(
+            columns.net_sentiments, columns.impact_scores, columns.news_counts,
+            result["predicted_change_percent"], columns.asset_ids, FeatureStore.get,
+        )
+        predicted_change = await ModelService.predict_async(features)
+        result["direction"] = np.sign(predicted_change)
+        result["predicted_change_percent"] = predicted_change
+        result["predicted_price"] = columns.prices * (1.0 + predicted_change / 100.0)
+        prediction_type = f"model:{ModelService.info()['version']}"
+    
+    prediction_date = datetime.utcnow()
+    predictions = []
+    prediction_rows = []
+    
+    for i, ticker in enumerate(columns.tickers):
+        aggregate = columns.aggregates[i]
+        direction = result["direction"][i]
+        predicted_price = float(result["predicted_price"][i])
+        confidence = float(result["confidence"][i])
         
-        for asset in assets[:5]:
-            ticker = asset.get("ticker_symbol")
-            current_price = asset.get("current_price", 0)
-            
-            sentiment_impacts = [
-                n for n in news 
-                if n.get("ticker", "").upper() == ticker.upper()
-            ]
-            
-            if sentiment_impacts:
-                avg_sentiment = sentiment_impacts[0].get("sentiment", "neutral")
-                avg_impact = sum(n.get("impact_score", 0) for n in sentiment_impacts) / len(sentiment_impacts)
-                
-                sentiment_pred = PredictionService.predict_sentiment_impact(avg_sentiment, avg_impact)
-                predicted_price = current_price * (1 + sentiment_pred["predicted_change_percent"] / 100)
-                
-                prediction_data = {
-                    "asset_ticker": ticker,
-                    "prediction_type": "sentiment_based",
-                    "predicted_price": predicted_price,
-                    "confidence_score": sentiment_pred["confidence"],
-                    "prediction_date": datetime.utcnow(),
-                    "horizon_days": 7,
-                    "analysis_summary": f"Prediction based on {len(sentiment_impacts)} recent news items with {avg_sentiment} sentiment"
-                }
-                
-                PredictionService.save_prediction(db, prediction_data)
-                
-                predictions.append({
-                    "ticker": ticker,
-                    "current_price": current_price,
-                    "predicted_price": round(predicted_price, 2),
-                    "confidence": round(sentiment_pred["confidence"], 2),
-                    "direction": "bullish" if sentiment_pred["direction"] > 0 else ("bearish" if sentiment_pred["direction"] < 0 else "neutral"),
-                })
+        prediction_rows.append({
+            "asset_id": columns.asset_ids[i],
+            "asset_ticker": ticker,
+            "prediction_type": prediction_type,
+            "predicted_price": predicted_price,
+            "confidence_score": confidence,
+            "prediction_date": prediction_date,
+            "horizon_days": settings.prediction_horizon_days,
+            "analysis_summary": f"Prediction based on {aggregate.count} recent news items with {aggregate.dominant_sentiment} sentiment"
+        })
         
-        return {
-            "success": True,
-            "data": predictions,
-            "message": f"Generated predictions for {len(predictions)} assets"
-        }
+        predictions.append({
+            "ticker": ticker,
+            "current_price": float(columns.prices[i]),
+            "predicted_price": round(predicted_price, 2),
+            "confidence": round(confidence, 2),
+            "direction": "bullish" if direction > 0 else ("bearish" if direction < 0 else "neutral"),
+            "features": FeatureStore.get(columns.asset_ids[i]),
+        })
+    
+    PredictionService.save_predictions_bulk(db, prediction_rows)
+    
+    message = f"Generated predictions for {len(predictions)} assets"
+    if missing:
+        message += f" (partial: {', '.join(missing)} unavailable)"
+    
+    response = {
+        "success": True,
+        "data": predictions,
+        "message": message
+    }
+    # Partial results are served but not cached, so the next poll retries the upstreams
+    return response, not missing
+
+
+@router.get("/{ticker}/latest", response_model=ApiResponseSchema)
+async def get_latest_asset_prediction(ticker: str, db: Session = Depends(get_db)):
+    try:
+        prediction = PredictionService.get_latest_prediction(db, ticker)
     except Exception as e:
-        logger.error(f"Prediction error: {str(e)}")
+        logger.error(f"Error reading latest prediction for {ticker}: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
+    if prediction is None:
+        raise HTTPException(status_code=404, detail="No stored prediction for this asset")
+    return {
+        "success": True,
+        "data": {
+            "ticker": ticker.upper(),
+            "prediction_type": prediction.prediction_type,
+            "predicted_price": prediction.predicted_price,
+            "confidence": prediction.confidence_score,
+            "prediction_date": prediction.prediction_date.isoformat(),
+            "horizon_days": prediction.horizon_days,
+            "analysis_summary": prediction.analysis_summary,
+        },
+        "message": "Latest stored prediction"
+    }
 
 
 @router.get("/{ticker}", response_model=ApiResponseSchema)
 async def get_asset_prediction(ticker: str, db: Session = Depends(get_db)):
     try:
-        asset = await DataFetcher.fetch_asset(ticker)
-        if not asset:
-            raise HTTPException(status_code=404, detail="Asset not found")
-        
-        news = await DataFetcher.fetch_news_analysis()
-        sentiment_impacts = [n for n in news if n.get("ticker", "").upper() == ticker.upper()]
-        
-        if sentiment_impacts:
-            avg_sentiment = sentiment_impacts[0].get("sentiment", "neutral")
-            avg_impact = sum(n.get("impact_score", 0) for n in sentiment_impacts) / len(sentiment_impacts)
-            
-            sentiment_pred = PredictionService.predict_sentiment_impact(avg_sentiment, avg_impact)
-            current_price = asset.get("current_price", 0)
-            predicted_price = current_price * (1 + sentiment_pred["predicted_change_percent"] / 100)
-            
-            return {
-                "success": True,
-                "data": {
-                    "ticker": ticker,
-                    "current_price": current_price,
-                    "predicted_price": round(predicted_price, 2),
-                    "confidence": round(sentiment_pred["confidence"], 2),
-                    "direction": "bullish" if sentiment_pred["direction"] > 0 else ("bearish" if sentiment_pred["direction"] < 0 else "neutral"),
-                    "analysis_based_on_news_items": len(sentiment_impacts),
-                },
-                "message": "Prediction generated successfully"
-            }
-        else:
-            return {
-                "success": True,
-                "data": {
-                    "ticker": ticker,
-                    "current_price": asset.get("current_price", 0),
-                    "message": "No recent news available for prediction"
-                },
-                "message": "Insufficient data for accurate prediction"
-            }
+        return await PredictionCache.get_or_compute(
+            f"ticker:{ticker.upper()}", _input_watermark(db, ticker), lambda: _compute_asset_prediction(db, ticker)
+        )
     except HTTPException:
         raise
     except Exception as e:
         logger.error(f"Prediction error for {ticker}: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
+
+
+async def _compute_asset_prediction(db: Session, ticker: str):
+    inputs, missing = await DataFetcher.fetch_asset_inputs(ticker)
+    asset, news = inputs["asset"], inputs["news"]
+    if not asset:
+        if missing.get("asset") == "timeout":
+            raise HTTPException(status_code=504, detail="Asset lookup timed out")
+        if "asset" in missing:
+            raise HTTPException(status_code=502, detail="Asset lookup failed upstream")
+        raise HTTPException(status_code=404, detail="Asset not found")
+    _refresh_features(db)
+    aggregate = PredictionInputBuilder.group_news(news).get(PredictionInputBuilder.normalize_ticker(ticker))
+    
+    if aggregate:
+        avg_sentiment = aggregate.dominant_sentiment
+        avg_impact = aggregate.avg_impact
+        
+        sentiment_pred = PredictionService.predict_sentiment_impact(avg_sentiment, avg_impact)
+        if ModelService.is_loaded():
+            features = ModelService.build_features(
+                np.array([aggregate.net_sentiment]), np.array([avg_impact]), np.array([aggregate.count]),
+                np.array([sentiment_pred["predicted_change_percent"]]), [asset.get("id")], FeatureStore.get,
+            )
+            predicted_change = float((await ModelService.predict_async(features))[0])
+            sentiment_pred["predicted_change_percent"] = predicted_change
+            sentiment_pred["direction"] = float(np.sign(predicted_change))
+        current_price = asset.get("current_price", 0)
+        predicted_price = current_price * (1 + sentiment_pred["predicted_change_percent"] / 100)
+        
+        response = {
+            "success": True,
+            "data": {
+                "ticker": ticker,
+                "current_price": current_price,
+                "predicted_price": round(predicted_price, 2),
+                "confidence": round(sentiment_pred["confidence"], 2),
+                "direction": "bullish" if sentiment_pred["direction"] > 0 else ("bearish" if sentiment_pred["direction"] < 0 else "neutral"),
+                "analysis_based_on_news_items": aggregate.count,
+                "features": FeatureStore.get(asset.get("id")),
+            },
+            "message": "Prediction generated successfully"
+        }
+    else:
+        response = {
+            "success": True,
+            "data": {
+                "ticker": ticker,
+                "current_price": asset.get("current_price", 0),
+                "message": "No recent news available for prediction"
+            },
+            "message": "Insufficient data for accurate prediction"
+        }
+    return response, not missing
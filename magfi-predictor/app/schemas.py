@@ -1,6 +1,6 @@
 from pydantic import BaseModel
 from datetime import datetime
-from typing import Optional, List
+from typing import Optional, List, Union
 from uuid import UUID
 
 
@@ -22,6 +22,6 @@ class HealthResponseSchema(BaseModel):
 
 class ApiResponseSchema(BaseModel):
     success: bool
-    data: Optional[dict] = None
+    data: Optional[Union[dict, List]] = None
     message: str
     error: Optional[str] = None
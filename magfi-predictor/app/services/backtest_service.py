@@ -0,0 +1,147 @@
+import numpy as np
+import pandas as pd
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.models import AssetPriceHistory, NewsAnalysis
+from app.services.batch_predictor import BatchPredictionEngine
+from app.services.model_service import FEATURE_NAMES, ModelService
+from app.services.training_service import TrainingService
+from datetime import datetime, timedelta
+import logging
+import time
+from typing import Callable, Iterator, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class BacktestScore:
+    """Running totals so chunks can be scored and discarded one at a time."""
+
+    __slots__ = ("predictions", "directional", "direction_hits", "abs_error_sum",
+                 "rows_read", "chunks", "predict_seconds", "started")
+
+    def __init__(self):
+        self.predictions = 0
+        self.directional = 0
+        self.direction_hits = 0
+        self.abs_error_sum = 0.0
+        self.rows_read = 0
+        self.chunks = 0
+        self.predict_seconds = 0.0
+        self.started = time.perf_counter()
+
+    def add(self, predicted: np.ndarray, realized: np.ndarray):
+        self.predictions += len(predicted)
+        self.abs_error_sum += float(np.abs(predicted - realized).sum())
+        called = predicted != 0
+        self.directional += int(called.sum())
+        self.direction_hits += int((np.sign(predicted[called]) == np.sign(realized[called])).sum())
+
+    def report(self) -> dict:
+        elapsed = time.perf_counter() - self.started
+        return {
+            "chunks": self.chunks,
+            "rows_read": self.rows_read,
+            "predictions": self.predictions,
+            "mae_percent": self.abs_error_sum / self.predictions if self.predictions else None,
+            "direction_accuracy": self.direction_hits / self.directional if self.directional else None,
+            "directional_calls": self.directional,
+            "elapsed_seconds": round(elapsed, 3),
+            "rows_per_second": round(self.rows_read / elapsed, 1) if elapsed else None,
+            "predictions_per_second": round(self.predictions / self.predict_seconds, 1) if self.predict_seconds else None,
+        }
+
+
+class BacktestService:
+    @staticmethod
+    def db_loader(db: Session) -> Callable[[datetime, datetime, datetime, datetime], Tuple[pd.DataFrame, pd.DataFrame]]:
+        """Loader reading one time slice of price history and news from the database."""
+        bind = db.get_bind()
+
+        def load(price_from, price_to, news_from, news_to):
+            prices = pd.read_sql(
+                select(AssetPriceHistory.asset_id, AssetPriceHistory.price, AssetPriceHistory.recorded_at)
+                .where(AssetPriceHistory.recorded_at >= price_from, AssetPriceHistory.recorded_at < price_to),
+                bind,
+            )
+            news = pd.read_sql(
+                select(NewsAnalysis.asset_id, NewsAnalysis.sentiment, NewsAnalysis.impact_score, NewsAnalysis.created_at)
+                .where(
+                    NewsAnalysis.asset_id.isnot(None),
+                    NewsAnalysis.created_at >= news_from,
+                    NewsAnalysis.created_at < news_to,
+                ),
+                bind,
+            )
+            return prices, news
+
+        return load
+
+    @staticmethod
+    def chunks(start: datetime, end: datetime, chunk_days: int) -> Iterator[Tuple[datetime, datetime]]:
+        cursor = start
+        while cursor < end:
+            chunk_end = min(cursor + timedelta(days=chunk_days), end)
+            yield cursor, chunk_end
+            cursor = chunk_end
+
+    @staticmethod
+    def run(loader, start: datetime, end: datetime, horizon_days: int = 7,
+            chunk_days: int = 30, use_model: bool = False) -> dict:
+        """Replay history in time order and score predictions made as of each day.
+
+        Each chunk loads only its own days plus the lookback needed for rolling
+        features and the horizon needed to observe realized prices, so memory
+        is bounded by chunk_days regardless of how much history exists.
+        """
+        if use_model and not ModelService.is_loaded():
+            raise RuntimeError("No model artifact loaded")
+
+        lookback = timedelta(days=max(settings.feature_window, settings.feature_long_ma))
+        news_lookback = timedelta(days=settings.prediction_news_window_days)
+        score = BacktestScore()
+
+        for chunk_start, chunk_end in BacktestService.chunks(start, end, chunk_days):
+            prices, news = loader(
+                chunk_start - lookback, chunk_end + timedelta(days=horizon_days + 1), chunk_start - news_lookback, chunk_end
+            )
+            score.rows_read += len(prices) + len(news)
+            score.chunks += 1
+            if prices.empty or news.empty:
+                continue
+
+            predicted, realized = BacktestService.score_chunk(
+                prices, news, chunk_start, chunk_end, horizon_days, use_model, score
+            )
+            score.add(predicted, realized)
+            logger.info(f"Backtest chunk {chunk_start:%Y-%m-%d}..{chunk_end:%Y-%m-%d}: {len(predicted)} predictions")
+
+        return score.report()
+
+    @staticmethod
+    def chunk_samples(prices: pd.DataFrame, news: pd.DataFrame, chunk_start: datetime, chunk_end: datetime,
+                      horizon_days: int) -> pd.DataFrame:
+        # Both predictors are scored on the samples training would build, so their inputs and targets match
+        samples = TrainingService.build_samples(prices, news, horizon_days)
+        return samples[(samples["day"] >= pd.Timestamp(chunk_start)) & (samples["day"] < pd.Timestamp(chunk_end))]
+
+    @staticmethod
+    def score_chunk(prices: pd.DataFrame, news: pd.DataFrame, chunk_start: datetime, chunk_end: datetime,
+                    horizon_days: int, use_model: bool, score: BacktestScore) -> Tuple[np.ndarray, np.ndarray]:
+        samples = BacktestService.chunk_samples(prices, news, chunk_start, chunk_end, horizon_days)
+        if samples.empty:
+            return np.empty(0), np.empty(0)
+
+        started = time.perf_counter()
+        if use_model:
+            predicted = ModelService.predict(samples[FEATURE_NAMES].fillna(0.0).to_numpy(dtype=np.float64))
+        else:
+            # The live heuristic: dominant sentiment and mean impact over the trailing news window
+            predicted = BatchPredictionEngine.predict(
+                samples["price"].to_numpy(dtype=np.float64),
+                samples["direction"].to_numpy(dtype=np.float64),
+                samples["impact_score"].to_numpy(dtype=np.float64),
+            )["predicted_change_percent"]
+        score.predict_seconds += time.perf_counter() - started
+        return predicted, samples["target"].to_numpy(dtype=np.float64)
@@ -0,0 +1,67 @@
+import numpy as np
+from app.services.prediction_input import PredictionInputBuilder, TickerNewsAggregate
+from typing import Dict, List
+
+SENTIMENT_DIRECTION = {"positive": 1.0, "negative": -1.0, "neutral": 0.0}
+
+
+class PredictionColumns:
+    """Column-oriented prediction inputs for every asset that has news."""
+
+    __slots__ = ("tickers", "asset_ids", "aggregates", "prices", "sentiment_scores", "impact_scores",
+                 "net_sentiments", "news_counts")
+
+    def __init__(self, tickers: List[str], asset_ids: List[str], aggregates: List[TickerNewsAggregate],
+                 prices: np.ndarray, sentiment_scores: np.ndarray, impact_scores: np.ndarray):
+        self.tickers = tickers
+        self.asset_ids = asset_ids
+        self.aggregates = aggregates
+        self.prices = prices
+        self.sentiment_scores = sentiment_scores
+        self.impact_scores = impact_scores
+        self.net_sentiments = np.asarray([a.net_sentiment for a in aggregates], dtype=np.float64)
+        self.news_counts = np.asarray([a.count for a in aggregates], dtype=np.float64)
+
+    def __len__(self):
+        return len(self.tickers)
+
+
+class BatchPredictionEngine:
+    @staticmethod
+    def build_columns(assets: List[dict], news_by_ticker: Dict[str, TickerNewsAggregate]) -> PredictionColumns:
+        tickers, asset_ids, aggregates, prices, sentiments, impacts = [], [], [], [], [], []
+        for asset in assets:
+            ticker = asset.get("ticker_symbol")
+            aggregate = news_by_ticker.get(PredictionInputBuilder.normalize_ticker(ticker))
+            if aggregate is None:
+                continue
+            tickers.append(ticker)
+            asset_ids.append(asset.get("id"))
+            aggregates.append(aggregate)
+            prices.append(asset.get("current_price") or 0.0)
+            sentiments.append(SENTIMENT_DIRECTION.get(aggregate.dominant_sentiment, 0.0))
+            impacts.append(aggregate.avg_impact)
+
+        return PredictionColumns(
+            tickers,
+            asset_ids,
+            aggregates,
+            np.asarray(prices, dtype=np.float64),
+            np.asarray(sentiments, dtype=np.float64),
+            np.asarray(impacts, dtype=np.float64),
+        )
+
+    @staticmethod
+    def predict(prices: np.ndarray, sentiment_scores: np.ndarray, impact_scores: np.ndarray) -> Dict[str, np.ndarray]:
+        """Vectorized form of PredictionService.predict_sentiment_impact over all assets at once."""
+        direction = np.sign(sentiment_scores)
+        predicted_change = sentiment_scores * impact_scores * 2.0
+        predicted_price = prices * (1.0 + predicted_change / 100.0)
+        confidence = impact_scores.copy()
+
+        return {
+            "direction": direction,
+            "predicted_change_percent": predicted_change,
+            "predicted_price": predicted_price,
+            "confidence": confidence,
+        }
@@ -1,53 +1,94 @@
-import httpx
 from app.config import settings
+from app.services.http_client import HttpClientRegistry
+import asyncio
+from datetime import datetime, timedelta
 import logging
+from typing import Any, Awaitable, Dict, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
 
 class DataFetcher:
+    """Upstream reads for predictions.
+
+    The fetch_* helpers raise on transport errors and non-2xx responses (other
+    than a 404 for an unknown asset) so that gather() reports the source as
+    missing instead of the caller mistaking an outage for "no data".
+    """
+
     @staticmethod
     async def fetch_assets():
-        try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    f"{settings.magfi_core_url}/market/assets",
-                    timeout=30.0
-                )
-                response.raise_for_status()
-                data = response.json()
-                return data.get("data", [])
-        except Exception as e:
-            logger.error(f"Error fetching assets: {str(e)}")
-            return []
+        response = await HttpClientRegistry.request(
+            "magfi-core", settings.magfi_core_url, "GET", "/market/assets"
+        )
+        response.raise_for_status()
+        return response.json().get("data", [])
 
     @staticmethod
     async def fetch_asset(ticker: str):
-        try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    f"{settings.magfi_core_url}/market/asset",
-                    params={"tickerSymbol": ticker},
-                    timeout=30.0
-                )
-                response.raise_for_status()
-                data = response.json()
-                return data.get("data")
-        except Exception as e:
-            logger.error(f"Error fetching asset {ticker}: {str(e)}")
+        response = await HttpClientRegistry.request(
+            "magfi-core", settings.magfi_core_url, "GET", "/market/asset",
+            params={"ticker_symbol": ticker},
+        )
+        if response.status_code == 404:
             return None
+        response.raise_for_status()
+        return response.json().get("data")
 
     @staticmethod
     async def fetch_news_analysis():
-        try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    f"{settings.magfi_ingestor_url}/ingest/news/analyzed",
-                    timeout=30.0
-                )
-                response.raise_for_status()
-                data = response.json()
-                return data.get("data", [])
-        except Exception as e:
-            logger.error(f"Error fetching news analysis: {str(e)}")
-            return []
+        # Same trailing window the training samples aggregate over
+        since = datetime.utcnow() - timedelta(days=settings.prediction_news_window_days)
+        response = await HttpClientRegistry.request(
+            "magfi-ingestor", settings.magfi_ingestor_url, "GET", "/ingest/news/analyzed",
+            params={"since": since.isoformat(), "limit": settings.prediction_news_limit},
+        )
+        response.raise_for_status()
+        return response.json().get("data", [])
+
+    @staticmethod
+    async def gather(sources: Dict[str, Tuple[Awaitable, Any]], deadline: Optional[float] = None) -> Tuple[Dict[str, Any], Dict[str, str]]:
+        """Run independent upstream fetches concurrently under one combined deadline.
+        
+        `sources` maps a name to (awaitable, default). Fetches that fail or are still
+        pending at the deadline (cancelled) fall back to their default; the second
+        element maps each such name to "error" or "timeout" so callers can flag
+        partial results.
+        """
+        deadline = settings.upstream_deadline if deadline is None else deadline
+        tasks = {name: asyncio.ensure_future(aw) for name, (aw, _) in sources.items()}
+        done, pending = await asyncio.wait(tasks.values(), timeout=deadline)
+        for task in pending:
+            task.cancel()
+        
+        results = {}
+        missing = {}
+        for name, task in tasks.items():
+            if task in done and task.exception() is None:
+                results[name] = task.result()
+                continue
+            results[name] = sources[name][1]
+            if task in done:
+                missing[name] = "error"
+                logger.error(f"Upstream fetch of {name} failed: {str(task.exception())}")
+            else:
+                missing[name] = "timeout"
+        
+        if missing:
+            logger.warning(f"Upstream fetch incomplete within {deadline}s: "
+                           f"{', '.join(f'{name} ({reason})' for name, reason in missing.items())}")
+        return results, missing
+
+    @staticmethod
+    async def fetch_market_inputs():
+        return await DataFetcher.gather({
+            "assets": (DataFetcher.fetch_assets(), []),
+            "news": (DataFetcher.fetch_news_analysis(), []),
+        })
+
+    @staticmethod
+    async def fetch_asset_inputs(ticker: str):
+        return await DataFetcher.gather({
+            "asset": (DataFetcher.fetch_asset(ticker), None),
+            "news": (DataFetcher.fetch_news_analysis(), []),
+        })
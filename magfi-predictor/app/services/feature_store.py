@@ -0,0 +1,257 @@
+import numpy as np
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.models import AssetPriceHistory
+from datetime import datetime, timedelta
+import logging
+import math
+import threading
+from typing import Dict, Optional
+from uuid import UUID
+
+logger = logging.getLogger(__name__)
+
+
+class AssetFeatures:
+    """Rolling time-series features for one asset, updated in O(1) per price.
+
+    Prices and returns live in fixed-size NumPy ring buffers; moving averages
+    and volatility are kept as running sums that add the newest value and
+    subtract the one falling out of the window, so history is never rescanned.
+    """
+
+    __slots__ = (
+        "capacity", "short_window", "long_window", "prices", "returns", "count",
+        "head", "short_sum", "long_sum", "ret_sum", "ret_sq_sum", "peak",
+        "max_drawdown", "last_recorded_at",
+    )
+
+    def __init__(self, capacity: int, short_window: int, long_window: int):
+        self.capacity = capacity
+        self.short_window = min(short_window, capacity)
+        self.long_window = min(long_window, capacity)
+        self.prices = np.zeros(capacity, dtype=np.float64)
+        self.returns = np.zeros(capacity, dtype=np.float64)
+        self.count = 0
+        self.head = 0
+        self.short_sum = 0.0
+        self.long_sum = 0.0
+        self.ret_sum = 0.0
+        self.ret_sq_sum = 0.0
+        self.peak = 0.0
+        self.max_drawdown = 0.0
+        self.last_recorded_at: Optional[datetime] = None
+
+    def _price_ago(self, n: int) -> float:
+        """Price n observations before the newest (0 = newest)."""
+        return self.prices[(self.head - 1 - n) % self.capacity]
+
+    def update(self, price: float, recorded_at: Optional[datetime] = None):
+        price = float(price)
+        if self.count:
+            previous = self._price_ago(0)
+            ret = price / previous - 1.0 if previous else 0.0
+        else:
+            ret = 0.0
+
+        # Values about to leave each window (only once the window is full)
+        if self.count >= self.short_window:
+            self.short_sum -= self._price_ago(self.short_window - 1)
+        if self.count >= self.long_window:
+            self.long_sum -= self._price_ago(self.long_window - 1)
+        if self.count >= self.capacity:
+            dropped = self.returns[self.head]
+            self.ret_sum -= dropped
+            self.ret_sq_sum -= dropped * dropped
+
+        self.prices[self.head] = price
+        self.returns[self.head] = ret
+        self.head = (self.head + 1) % self.capacity
+        self.count += 1
+
+        self.short_sum += price
+        self.long_sum += price
+        self.ret_sum += ret
+        self.ret_sq_sum += ret * ret
+
+        self.peak = max(self.peak, price)
+        if self.peak:
+            self.max_drawdown = min(self.max_drawdown, price / self.peak - 1.0)
+        self.last_recorded_at = recorded_at or self.last_recorded_at
+
+    def features(self) -> dict:
+        if not self.count:
+            return {}
+        n_window = min(self.count, self.capacity)
+        # The oldest stored return has no predecessor in the window until the buffer wraps
+        n_returns = n_window if self.count > self.capacity else n_window - 1
+        price = self._price_ago(0)
+
+        if n_returns > 1:
+            mean = self.ret_sum / n_returns
+            variance = max(self.ret_sq_sum / n_returns - mean * mean, 0.0) * n_returns / (n_returns - 1)
+            volatility = math.sqrt(variance)
+        else:
+            volatility = 0.0
+
+        short_n = min(self.count, self.short_window)
+        long_n = min(self.count, self.long_window)
+        oldest = self._price_ago(n_window - 1)
+
+        return {
+            "price": price,
+            "return_1": float(self.returns[(self.head - 1) % self.capacity]),
+            "return_window": price / oldest - 1.0 if oldest else 0.0,
+            "volatility": volatility,
+            "ma_short": self.short_sum / short_n,
+            "ma_long": self.long_sum / long_n,
+            "drawdown": price / self.peak - 1.0 if self.peak else 0.0,
+            "max_drawdown": self.max_drawdown,
+            "observations": self.count,
+        }
+
+
+class FeatureStore:
+    """Process-wide per-asset features over fct_asset_price_history.
+
+    The first refresh loads only the last FEATURE_WINDOW prices per asset. Later
+    refreshes follow history in insertion order (ingested_at, set by the
+    database) rather than by the client's recorded_at, re-reading the last
+    FEATURE_REFRESH_LOOKBACK_SECONDS so rows from transactions that committed
+    late are not skipped; row ids already applied are remembered for that span.
+    New prices feed AssetFeatures.update; a backfilled price older than an
+    asset's newest observation cannot be appended to its window, so that asset
+    is rebuilt from its last FEATURE_WINDOW rows instead.
+    """
+
+    _assets: Dict[str, AssetFeatures] = {}
+    _watermark: Optional[datetime] = None
+    _applied: Dict[UUID, datetime] = {}
+    _lock = threading.Lock()
+
+    @staticmethod
+    def _new_features() -> AssetFeatures:
+        return AssetFeatures(
+            settings.feature_window, settings.feature_short_ma, settings.feature_long_ma
+        )
+
+    @staticmethod
+    def update(asset_id, price: float, recorded_at: Optional[datetime] = None) -> bool:
+        """Append a price; returns False if it is not newer than the asset's last one."""
+        key = str(asset_id)
+        with FeatureStore._lock:
+            features = FeatureStore._assets.get(key)
+            if features is None:
+                features = FeatureStore._assets[key] = FeatureStore._new_features()
+            if recorded_at and features.last_recorded_at and recorded_at <= features.last_recorded_at:
+                return False
+            features.update(price, recorded_at)
+            return True
+
+    @staticmethod
+    def _window_query():
+        return select(
+            AssetPriceHistory.id,
+            AssetPriceHistory.asset_id,
+            AssetPriceHistory.price,
+            AssetPriceHistory.recorded_at,
+            AssetPriceHistory.ingested_at,
+        )
+
+    @staticmethod
+    def refresh(db: Session) -> int:
+        if FeatureStore._watermark is None:
+            return FeatureStore._load(db)
+
+        since = FeatureStore._watermark - timedelta(seconds=settings.feature_refresh_lookback_seconds)
+        stmt = (
+            FeatureStore._window_query()
+            .where(AssetPriceHistory.ingested_at >= since)
+            .order_by(AssetPriceHistory.recorded_at)
+        )
+
+        count = 0
+        stale = set()
+        for row_id, asset_id, price, recorded_at, ingested_at in db.execute(stmt.execution_options(yield_per=1000)):
+            if row_id in FeatureStore._applied:
+                continue
+            FeatureStore._mark_applied(row_id, ingested_at)
+            if not FeatureStore.update(asset_id, float(price), recorded_at):
+                stale.add(asset_id)
+            count += 1
+
+        for asset_id in stale:
+            FeatureStore._rebuild(db, asset_id)
+        FeatureStore._prune_applied()
+        if count:
+            logger.info(f"Feature store applied {count} price updates, rebuilt {len(stale)} assets for late rows")
+        return count
+
+    @staticmethod
+    def _load(db: Session) -> int:
+        # Read the watermark first: rows landing during the load are picked up by the next refresh
+        watermark = db.execute(select(func.max(AssetPriceHistory.ingested_at))).scalar()
+        window = FeatureStore._window_query().add_columns(
+            func.row_number()
+            .over(partition_by=AssetPriceHistory.asset_id, order_by=AssetPriceHistory.recorded_at.desc())
+            .label("rn"),
+        ).subquery()
+        stmt = (
+            select(window.c.id, window.c.asset_id, window.c.price, window.c.recorded_at, window.c.ingested_at)
+            .where(window.c.rn <= settings.feature_window)
+            .order_by(window.c.recorded_at)
+        )
+
+        count = 0
+        for row_id, asset_id, price, recorded_at, ingested_at in db.execute(stmt.execution_options(yield_per=1000)):
+            FeatureStore._mark_applied(row_id, ingested_at)
+            FeatureStore.update(asset_id, float(price), recorded_at)
+            count += 1
+        # An empty table starts from the beginning of time
+        FeatureStore._watermark = watermark or datetime.min + timedelta(seconds=settings.feature_refresh_lookback_seconds)
+        # Older rows inside the lookback were already reflected by the load; do not replay them
+        since = FeatureStore._watermark - timedelta(seconds=settings.feature_refresh_lookback_seconds)
+        for row_id, ingested_at in db.execute(
+            select(AssetPriceHistory.id, AssetPriceHistory.ingested_at)
+            .where(AssetPriceHistory.ingested_at >= since, AssetPriceHistory.ingested_at <= FeatureStore._watermark)
+        ):
+            FeatureStore._mark_applied(row_id, ingested_at)
+        FeatureStore._prune_applied()
+        if count:
+            logger.info(f"Feature store loaded {count} prices for {len(FeatureStore._assets)} assets")
+        return count
+
+    @staticmethod
+    def _rebuild(db: Session, asset_id):
+        rows = db.execute(
+            select(AssetPriceHistory.price, AssetPriceHistory.recorded_at)
+            .where(AssetPriceHistory.asset_id == asset_id)
+            .order_by(AssetPriceHistory.recorded_at.desc())
+            .limit(settings.feature_window)
+        ).all()
+        features = FeatureStore._new_features()
+        for price, recorded_at in reversed(rows):
+            features.update(float(price), recorded_at)
+        with FeatureStore._lock:
+            FeatureStore._assets[str(asset_id)] = features
+
+    @staticmethod
+    def _mark_applied(row_id: UUID, ingested_at: Optional[datetime]):
+        if ingested_at is None:
+            return
+        FeatureStore._applied[row_id] = ingested_at
+        if FeatureStore._watermark is not None and ingested_at > FeatureStore._watermark:
+            FeatureStore._watermark = ingested_at
+
+    @staticmethod
+    def _prune_applied():
+        cutoff = FeatureStore._watermark - timedelta(seconds=settings.feature_refresh_lookback_seconds)
+        FeatureStore._applied = {
+            row_id: ingested_at for row_id, ingested_at in FeatureStore._applied.items() if ingested_at >= cutoff
+        }
+
+    @staticmethod
+    def get(asset_id) -> dict:
+        features = FeatureStore._assets.get(str(asset_id))
+        return features.features() if features else {}
@@ -0,0 +1,82 @@
+import httpx
+from app.config import settings
+import logging
+import time
+from typing import Dict
+
+logger = logging.getLogger(__name__)
+
+
+class HttpClientRegistry:
+    """Application-lifetime pooled HTTP clients, one per upstream service.
+
+    Clients keep connections alive between calls so inter-service requests skip
+    TCP setup, and every request's latency is recorded per target.
+    """
+
+    _clients: Dict[str, httpx.AsyncClient] = {}
+    _metrics: Dict[str, dict] = {}
+
+    @staticmethod
+    def get(target: str, base_url: str) -> httpx.AsyncClient:
+        client = HttpClientRegistry._clients.get(target)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(
+                base_url=base_url,
+                limits=httpx.Limits(
+                    max_connections=settings.http_max_connections,
+                    max_keepalive_connections=settings.http_max_keepalive_connections,
+                    keepalive_expiry=settings.http_keepalive_expiry,
+                ),
+                timeout=httpx.Timeout(settings.http_timeout, connect=settings.http_connect_timeout),
+            )
+            HttpClientRegistry._clients[target] = client
+        return client
+
+    @staticmethod
+    async def request(target: str, base_url: str, method: str, path: str, **kwargs) -> httpx.Response:
+        client = HttpClientRegistry.get(target, base_url)
+        started = time.perf_counter()
+        error = False
+        try:
+            response = await client.request(method, path, **kwargs)
+            error = response.is_error
+            return response
+        except Exception:
+            error = True
+            raise
+        finally:
+            HttpClientRegistry._record(target, (time.perf_counter() - started) * 1000, error)
+
+    @staticmethod
+    def _record(target: str, elapsed_ms: float, error: bool):
+        metrics = HttpClientRegistry._metrics.setdefault(
+            target, {"requests": 0, "errors": 0, "total_ms": 0.0, "max_ms": 0.0, "last_ms": 0.0}
+        )
+        metrics["requests"] += 1
+        metrics["errors"] += int(error)
+        metrics["total_ms"] += elapsed_ms
+        metrics["max_ms"] = max(metrics["max_ms"], elapsed_ms)
+        metrics["last_ms"] = elapsed_ms
+
+    @staticmethod
+    def metrics() -> Dict[str, dict]:
+        return {
+            target: {
+                "requests": m["requests"],
+                "errors": m["errors"],
+                "avg_ms": round(m["total_ms"] / m["requests"], 2) if m["requests"] else 0.0,
+                "max_ms": round(m["max_ms"], 2),
+                "last_ms": round(m["last_ms"], 2),
+            }
+            for target, m in HttpClientRegistry._metrics.items()
+        }
+
+    @staticmethod
+    async def close_all():
+        for target, client in list(HttpClientRegistry._clients.items()):
+            try:
+                await client.aclose()
+            except Exception as e:
+                logger.error(f"Error closing HTTP client for {target}: {str(e)}")
+        HttpClientRegistry._clients.clear()
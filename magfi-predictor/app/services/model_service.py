@@ -0,0 +1,128 @@
+import numpy as np
+from app.config import settings
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+import asyncio
+import logging
+from typing import Callable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Column order shared by training and inference; changing it requires retraining
+FEATURE_NAMES = [
+    "sentiment_score",
+    "impact_score",
+    "news_count",
+    "heuristic_change",
+    "return_1",
+    "return_window",
+    "volatility",
+    "ma_ratio",
+    "drawdown",
+]
+
+# Trailing columns filled from an AssetFeatures snapshot, see ModelService.price_feature_values
+PRICE_FEATURE_NAMES = FEATURE_NAMES[4:]
+
+LATEST_POINTER = "LATEST"
+
+
+class ModelService:
+    """Holds the trained model artifact in memory for the life of the process."""
+
+    _artifact: Optional[dict] = None
+    _executor: Optional[ThreadPoolExecutor] = None
+
+    @staticmethod
+    def artifact_path(version: Optional[str] = None) -> Optional[Path]:
+        model_dir = Path(settings.model_dir)
+        if version is None:
+            pointer = model_dir / LATEST_POINTER
+            if not pointer.exists():
+                return None
+            version = pointer.read_text().strip()
+        return model_dir / f"model-{version}.joblib"
+
+    @staticmethod
+    def load(version: Optional[str] = None) -> bool:
+        import joblib
+
+        path = ModelService.artifact_path(version or settings.model_version)
+        if path is None or not path.exists():
+            logger.info("No trained model artifact found, using heuristic predictions")
+            return False
+
+        # Memory-map the model's arrays instead of copying them into the heap
+        artifact = joblib.load(path, mmap_mode="r")
+        if artifact.get("feature_names") != FEATURE_NAMES:
+            logger.error(f"Model {path.name} was trained on different features, ignoring it")
+            return False
+
+        # One throwaway prediction pays any lazy initialization before real traffic
+        artifact["model"].predict(np.zeros((1, len(FEATURE_NAMES))))
+        ModelService._artifact = artifact
+        logger.info(f"Loaded prediction model {artifact['version']}")
+        return True
+
+    @staticmethod
+    def is_loaded() -> bool:
+        return ModelService._artifact is not None
+
+    @staticmethod
+    def info() -> dict:
+        artifact = ModelService._artifact
+        if artifact is None:
+            return {"loaded": False}
+        return {
+            "loaded": True,
+            "version": artifact["version"],
+            "trained_at": artifact["trained_at"],
+            "n_samples": artifact["n_samples"],
+            "metrics": artifact["metrics"],
+        }
+
+    @staticmethod
+    def predict(features: np.ndarray) -> np.ndarray:
+        """Predicted change percent for each row of a (n_assets, len(FEATURE_NAMES)) matrix."""
+        return ModelService._artifact["model"].predict(features)
+
+    @staticmethod
+    async def predict_async(features: np.ndarray) -> np.ndarray:
+        """Run inference in a worker thread so the event loop stays free."""
+        if ModelService._executor is None:
+            ModelService._executor = ThreadPoolExecutor(
+                max_workers=settings.inference_workers, thread_name_prefix="inference"
+            )
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(ModelService._executor, ModelService.predict, features)
+
+    @staticmethod
+    def build_features(sentiment_scores: np.ndarray, impact_scores: np.ndarray, news_counts: np.ndarray,
+                       heuristic_changes: np.ndarray, asset_ids: List, get_features: Callable[[str], dict]) -> np.ndarray:
+        matrix = np.zeros((len(asset_ids), len(FEATURE_NAMES)), dtype=np.float64)
+        matrix[:, 0] = sentiment_scores
+        matrix[:, 1] = impact_scores
+        matrix[:, 2] = news_counts
+        matrix[:, 3] = heuristic_changes
+        for i, asset_id in enumerate(asset_ids):
+            matrix[i, 4:] = ModelService.price_feature_values(get_features(asset_id))
+        return matrix
+
+    @staticmethod
+    def price_feature_values(features: dict) -> List[float]:
+        """PRICE_FEATURE_NAMES from one AssetFeatures.features() snapshot; training uses this too."""
+        if not features:
+            return [0.0] * len(PRICE_FEATURE_NAMES)
+        return [
+            features["return_1"],
+            features["return_window"],
+            features["volatility"],
+            features["ma_short"] / features["ma_long"] - 1.0 if features["ma_long"] else 0.0,
+            features["drawdown"],
+        ]
+
+    @staticmethod
+    def shutdown():
+        if ModelService._executor is not None:
+            ModelService._executor.shutdown(wait=False)
+            ModelService._executor = None
@@ -0,0 +1,92 @@
+from app.config import settings
+from collections import OrderedDict
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class PredictionCache:
+    """TTL + LRU cache of prediction responses, invalidated by an input watermark.
+
+    An entry is served only while it is younger than the TTL and was computed
+    from the same watermark (latest analysis created_at / asset updated_at), so
+    new news or prices invalidate it immediately. Concurrent misses on the same
+    key share one computation instead of stampeding the upstream services.
+    """
+
+    _entries: "OrderedDict[str, Tuple[Hashable, float, Any]]" = OrderedDict()
+    # Single-flight lock per key with a miss in progress, and how many requests hold or await it
+    _locks: Dict[str, asyncio.Lock] = {}
+    _waiters: Dict[str, int] = {}
+    hits: int = 0
+    misses: int = 0
+
+    @staticmethod
+    async def get_or_compute(key: str, watermark: Hashable,
+                             compute: Callable[[], Awaitable[Tuple[Any, bool]]]) -> Any:
+        """Return the cached value for key, or await compute() -> (value, cacheable)."""
+        value = PredictionCache._lookup(key, watermark)
+        if value is not None:
+            return value
+
+        lock = PredictionCache._locks.get(key)
+        if lock is None:
+            lock = PredictionCache._locks[key] = asyncio.Lock()
+        PredictionCache._waiters[key] = PredictionCache._waiters.get(key, 0) + 1
+        try:
+            async with lock:
+                # Another request may have filled the entry while this one waited
+                value = PredictionCache._lookup(key, watermark)
+                if value is not None:
+                    return value
+
+                PredictionCache.misses += 1
+                value, cacheable = await compute()
+                if cacheable:
+                    PredictionCache._store(key, watermark, value)
+                return value
+        finally:
+            # The last request out drops the lock, so _locks only holds keys being computed
+            PredictionCache._waiters[key] -= 1
+            if not PredictionCache._waiters[key]:
+                del PredictionCache._waiters[key]
+                del PredictionCache._locks[key]
+
+    @staticmethod
+    def _lookup(key: str, watermark: Hashable) -> Any:
+        entry = PredictionCache._entries.get(key)
+        if entry is None:
+            return None
+        entry_watermark, expires_at, value = entry
+        if entry_watermark != watermark or expires_at < time.monotonic():
+            PredictionCache._entries.pop(key, None)
+            return None
+        PredictionCache._entries.move_to_end(key)
+        PredictionCache.hits += 1
+        return value
+
+    @staticmethod
+    def _store(key: str, watermark: Hashable, value: Any):
+        expires_at = time.monotonic() + settings.prediction_cache_ttl_seconds
+        PredictionCache._entries[key] = (watermark, expires_at, value)
+        PredictionCache._entries.move_to_end(key)
+        while len(PredictionCache._entries) > settings.prediction_cache_max_entries:
+            PredictionCache._entries.popitem(last=False)
+
+    @staticmethod
+    def invalidate(key: str = None):
+        if key is None:
+            PredictionCache._entries.clear()
+        else:
+            PredictionCache._entries.pop(key, None)
+
+    @staticmethod
+    def stats() -> dict:
+        return {
+            "entries": len(PredictionCache._entries),
+            "hits": PredictionCache.hits,
+            "misses": PredictionCache.misses,
+        }
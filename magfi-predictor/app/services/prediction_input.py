@@ -0,0 +1,66 @@
+from typing import Dict, Iterable, Optional
+
+
+class TickerNewsAggregate:
+    __slots__ = ("count", "impact_sum", "positive", "negative", "neutral", "latest_sentiment")
+
+    def __init__(self):
+        self.count = 0
+        self.impact_sum = 0.0
+        self.positive = 0
+        self.negative = 0
+        self.neutral = 0
+        self.latest_sentiment: Optional[str] = None
+
+    def add(self, sentiment: str, impact_score: float):
+        if self.latest_sentiment is None:
+            self.latest_sentiment = sentiment
+        self.count += 1
+        self.impact_sum += impact_score
+        if sentiment == "positive":
+            self.positive += 1
+        elif sentiment == "negative":
+            self.negative += 1
+        else:
+            self.neutral += 1
+
+    @property
+    def avg_impact(self) -> float:
+        return self.impact_sum / self.count if self.count else 0.0
+
+    @property
+    def net_sentiment(self) -> float:
+        """(positive - negative) / count, in [-1, 1]."""
+        return (self.positive - self.negative) / self.count if self.count else 0.0
+
+    @property
+    def dominant_sentiment(self) -> str:
+        """Most frequent sentiment; ties go to the most recent item's sentiment."""
+        tallies = {"positive": self.positive, "negative": self.negative, "neutral": self.neutral}
+        top = max(tallies.values())
+        if tallies.get(self.latest_sentiment) == top:
+            return self.latest_sentiment
+        return next(s for s, n in tallies.items() if n == top)
+
+
+class PredictionInputBuilder:
+    @staticmethod
+    def normalize_ticker(ticker: Optional[str]) -> str:
+        return (ticker or "").strip().upper()
+
+    @staticmethod
+    def group_news(news: Iterable[dict]) -> Dict[str, TickerNewsAggregate]:
+        """Fold news items (newest first) into one aggregate per normalized ticker, in one pass."""
+        aggregates: Dict[str, TickerNewsAggregate] = {}
+        for item in news:
+            ticker = PredictionInputBuilder.normalize_ticker(item.get("ticker"))
+            if not ticker:
+                continue
+            aggregate = aggregates.get(ticker)
+            if aggregate is None:
+                aggregate = aggregates[ticker] = TickerNewsAggregate()
+            aggregate.add(
+                (item.get("sentiment") or "neutral").lower(),
+                float(item.get("impact_score") or 0),
+            )
+        return aggregates
@@ -1,28 +1,116 @@
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import Session
-from app.models import Prediction
+from app.config import settings
+from app.models import Prediction, Asset, AssetPriceHistory, NewsAnalysis
 from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+from uuid import UUID
 import logging
+import threading
+import time
 
 logger = logging.getLogger(__name__)
 
 
+class TickerIdCache:
+    """Process-wide ticker_symbol -> dim_asset.id map.
+
+    Loaded with one query and reloaded after TICKER_CACHE_TTL_SECONDS; a ticker
+    missing from the map costs a single lookup on dim_asset's unique ticker index.
+    """
+
+    _ids: Dict[str, UUID] = {}
+    _loaded_at: float = 0.0
+    _lock = threading.Lock()
+
+    @staticmethod
+    def refresh(db: Session):
+        rows = db.execute(select(Asset.ticker_symbol, Asset.id)).all()
+        with TickerIdCache._lock:
+            TickerIdCache._ids = {ticker.upper(): asset_id for ticker, asset_id in rows}
+            TickerIdCache._loaded_at = time.monotonic()
+
+    @staticmethod
+    def get(db: Session, ticker: Optional[str]) -> Optional[UUID]:
+        ticker = (ticker or "").strip().upper()
+        if not ticker:
+            return None
+        if time.monotonic() - TickerIdCache._loaded_at > settings.ticker_cache_ttl_seconds:
+            TickerIdCache.refresh(db)
+        asset_id = TickerIdCache._ids.get(ticker)
+        if asset_id is None:
+            asset_id = db.execute(select(Asset.id).where(Asset.ticker_symbol == ticker)).scalar()
+            if asset_id is not None:
+                with TickerIdCache._lock:
+                    TickerIdCache._ids[ticker] = asset_id
+        return asset_id
+
+
 class PredictionService:
     @staticmethod
     def save_prediction(db: Session, prediction_data: dict):
-        prediction = Prediction(
-            asset_ticker=prediction_data.get("asset_ticker"),
-            prediction_type=prediction_data.get("prediction_type"),
-            predicted_price=prediction_data.get("predicted_price"),
-            confidence_score=prediction_data.get("confidence_score"),
-            prediction_date=prediction_data.get("prediction_date"),
-            horizon_days=prediction_data.get("horizon_days"),
-            analysis_summary=prediction_data.get("analysis_summary"),
-        )
+        prediction = Prediction(**PredictionService._prediction_row(db, prediction_data))
         db.add(prediction)
         db.commit()
         db.refresh(prediction)
         return prediction
 
+    @staticmethod
+    def save_predictions_bulk(db: Session, predictions: List[dict]) -> List[UUID]:
+        """Insert a whole prediction run with one multi-row INSERT ... RETURNING id."""
+        if not predictions:
+            return []
+        
+        rows = [PredictionService._prediction_row(db, p) for p in predictions]
+        try:
+            ids = db.execute(pg_insert(Prediction).values(rows).returning(Prediction.id)).scalars().all()
+            db.commit()
+        except SQLAlchemyError:
+            db.rollback()
+            raise
+        return list(ids)
+
+    @staticmethod
+    def _prediction_row(db: Session, prediction_data: dict) -> dict:
+        asset_id = prediction_data.get("asset_id")
+        if asset_id is None:
+            asset_id = TickerIdCache.get(db, prediction_data.get("asset_ticker"))
+        elif not isinstance(asset_id, UUID):
+            # Ids from magfi-core's JSON arrive as strings
+            asset_id = UUID(str(asset_id))
+        return {
+            "asset_id": asset_id,
+            "prediction_type": prediction_data.get("prediction_type"),
+            "predicted_price": prediction_data.get("predicted_price"),
+            "confidence_score": prediction_data.get("confidence_score"),
+            "prediction_date": prediction_data.get("prediction_date"),
+            "horizon_days": prediction_data.get("horizon_days", settings.prediction_horizon_days),
+            "analysis_summary": prediction_data.get("analysis_summary"),
+        }
+
+    @staticmethod
+    def get_input_watermark(db: Session, ticker: Optional[str] = None) -> Tuple[Optional[datetime], ...]:
+        """Latest analysis, price-history row and asset change, in one round trip.
+        
+        Price history is tracked by ingested_at (insertion time) rather than the
+        client-supplied recorded_at, so backfilled prices still move the watermark.
+        Each maximum is a single index seek: idx_news_created,
+        idx_asset_history_ingested / idx_asset_history_asset_ingested and
+        idx_asset_updated (or the ticker index for one asset).
+        """
+        latest_news = select(func.max(NewsAnalysis.created_at))
+        latest_price = select(func.max(AssetPriceHistory.ingested_at))
+        latest_asset = select(func.max(Asset.updated_at))
+        if ticker:
+            asset_id = select(Asset.id).where(Asset.ticker_symbol == ticker.upper()).scalar_subquery()
+            latest_price = latest_price.where(AssetPriceHistory.asset_id == asset_id)
+            latest_asset = latest_asset.where(Asset.ticker_symbol == ticker.upper())
+        return tuple(db.execute(select(
+            latest_news.scalar_subquery(), latest_price.scalar_subquery(), latest_asset.scalar_subquery()
+        )).one())
+
     @staticmethod
     def get_predictions(db: Session, hours: int = 24):
         cutoff_time = datetime.utcnow() - timedelta(hours=hours)
@@ -30,7 +118,32 @@ class PredictionService:
 
     @staticmethod
     def get_asset_predictions(db: Session, ticker: str):
-        return db.query(Prediction).filter(Prediction.asset_ticker == ticker.upper()).all()
+        asset_id = TickerIdCache.get(db, ticker)
+        if asset_id is None:
+            return []
+        return (
+            db.query(Prediction)
+            .filter(Prediction.asset_id == asset_id)
+            .order_by(Prediction.prediction_date.desc())
+            .all()
+        )
+
+    @staticmethod
+    def get_latest_prediction(db: Session, ticker: str) -> Optional[Prediction]:
+        """Most recent stored prediction for a ticker.
+        
+        asset_id = ? ORDER BY prediction_date DESC LIMIT 1 is answered by a
+        single seek on idx_prediction_asset_date.
+        """
+        asset_id = TickerIdCache.get(db, ticker)
+        if asset_id is None:
+            return None
+        return db.execute(
+            select(Prediction)
+            .where(Prediction.asset_id == asset_id)
+            .order_by(Prediction.prediction_date.desc())
+            .limit(1)
+        ).scalar()
 
     @staticmethod
     def predict_sentiment_impact(news_sentiment: str, impact_score: float) -> dict:
@@ -0,0 +1,180 @@
+import numpy as np
+import pandas as pd
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.models import AssetPriceHistory, NewsAnalysis
+from app.services.batch_predictor import SENTIMENT_DIRECTION, BatchPredictionEngine
+from app.services.feature_store import AssetFeatures
+from app.services.model_service import FEATURE_NAMES, LATEST_POINTER, PRICE_FEATURE_NAMES, ModelService
+from app.services.prediction_input import TickerNewsAggregate
+from datetime import datetime
+from pathlib import Path
+import logging
+from typing import Tuple
+
+logger = logging.getLogger(__name__)
+
+SENTIMENT_SCORE = {"positive": 1.0, "negative": -1.0, "neutral": 0.0}
+
+
+def _timestamps(values: pd.Series) -> pd.Series:
+    # Naive UTC at one resolution, so merge_asof keys from both frames line up
+    return pd.to_datetime(values).astype("datetime64[ns]")
+
+
+class TrainingService:
+    """Offline dataset building and model fitting.
+
+    Samples are built with the code the live predictor runs, so a trained model
+    sees the same inputs at serving time: price features come from replaying
+    each asset's history through AssetFeatures observation by observation (as
+    FeatureStore does), news features from TickerNewsAggregate over the trailing
+    PREDICTION_NEWS_WINDOW_DAYS, and the heuristic prior from BatchPredictionEngine.
+    """
+
+    @staticmethod
+    def load_frames(db: Session) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        bind = db.get_bind()
+        prices = pd.read_sql(
+            select(AssetPriceHistory.asset_id, AssetPriceHistory.price, AssetPriceHistory.recorded_at),
+            bind,
+        )
+        news = pd.read_sql(
+            select(NewsAnalysis.asset_id, NewsAnalysis.sentiment, NewsAnalysis.impact_score, NewsAnalysis.created_at)
+            .where(NewsAnalysis.asset_id.isnot(None)),
+            bind,
+        )
+        return prices, news
+
+    @staticmethod
+    def price_snapshots(prices: pd.DataFrame) -> pd.DataFrame:
+        """Price features after every observation of every asset, in recorded_at order."""
+        prices = prices.assign(recorded_at=_timestamps(prices["recorded_at"])).sort_values(["asset_id", "recorded_at"])
+        rows = []
+        for asset_id, group in prices.groupby("asset_id", sort=False):
+            features = AssetFeatures(settings.feature_window, settings.feature_short_ma, settings.feature_long_ma)
+            for price, recorded_at in zip(group["price"].astype(float), group["recorded_at"]):
+                # FeatureStore drops prices that are not newer than the last one it applied
+                if features.last_recorded_at is not None and recorded_at <= features.last_recorded_at:
+                    continue
+                features.update(price, recorded_at)
+                rows.append((asset_id, recorded_at, price, *ModelService.price_feature_values(features.features())))
+        return pd.DataFrame(rows, columns=["asset_id", "recorded_at", "price", *PRICE_FEATURE_NAMES])
+
+    @staticmethod
+    def news_samples(news: pd.DataFrame) -> pd.DataFrame:
+        """One sample per asset and day with news, aggregated over the trailing news window.
+
+        A sample is taken as of the end of its day (`as_of`) and sees the news the
+        live predictor would fetch at that moment: created_at in (as_of - window, as_of).
+        """
+        window = pd.Timedelta(days=settings.prediction_news_window_days)
+        news = news.assign(created_at=_timestamps(news["created_at"])).sort_values(["asset_id", "created_at"])
+        rows = []
+        for asset_id, group in news.groupby("asset_id", sort=False):
+            created = group["created_at"].to_numpy()
+            sentiments = [(s or "neutral").lower() for s in group["sentiment"]]
+            impacts = group["impact_score"].fillna(0.0).astype(float).to_numpy()
+            for day in group["created_at"].dt.floor("D").unique():
+                as_of = day + pd.Timedelta(days=1)
+                lo = np.searchsorted(created, (as_of - window).to_datetime64(), side="right")
+                hi = np.searchsorted(created, as_of.to_datetime64(), side="left")
+                aggregate = TickerNewsAggregate()
+                # Newest first, the order the ingestor serves them in
+                for j in range(hi - 1, lo - 1, -1):
+                    aggregate.add(sentiments[j], impacts[j])
+                rows.append((
+                    asset_id, day, as_of, aggregate.net_sentiment, aggregate.avg_impact, aggregate.count,
+                    SENTIMENT_DIRECTION.get(aggregate.dominant_sentiment, 0.0),
+                ))
+        return pd.DataFrame(rows, columns=[
+            "asset_id", "day", "as_of", "sentiment_score", "impact_score", "news_count", "direction",
+        ])
+
+    @staticmethod
+    def build_samples(prices: pd.DataFrame, news: pd.DataFrame, horizon_days: int) -> pd.DataFrame:
+        """Features and realized forward return (percent) for every asset-day with news.
+
+        The target compares the price as of the sample with the price as of the
+        same moment horizon_days calendar days later (last observation at or
+        before it), and needs history reaching that day; weekends and gaps in
+        the price series therefore do not shift the horizon.
+        """
+        # price and direction are the live heuristic's inputs, kept so a backtest can replay it
+        columns = ["asset_id", "day", "price", "direction", *FEATURE_NAMES, "target"]
+        samples = TrainingService.news_samples(news)
+        snapshots = TrainingService.price_snapshots(prices)
+        if samples.empty or snapshots.empty:
+            return pd.DataFrame(columns=columns)
+
+        snapshots = snapshots.sort_values("recorded_at")
+        # Features as of the sample: only observations strictly before the end of its day
+        samples = pd.merge_asof(
+            samples.sort_values("as_of"), snapshots, left_on="as_of", right_on="recorded_at",
+            by="asset_id", direction="backward", allow_exact_matches=False,
+        ).dropna(subset=["price"])
+        samples["target_at"] = samples["as_of"] + pd.Timedelta(days=horizon_days)
+        future = pd.merge_asof(
+            samples[["asset_id", "target_at"]].reset_index().sort_values("target_at"),
+            snapshots[["asset_id", "recorded_at", "price"]].rename(columns={"price": "future_price"}),
+            left_on="target_at", right_on="recorded_at", by="asset_id",
+            direction="backward", allow_exact_matches=False,
+        ).set_index("index")["future_price"]
+        last_seen = snapshots.groupby("asset_id")["recorded_at"].max()
+        reaches_target = samples["asset_id"].map(last_seen) >= samples["target_at"] - pd.Timedelta(days=1)
+
+        samples["target"] = ((future / samples["price"] - 1.0) * 100.0).where(reaches_target & (samples["price"] > 0))
+        samples["heuristic_change"] = BatchPredictionEngine.predict(
+            samples["price"].to_numpy(), samples["direction"].to_numpy(), samples["impact_score"].to_numpy()
+        )["predicted_change_percent"]
+        return samples.dropna(subset=["target"])[columns]
+
+    @staticmethod
+    def build_dataset(prices: pd.DataFrame, news: pd.DataFrame, horizon_days: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Feature matrix and targets, time-ordered so the holdout split in train() is out-of-sample in time."""
+        dataset = TrainingService.build_samples(prices, news, horizon_days).sort_values("day")
+        features = dataset[FEATURE_NAMES].fillna(0.0).to_numpy(dtype=np.float64)
+        return features, dataset["target"].to_numpy(dtype=np.float64)
+
+    @staticmethod
+    def train(features: np.ndarray, target: np.ndarray):
+        from sklearn.ensemble import HistGradientBoostingRegressor
+        from sklearn.metrics import mean_absolute_error
+
+        split = int(len(target) * 0.8)
+        model = HistGradientBoostingRegressor(max_iter=200, learning_rate=0.05, random_state=42)
+        model.fit(features[:split], target[:split])
+
+        holdout = target[split:]
+        metrics = {"n_train": split, "n_holdout": len(holdout)}
+        if len(holdout):
+            predicted = model.predict(features[split:])
+            metrics["holdout_mae"] = float(mean_absolute_error(holdout, predicted))
+            metrics["holdout_direction_accuracy"] = float(np.mean(np.sign(predicted) == np.sign(holdout)))
+
+        # Refit on everything once the holdout score is recorded
+        model.fit(features, target)
+        return model, metrics
+
+    @staticmethod
+    def save_artifact(model, metrics: dict, n_samples: int) -> Path:
+        import joblib
+
+        version = datetime.utcnow().strftime("%Y%m%d%H%M%S")
+        model_dir = Path(settings.model_dir)
+        model_dir.mkdir(parents=True, exist_ok=True)
+        path = ModelService.artifact_path(version)
+        artifact = {
+            "model": model,
+            "feature_names": FEATURE_NAMES,
+            "version": version,
+            "trained_at": datetime.utcnow().isoformat(),
+            "n_samples": n_samples,
+            "metrics": metrics,
+        }
+        # Uncompressed so the predictor can memory-map it on load
+        joblib.dump(artifact, path)
+        (model_dir / LATEST_POINTER).write_text(version)
+        logger.info(f"Saved model {version} to {path}")
+        return path